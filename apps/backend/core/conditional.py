@@ -0,0 +1,82 @@
+import hashlib
+
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags, quote_etag
+from rest_framework.response import Response
+
+
+def make_etag(*parts):
+    """
+    Strong ETag over the parts of a version key; any change to a part
+    changes the tag.
+    """
+    key = "\x1f".join(str(part) for part in parts)
+    return quote_etag(hashlib.sha1(key.encode()).hexdigest())
+
+
+def etag_matches(request, etag):
+    # If-None-Match uses the weak comparison
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    tags = parse_etags(header)
+    return "*" in tags or etag in (tag.removeprefix("W/") for tag in tags)
+
+
+def set_validators(response, *, etag, **cache_control):
+    response["ETag"] = etag
+    if cache_control:
+        patch_cache_control(response, **cache_control)
+    return response
+
+
+def not_modified(*, etag, **cache_control):
+    return set_validators(Response(status=304), etag=etag, **cache_control)
+
+
+class NotModified(Exception):
+    pass
+
+
+class ConditionalGetMixin:
+    """
+    For APIViews whose GET payload is expensive to build.
+
+    `get_version()` runs after authentication and permission checks and
+    returns the parts of a cheap version key, or None to leave the
+    response unvalidated. A GET whose If-None-Match matches gets a 304
+    before the handler runs; successful GETs carry the ETag. What
+    get_version loads can be kept on the view for the handler.
+    """
+
+    # Clients keep the response but revalidate it before every use
+    cache_control = {"private": True, "no_cache": True}
+
+    def get_version(self, request, *args, **kwargs):
+        raise NotImplementedError
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.etag = None
+        if request.method not in ("GET", "HEAD"):
+            return
+        version = self.get_version(request, *args, **kwargs)
+        if version is None:
+            return
+        # One ETag per representation
+        self.etag = make_etag(request.accepted_renderer.format, *version)
+        if etag_matches(request, self.etag):
+            raise NotModified
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return not_modified(etag=self.etag, **self.cache_control)
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        if getattr(self, "etag", None) and response.status_code == 200:
+            set_validators(response, etag=self.etag, **self.cache_control)
+        return response
@@ -0,0 +1,124 @@
+import threading
+import time
+import uuid
+
+from django.core.cache import cache
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+
+class _Call:
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent computations of the same key.
+
+    Within a process, callers of a key already in flight wait for the
+    first caller and get its result. Across processes, the first caller
+    takes a lock in the shared cache and stores its result there; the
+    others poll for it, and compute it themselves only if the holder
+    dies or overruns the lock.
+
+    Keys must change whenever the result would (e.g. include a
+    version), since results are served from the cache until
+    `result_timeout`.
+    """
+
+    def __init__(
+        self,
+        namespace,
+        *,
+        result_timeout=60,
+        lock_timeout=5,
+        poll_interval=0.01,
+    ):
+        self.namespace = namespace
+        self.result_timeout = result_timeout
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def result_key(self, key):
+        return f"singleflight:{self.namespace}:{key}"
+
+    def lock_key(self, key):
+        return f"singleflight:{self.namespace}:{key}:lock"
+
+    def do(self, key, compute):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._do_shared(key, compute)
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def _do_shared(self, key, compute):
+        result_key = self.result_key(key)
+        result = cache.get(result_key)
+        if result is not None:
+            return result
+
+        lock_key = self.lock_key(key)
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.lock_timeout
+        while not cache.add(lock_key, token, self.lock_timeout):
+            if time.monotonic() >= deadline:
+                # Holder is gone or too slow: do not wait any longer
+                return compute()
+            time.sleep(self.poll_interval)
+            result = cache.get(result_key)
+            if result is not None:
+                return result
+
+        try:
+            # Another process may have finished between get and add
+            result = cache.get(result_key)
+            if result is None:
+                result = compute()
+                cache.set(result_key, result, self.result_timeout)
+            return result
+        finally:
+            if cache.get(lock_key) == token:
+                cache.delete(lock_key)
+
+
+class RenderedJSONResponse(Response):
+    """
+    A Response whose JSON body was rendered once, e.g. by a SingleFlight
+    leader, and is reused as is. Other renderers (browsable API) render
+    `data` as usual.
+    """
+
+    def __init__(self, data, json_content, **kwargs):
+        super().__init__(data, **kwargs)
+        self.json_content = json_content
+
+    @property
+    def rendered_content(self):
+        if isinstance(self.accepted_renderer, JSONRenderer):
+            self["Content-Type"] = self.accepted_renderer.media_type
+            return self.json_content
+        return super().rendered_content
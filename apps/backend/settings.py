@@ -2,6 +2,8 @@
 from pathlib import Path
 from datetime import timedelta
 import os
+import sys
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -55,6 +57,7 @@ INSTALLED_APPS = [
     'rest_framework',
     'corsheaders',
     'rest_framework_simplejwt',
+    'channels',
 
     #local
     'accounts',
@@ -103,6 +106,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'backend.wsgi.application'
+ASGI_APPLICATION = 'backend.asgi.application'
 
 
 # Database
@@ -116,6 +120,56 @@ DATABASES = {
 }
 
 
+# Cache
+# Per-process memory by default; set REDIS_URL to share the cache
+# (e.g. scoring read models) across workers.
+
+REDIS_URL = env_str("REDIS_URL")
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Channel layer for live match pushes. In-memory only reaches viewers
+# connected to the same process, so production must set REDIS_URL.
+
+TESTING = sys.argv[1:2] == ['test']
+
+if not REDIS_URL and not DEBUG and not TESTING:
+    raise ImproperlyConfigured(
+        "REDIS_URL must be set when DEBUG is off: the in-memory channel "
+        "layer cannot push live match changes across workers."
+    )
+
+if REDIS_URL:
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels_redis.core.RedisChannelLayer',
+            'CONFIG': {'hosts': [REDIS_URL]},
+        }
+    }
+else:
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels.layers.InMemoryChannelLayer',
+        }
+    }
+
+# "rows": one BallTrajectory row per point. "packed": one
+# BallTrajectoryPacked row per ball; existing rows stay readable
+BALL_TRAJECTORY_STORAGE = env_str("BALL_TRAJECTORY_STORAGE", "rows")
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
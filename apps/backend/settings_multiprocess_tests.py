@@ -0,0 +1,17 @@
+"""
+Settings for the multi-process ball export tests:
+
+    python manage.py test scoring --settings=backend.settings_multiprocess_tests
+
+The test database is a file rather than memory, so process-pool export
+workers can open it.
+"""
+from backend.settings import *  # noqa: F401,F403
+
+DATABASES = {
+    **DATABASES,
+    'default': {
+        **DATABASES['default'],
+        'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
+    },
+}
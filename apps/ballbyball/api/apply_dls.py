@@ -11,6 +11,8 @@ from rest_framework.response import Response
 
 from matches.models import Match, Innings
 from scoring.models import InningsAggregate
+from ballbyball.models import MatchChange
+from ballbyball.services.record_match_changes import record_match_changes
 from ballbyball.services.validate_match_and_scorer_ownership import (
     validate_match_and_scorer_ownership,
 )
@@ -69,6 +71,17 @@ class ApplyDLSView(APIView):
             aggregate.max_overs = revised_overs
 
         aggregate.save()
+        record_match_changes(
+            match_id=match.id,
+            changes=[(
+                MatchChange.Kind.DLS,
+                {
+                    "innings": innings.innings_number,
+                    "revised_target_runs": aggregate.revised_target_runs,
+                    "revised_max_overs": aggregate.max_overs,
+                },
+            )],
+        )
 
         return Response(
             {
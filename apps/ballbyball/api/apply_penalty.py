@@ -12,6 +12,11 @@ from ballbyball.services.validate_match_and_scorer_ownership import (
 )
 from scoring.models import InningsAggregate
 from scoring.models import InningsPenalty
+from ballbyball.models import MatchChange
+from ballbyball.services.record_match_changes import (
+    record_match_changes,
+    summarize_score,
+)
 
 
 class ApplyPenaltyView(APIView):
@@ -76,6 +81,14 @@ class ApplyPenaltyView(APIView):
 
         aggregate.save()
 
+        if awarded_innings.id != innings.id:
+            # The penalty is listed under the innings it happened in, so
+            # its read model must see a new version too
+            happened_aggregate, _ = InningsAggregate.objects.get_or_create(
+                innings=innings
+            )
+            happened_aggregate.save(update_fields=["updated_at"])
+
         penalty = InningsPenalty.objects.create(
             match=match,
             innings=innings,
@@ -86,6 +99,19 @@ class ApplyPenaltyView(APIView):
             reason_other=reason_other,
             runs=runs,
         )
+        record_match_changes(
+            match_id=match.id,
+            changes=[(
+                MatchChange.Kind.PENALTY,
+                {
+                    "innings": awarded_innings.innings_number,
+                    "penalty_id": str(penalty.id),
+                    "awarded_to": awarded_to,
+                    "runs": runs,
+                    "score": summarize_score(aggregate),
+                },
+            )],
+        )
 
         return Response(
             {
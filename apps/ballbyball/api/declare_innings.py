@@ -14,6 +14,8 @@ from matches.models import Match, Innings
 from ballbyball.services.validate_match_and_scorer_ownership import (
     validate_match_and_scorer_ownership,
 )
+from ballbyball.models import MatchChange
+from ballbyball.services.record_match_changes import record_match_changes
 
 
 class DeclareInningsView(APIView):
@@ -44,6 +46,17 @@ class DeclareInningsView(APIView):
         innings.state = Innings.State.COMPLETED
         innings.end_time = timezone.now()
         innings.save(update_fields=["state", "end_time"])
+        record_match_changes(
+            match_id=match.id,
+            changes=[(
+                MatchChange.Kind.INNINGS,
+                {
+                    "innings": innings.innings_number,
+                    "state": innings.state,
+                    "declared": True,
+                },
+            )],
+        )
 
         return Response(
             {
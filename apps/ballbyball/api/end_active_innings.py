@@ -25,6 +25,11 @@ from ballbyball.services.validate_match_and_scorer_ownership import (
     validate_match_and_scorer_ownership,
 )
 from scoring.models import InningsAggregate
+from ballbyball.models import MatchChange
+from ballbyball.services.record_match_changes import (
+    record_match_changes,
+    summarize_score,
+)
 from ballbyball.services.innings_outcome_engine import (
     detect_match_end,
 )
@@ -61,9 +66,19 @@ class EndActiveInningsView(APIView):
             innings_number=innings.innings_number,
             match=match,
         )
+        changes = [(
+            MatchChange.Kind.INNINGS,
+            {
+                "innings": innings.innings_number,
+                "state": innings.state,
+                "score": summarize_score(aggregate),
+            },
+        )]
         if match_end and match.state != "COMPLETED":
             match.state = "COMPLETED"
             match.save(update_fields=["state"])
+            changes.append((MatchChange.Kind.MATCH, {"state": match.state}))
+        record_match_changes(match_id=match.id, changes=changes)
 
         return Response(
             {
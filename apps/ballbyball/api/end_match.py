@@ -14,6 +14,9 @@ from matches.services.innings_transition import end_match
 from ballbyball.services.validate_match_and_scorer_ownership import (
     validate_match_and_scorer_ownership,
 )
+from ballbyball.services.record_match_changes import (
+    record_match_state_change,
+)
 
 
 class EndMatchView(APIView):
@@ -27,6 +30,9 @@ class EndMatchView(APIView):
         )
 
         end_match(match.id)
+        if match.state != "COMPLETED":
+            match.state = "COMPLETED"
+            record_match_state_change(match=match)
 
         return Response(
             {
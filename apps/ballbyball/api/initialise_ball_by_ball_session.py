@@ -19,29 +19,54 @@ MUST NEVER DO:
 
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 
-from matches.models import Match, Innings
+from backend.core.conditional import ConditionalGetMixin
+from backend.core.singleflight import RenderedJSONResponse, SingleFlight
+
+from matches.models import Match
 from ballbyball.services.validate_match_and_scorer_ownership import (
     validate_match_and_scorer_ownership,
 )
 from ballbyball.services.start_or_resume_innings_session import (
     start_or_resume_innings_session,
 )
-from ballbyball.services.determine_required_scorer_actions import (
-    determine_required_scorer_actions,
+from ballbyball.selectors.innings import (
+    build_active_innings_read_model,
+    get_match_version,
+    innings_read_model_version,
+)
+from ballbyball.selectors.match import (
+    load_active_innings,
+    load_scoring_context,
+    load_scoring_match,
 )
-from ballbyball.selectors.innings import build_active_innings_read_model
-from scoring.models import InningsAggregate
-from ballbyball.services.innings_outcome_engine import (
-    detect_innings_end,
-    detect_target_state,
-    detect_follow_on_required,
-    detect_match_end,
+from ballbyball.services.determine_post_ball_outcome import (
+    determine_post_ball_outcome,
 )
 
 
-class InitialiseBallByBallSessionView(APIView):
+# Viewers of one match ask for the same state at the same moment (a
+# wicket falls): build and render it once per version
+session_state_flight = SingleFlight("ballbyball:session-state")
+
+
+def session_state_version(*, match, innings, aggregate):
+    return (
+        str(innings.id),
+        str(innings.batting_team_id),
+        str(innings.bowling_team_id),
+        innings_read_model_version(aggregate=aggregate),
+        # Match, team, competition and series edits bump the match
+        # version (the title shows their names)
+        str(get_match_version(match=match)),
+        match.state,
+        match.match_date.isoformat() if match.match_date else "",
+    )
+
+
+class InitialiseBallByBallSessionView(ConditionalGetMixin, APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
@@ -75,56 +100,53 @@ class InitialiseBallByBallSessionView(APIView):
             }
         )
 
-    def get(self, request):
-        match = Match.objects.get(id=request.query_params["match_id"])
-        validate_match_and_scorer_ownership(user=request.user, match=match)
+    def get_version(self, request):
+        self.match = load_scoring_match(
+            match_id=request.query_params["match_id"]
+        )
+        validate_match_and_scorer_ownership(
+            user=request.user, match=self.match
+        )
+        self.innings = load_active_innings(match=self.match)
+        aggregate = getattr(self.innings, "aggregate", None)
+        if aggregate is None:
+            return None
+        return session_state_version(
+            match=self.match, innings=self.innings, aggregate=aggregate
+        )
 
-        innings = match.innings.filter(state=Innings.State.ACTIVE).first()
+    def get(self, request):
+        context = load_scoring_context(match=self.match, innings=self.innings)
+        innings = context.innings
         if not innings:
             return Response({"detail": "No active innings"}, status=409)
 
-        state = build_active_innings_read_model(innings=innings)
-
-        aggregate = InningsAggregate.objects.get(
-            innings=innings
-        )
-        match_type = innings.match.match_type
-        innings_end = detect_innings_end(
-            aggregate=aggregate,
-            match_type=match_type,
+        version = session_state_version(
+            match=context.match, innings=innings, aggregate=context.aggregate
         )
-        target_state = detect_target_state(
-            aggregate=aggregate
+        data, json_content = session_state_flight.do(
+            ":".join(version),
+            lambda: self.render_session_state(context=context),
         )
-        ask_follow_on = (
-            innings_end and
-            detect_follow_on_required(
-                match_type=match_type,
-                innings_number=innings.innings_number,
-            )
-        )
-        confirm_super_over = (
-            innings_end and
-            target_state == "TIED" and
-            match_type.super_over_allowed
-        )
-        match_end = (
-            innings_end and
-            detect_match_end(
-                aggregate=aggregate,
-                match_type=match_type,
-                innings_number=innings.innings_number,
-                match=innings.match,
-            ) and
-            not confirm_super_over
+        return RenderedJSONResponse(data, json_content)
+
+    def render_session_state(self, *, context):
+        data = self.session_state(context=context)
+        return data, JSONRenderer().render(data)
+
+    def session_state(self, *, context):
+        match = context.match
+        innings = context.innings
+        state = build_active_innings_read_model(
+            innings=innings,
+            context=context,
         )
 
-        actions = determine_required_scorer_actions(
+        outcome = determine_post_ball_outcome(
             state=state,
-            innings_end=innings_end,
-            match_end=match_end,
-            ask_follow_on=ask_follow_on,
-            confirm_super_over=confirm_super_over,
+            aggregate=context.aggregate,
+            match=match,
+            innings=innings,
         )
 
         competition_label = None
@@ -139,38 +161,12 @@ class InitialiseBallByBallSessionView(APIView):
             f"{' on ' + date_label if date_label else ''}"
         )
 
-        last_ball = aggregate.last_ball
-        balls_per_over = match_type.balls_per_over
-        events = {
-            "wicket": bool(getattr(last_ball, "wicket", None)) if last_ball else False,
-            "over_end": (
-                last_ball.is_legal_delivery and
-                last_ball.ball_in_over == balls_per_over
-            ) if last_ball else False,
-            "innings_end": innings_end,
-            "match_end": match_end,
-            "target_state": target_state,
-        }
-
-        next_state = {
-            "striker": aggregate.current_striker_id,
-            "non_striker": aggregate.current_non_striker_id,
-            "bowler": aggregate.current_bowler_id,
+        return {
+            **state,
+            **outcome,
+            "match_ended": match.state == "COMPLETED",
+            "match_title": match_title,
+            "batting_team_name": innings.batting_team.name,
+            "bowling_team_name": innings.bowling_team.name,
+            "current_innings_number": innings.innings_number,
         }
-
-        return Response(
-            {
-                **state,
-                "actions": actions,
-                "events": events,
-                "next_state": next_state,
-                "match_ended": match.state == "COMPLETED",
-                "match_title": match_title,
-                "batting_team_name": innings.batting_team.name,
-                "bowling_team_name": innings.bowling_team.name,
-                "current_innings_number": innings.innings_number,
-                "umpires": list(
-                    match.umpires.values("id", "name", "short_name", "last_name")
-                ),
-            }
-        )
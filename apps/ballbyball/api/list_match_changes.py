@@ -0,0 +1,64 @@
+"""
+API ENTRYPOINT: Match Changes
+
+RESPONSIBILITY:
+- Delta sync: return a match's changes after `since`, oldest first
+- Resume with the returned `last_seq` until `has_more` is false
+- `fields` limits the optional sections of attached ball entries
+
+MUST NEVER DO:
+- Modify data
+"""
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from ballbyball.services.validate_match_and_scorer_ownership import (
+    validate_match_and_scorer_ownership,
+)
+from ballbyball.selectors.ball_entries import parse_entry_fields
+from ballbyball.selectors.match_changes import (
+    DEFAULT_MATCH_CHANGES_LIMIT,
+    MAX_MATCH_CHANGES_LIMIT,
+    select_match_changes,
+)
+from matches.models import Match
+
+
+class MatchChangesView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        match = Match.objects.get(id=request.query_params["match_id"])
+        validate_match_and_scorer_ownership(user=request.user, match=match)
+
+        params = request.query_params
+        try:
+            fields = parse_entry_fields(params.get("fields"))
+            since = int(params.get("since", 0))
+            limit = int(params.get("limit", DEFAULT_MATCH_CHANGES_LIMIT))
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=400)
+
+        if since < 0:
+            return Response({"detail": "since must be >= 0"}, status=400)
+        if not 1 <= limit <= MAX_MATCH_CHANGES_LIMIT:
+            return Response(
+                {"detail": f"limit must be between 1 and {MAX_MATCH_CHANGES_LIMIT}"},
+                status=400,
+            )
+
+        page = select_match_changes(
+            match=match,
+            since=since,
+            fields=fields,
+            limit=limit,
+        )
+
+        return Response(
+            {
+                "match_id": str(match.id),
+                "since": since,
+                **page,
+            }
+        )
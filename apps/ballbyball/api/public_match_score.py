@@ -0,0 +1,79 @@
+"""
+API ENTRYPOINT: Public Match Scoreboard and Scorecard
+
+RESPONSIBILITY:
+- Serve the live scoreboard and full scorecard of public matches to
+  anyone, without authentication
+- Let HTTP caches (CDN, reverse proxy) absorb spectator traffic: strong
+  ETag from the match's innings versions, short shared max-age with
+  stale-while-revalidate, 304 on a matching If-None-Match
+
+MUST DO:
+- Answer 404 for matches that are not public
+- Check If-None-Match before loading any stats
+
+MUST NEVER DO:
+- Modify data
+- Vary the body by user
+"""
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import AllowAny
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from backend.core.conditional import ConditionalGetMixin
+from ballbyball.selectors.public_scoreboard import (
+    build_public_scoreboard,
+    build_public_scorecard,
+    get_public_match,
+    load_public_innings,
+    public_match_version,
+)
+from matches.models import Match
+
+PUBLIC_SCORE_CACHE_CONTROL = {
+    "public": True,
+    "max_age": 2,
+    "stale_while_revalidate": 10,
+}
+
+
+class PublicMatchScoreView(ConditionalGetMixin, APIView):
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    # One representation per URL, so the ETag stays strong
+    renderer_classes = [JSONRenderer]
+    cache_control = PUBLIC_SCORE_CACHE_CONTROL
+
+    def build(self, *, match, innings_list):
+        raise NotImplementedError
+
+    def get_version(self, request):
+        try:
+            self.match = get_public_match(
+                match_id=request.query_params.get("match_id")
+            )
+        except Match.DoesNotExist:
+            raise NotFound()
+        self.innings_list = load_public_innings(match=self.match)
+        return public_match_version(
+            match=self.match, innings_list=self.innings_list
+        )
+
+    def get(self, request):
+        return Response(
+            self.build(match=self.match, innings_list=self.innings_list)
+        )
+
+
+class PublicMatchScoreboardView(PublicMatchScoreView):
+
+    def build(self, *, match, innings_list):
+        return build_public_scoreboard(match=match, innings_list=innings_list)
+
+
+class PublicMatchScorecardView(PublicMatchScoreView):
+
+    def build(self, *, match, innings_list):
+        return build_public_scorecard(match=match, innings_list=innings_list)
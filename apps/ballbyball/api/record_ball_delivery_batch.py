@@ -0,0 +1,128 @@
+"""
+API ENTRYPOINT: Record a Batch of Ball Deliveries
+
+RESPONSIBILITY:
+- Accepts an ORDERED list of delivery payloads (e.g. a buffered over)
+- Coordinates validation, persistence, and response building
+- Returns only the state after the last delivery
+
+MUST DO:
+- Validate request shape
+- Delegate ALL cricket logic to services
+- Record every delivery or none
+
+MUST NEVER DO:
+- Compute runs, overs, strike changes
+- Patch aggregates manually
+- Handle undo logic
+"""
+
+from django.db import transaction
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from ballbyball.exceptions import InvalidBallBatch
+from ballbyball.services.validate_match_and_scorer_ownership import (
+    validate_match_and_scorer_ownership,
+)
+from ballbyball.services.persist_ball_batch_and_derived_statistics import (
+    persist_ball_batch_and_derived_statistics,
+)
+from ballbyball.selectors.innings import build_active_innings_read_model
+from ballbyball.serializers.ball_delivery_batch_input_payload import (
+    BallDeliveryBatchInputPayloadSerializer,
+)
+from ballbyball.serializers.ball_delivery_state_response import (
+    BallDeliveryStateResponseSerializer,
+)
+from ballbyball.selectors.match import load_scoring_context
+from ballbyball.services.determine_post_ball_outcome import (
+    determine_post_ball_outcome,
+)
+from ballbyball.services.record_match_changes import (
+    record_match_state_change,
+)
+
+# Payload keys that name a related row; the service takes their *_id form
+RELATED_PAYLOAD_KEYS = (
+    "striker",
+    "non_striker",
+    "bowler",
+    "umpire_bowler_end",
+    "umpire_square_leg",
+)
+
+
+def to_delivery_kwargs(payload):
+    delivery = dict(payload)
+    for key in RELATED_PAYLOAD_KEYS:
+        if key in delivery:
+            delivery[f"{key}_id"] = delivery.pop(key)
+    return delivery
+
+
+class RecordBallDeliveryBatchView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = BallDeliveryBatchInputPayloadSerializer(
+            data=request.data
+        )
+        serializer.is_valid(raise_exception=True)
+        payload = serializer.validated_data
+
+        context = load_scoring_context(match_id=payload["match_id"])
+        match = context.match
+        validate_match_and_scorer_ownership(
+            user=request.user, match=match
+        )
+
+        innings = context.innings
+        if not innings:
+            return Response(
+                {"detail": "No active innings"},
+                status=409,
+            )
+
+        try:
+            persist_ball_batch_and_derived_statistics(
+                user=request.user,
+                innings=innings,
+                deliveries=[
+                    to_delivery_kwargs(delivery)
+                    for delivery in payload["deliveries"]
+                ],
+            )
+        except InvalidBallBatch as exc:
+            return Response(
+                {"detail": str(exc), "index": exc.index},
+                status=400,
+            )
+
+        context.refresh_aggregate()
+        state = build_active_innings_read_model(
+            innings=innings,
+            context=context,
+        )
+
+        outcome = determine_post_ball_outcome(
+            state=state,
+            aggregate=context.aggregate,
+            match=match,
+            innings=innings,
+        )
+
+        if outcome["events"]["match_end"] and match.state != "COMPLETED":
+            match.state = "COMPLETED"
+            with transaction.atomic():
+                match.save(update_fields=["state"])
+                record_match_state_change(match=match)
+
+        response_serializer = BallDeliveryStateResponseSerializer(
+            {
+                **state,
+                **outcome,
+            }
+        )
+        return Response(response_serializer.data)
@@ -17,11 +17,11 @@ MUST NEVER DO:
 - Handle undo logic
 """
 
+from django.db import transaction
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from matches.models import Match, Innings
 from ballbyball.services.validate_match_and_scorer_ownership import (
     validate_match_and_scorer_ownership,
 )
@@ -38,15 +38,14 @@ from ballbyball.serializers.ball_delivery_input_payload import (
 from ballbyball.serializers.ball_delivery_state_response import (
     BallDeliveryStateResponseSerializer,
 )
-from scoring.models import InningsAggregate
-from ballbyball.services.innings_outcome_engine import (
-    detect_innings_end,
-    detect_target_state,
-    detect_follow_on_required,
-    detect_match_end,
+from ballbyball.selectors.match import load_scoring_context
+from ballbyball.services.innings_outcome_engine import detect_innings_end
+from ballbyball.services.determine_post_ball_outcome import (
+    determine_post_ball_outcome,
+)
+from ballbyball.services.record_match_changes import (
+    record_match_state_change,
 )
-
-from coredata.models import Player
 
 class RecordSingleBallDeliveryView(APIView):
     permission_classes = [IsAuthenticated]
@@ -58,31 +57,29 @@ class RecordSingleBallDeliveryView(APIView):
         serializer.is_valid(raise_exception=True)
         payload = serializer.validated_data
 
-        match = Match.objects.get(id=payload["match_id"])
+        context = load_scoring_context(match_id=payload["match_id"])
+        match = context.match
         validate_match_and_scorer_ownership(
             user=request.user, match=match
         )
 
-        innings = match.innings.filter(
-            state=Innings.State.ACTIVE
-        ).order_by("-innings_number").first()
+        innings = context.innings
         if not innings:
             return Response(
                 {"detail": "No active innings"},
                 status=409,
             )
 
-        aggregate = InningsAggregate.objects.get(
-            innings=innings
-        )
-        match_type = innings.match.match_type
+        aggregate = context.aggregate
+        match_type = context.match_type
         innings_already_ended = detect_innings_end(
             aggregate=aggregate,
             match_type=match_type,
         )
         if innings_already_ended:
             state = build_active_innings_read_model(
-                innings=innings
+                innings=innings,
+                context=context,
             )
             actions = determine_required_scorer_actions(
                 state=state,
@@ -96,9 +93,9 @@ class RecordSingleBallDeliveryView(APIView):
                 status=409,
             )
 
-        striker = Player.objects.get(id=payload["striker"])
-        non_striker = Player.objects.get(id=payload["non_striker"])
-        bowler = Player.objects.get(id=payload["bowler"])
+        striker, non_striker, bowler = context.get_players(
+            [payload["striker"], payload["non_striker"], payload["bowler"]]
+        )
 
         persist_ball_and_derived_statistics(
             user=request.user,
@@ -133,81 +130,31 @@ class RecordSingleBallDeliveryView(APIView):
             release=payload.get("release"),
             video=payload.get("video"),
             fielding=payload.get("fielding"),
+            context=context,
         )
 
         state = build_active_innings_read_model(
-            innings=innings
-        )
-
-        aggregate = InningsAggregate.objects.get(innings=innings)
-        match_type = innings.match.match_type
-        innings_end = detect_innings_end(
-            aggregate=aggregate,
-            match_type=match_type,
-        )
-        target_state = detect_target_state(
-            aggregate=aggregate
-        )
-        ask_follow_on = (
-            innings_end and
-            detect_follow_on_required(
-                match_type=match_type,
-                innings_number=innings.innings_number,
-            )
-        )
-        confirm_super_over = (
-            innings_end and
-            target_state == "TIED" and
-            match_type.super_over_allowed
-        )
-        match_end = (
-            innings_end and
-            detect_match_end(
-                aggregate=aggregate,
-                match_type=match_type,
-                innings_number=innings.innings_number,
-                match=innings.match,
-            ) and
-            not confirm_super_over
+            innings=innings,
+            context=context,
         )
 
-        if match_end and innings.match.state != "COMPLETED":
-            innings.match.state = "COMPLETED"
-            innings.match.save(update_fields=["state"])
-
-        actions = determine_required_scorer_actions(
+        outcome = determine_post_ball_outcome(
             state=state,
-            innings_end=innings_end,
-            match_end=match_end,
-            ask_follow_on=ask_follow_on,
-            confirm_super_over=confirm_super_over,
+            aggregate=context.aggregate,
+            match=match,
+            innings=innings,
         )
 
-        last_ball = aggregate.last_ball
-        balls_per_over = match_type.balls_per_over
-        events = {
-            "wicket": bool(getattr(last_ball, "wicket", None)) if last_ball else False,
-            "over_end": (
-                last_ball.is_legal_delivery and
-                last_ball.ball_in_over == balls_per_over
-            ) if last_ball else False,
-            "innings_end": innings_end,
-            "match_end": match_end,
-            "target_state": target_state,
-        }
-
-        next_state = {
-            "striker": aggregate.current_striker_id,
-            "non_striker": aggregate.current_non_striker_id,
-            "bowler": aggregate.current_bowler_id,
-        }
+        if outcome["events"]["match_end"] and match.state != "COMPLETED":
+            match.state = "COMPLETED"
+            with transaction.atomic():
+                match.save(update_fields=["state"])
+                record_match_state_change(match=match)
 
         response_serializer = BallDeliveryStateResponseSerializer(
             {
                 **state,
-                "actions": actions,
-                "events": events,
-                "next_state": next_state,
+                **outcome,
             }
         )
         return Response(response_serializer.data)
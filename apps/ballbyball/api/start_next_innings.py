@@ -25,6 +25,11 @@ from ballbyball.serializers.ball_delivery_state_response import (
     BallDeliveryStateResponseSerializer,
 )
 from scoring.models import InningsAggregate
+from ballbyball.models import MatchChange
+from ballbyball.services.record_match_changes import (
+    record_match_changes,
+    summarize_score,
+)
 from ballbyball.services.match_context_engine import (
     compute_limited_overs_target,
     compute_fourth_innings_target,
@@ -36,7 +41,9 @@ class StartNextInningsView(APIView):
 
     @transaction.atomic
     def post(self, request):
-        match = Match.objects.get(id=request.data["match_id"])
+        match = Match.objects.select_related("change_cursor").get(
+            id=request.data["match_id"]
+        )
         validate_match_and_scorer_ownership(
             user=request.user, match=match
         )
@@ -73,6 +80,7 @@ class StartNextInningsView(APIView):
         innings.start_time = timezone.now()
         innings.save(update_fields=["state", "start_time"])
 
+        match_resumed = match.state != "IN_PROGRESS"
         match.state = "IN_PROGRESS"
         match.save(update_fields=["state"])
 
@@ -124,6 +132,23 @@ class StartNextInningsView(APIView):
                     update_fields=["is_chasing", "target_runs"]
                 )
 
+        changes = [(
+            MatchChange.Kind.INNINGS,
+            {
+                "innings": innings.innings_number,
+                "innings_id": str(innings.id),
+                "state": innings.state,
+                "batting_team_id": str(innings.batting_team_id),
+                "is_super_over": innings.is_super_over,
+                "target_runs": aggregate.target_runs,
+                "score": summarize_score(aggregate),
+            },
+        )]
+        if match_resumed:
+            changes.append((MatchChange.Kind.MATCH, {"state": match.state}))
+        record_match_changes(match_id=match.id, changes=changes)
+
+        innings.match = match
         state = build_active_innings_read_model(innings=innings)
         actions = determine_required_scorer_actions(state=state)
 
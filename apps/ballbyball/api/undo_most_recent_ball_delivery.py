@@ -9,6 +9,7 @@ MUST DO:
 - Validate match and innings state
 - Call undo orchestration service
 - Return rebuilt authoritative state
+- Allow forcing a full rebuild via "full_rebuild"
 
 MUST NEVER DO:
 - Reverse calculations
@@ -16,28 +17,26 @@ MUST NEVER DO:
 - Undo more than one ball
 """
 
+from django.db import transaction
+from rest_framework import serializers
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from scoring.models import Ball
-from matches.models import Match, Innings
 from ballbyball.services.undo_last_recorded_ball import (
     undo_last_recorded_ball,
 )
 from ballbyball.selectors.innings import build_active_innings_read_model
-from ballbyball.services.determine_required_scorer_actions import (
-    determine_required_scorer_actions,
-)
 from ballbyball.serializers.ball_delivery_state_response import (
     BallDeliveryStateResponseSerializer,
 )
-from scoring.models import InningsAggregate
-from ballbyball.services.innings_outcome_engine import (
-    detect_innings_end,
-    detect_target_state,
-    detect_follow_on_required,
-    detect_match_end,
+from ballbyball.selectors.match import load_scoring_context
+from ballbyball.services.determine_post_ball_outcome import (
+    determine_post_ball_outcome,
+)
+from ballbyball.services.record_match_changes import (
+    record_match_state_change,
 )
 
 
@@ -45,84 +44,42 @@ class UndoMostRecentBallDeliveryView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
-        match = Match.objects.get(id=request.data["match_id"])
-        innings = match.innings.filter(state=Innings.State.ACTIVE).first()
+        # Form bodies send "false" / "0" as strings
+        full_rebuild = serializers.BooleanField().to_internal_value(
+            request.data.get("full_rebuild", False)
+        )
+        context = load_scoring_context(match_id=request.data["match_id"])
+        match = context.match
+        innings = context.innings
 
         if match.state == "COMPLETED":
             match.state = "IN_PROGRESS"
-            match.save(update_fields=["state"])
+            with transaction.atomic():
+                match.save(update_fields=["state"])
+                record_match_state_change(match=match)
 
-        undo_last_recorded_ball(innings=innings)
-
-        state = build_active_innings_read_model(innings=innings)
-
-        aggregate = InningsAggregate.objects.get(
-            innings=innings
-        )
-        match_type = innings.match.match_type
-        innings_end = detect_innings_end(
-            aggregate=aggregate,
-            match_type=match_type,
+        undo_last_recorded_ball(
+            innings=innings,
+            full_rebuild=full_rebuild,
         )
-        target_state = detect_target_state(
-            aggregate=aggregate
-        )
-        ask_follow_on = (
-            innings_end and
-            detect_follow_on_required(
-                match_type=match_type,
-                innings_number=innings.innings_number,
-            )
-        )
-        confirm_super_over = (
-            innings_end and
-            target_state == "TIED" and
-            match_type.super_over_allowed
-        )
-        match_end = (
-            innings_end and
-            detect_match_end(
-                aggregate=aggregate,
-                match_type=match_type,
-                innings_number=innings.innings_number,
-                match=innings.match,
-            ) and
-            not confirm_super_over
+
+        context.refresh_aggregate()
+        state = build_active_innings_read_model(
+            innings=innings,
+            context=context,
         )
 
-        actions = determine_required_scorer_actions(
+        outcome = determine_post_ball_outcome(
             state=state,
-            innings_end=innings_end,
-            match_end=match_end,
-            ask_follow_on=ask_follow_on,
-            confirm_super_over=confirm_super_over,
+            aggregate=context.aggregate,
+            match=match,
+            innings=innings,
         )
 
-        last_ball = aggregate.last_ball
-        balls_per_over = match_type.balls_per_over
-        events = {
-            "wicket": bool(getattr(last_ball, "wicket", None)) if last_ball else False,
-            "over_end": (
-                last_ball.is_legal_delivery and
-                last_ball.ball_in_over == balls_per_over
-            ) if last_ball else False,
-            "innings_end": innings_end,
-            "match_end": match_end,
-            "target_state": target_state,
-        }
-
-        next_state = {
-            "striker": aggregate.current_striker_id,
-            "non_striker": aggregate.current_non_striker_id,
-            "bowler": aggregate.current_bowler_id,
-        }
-
         response_serializer = BallDeliveryStateResponseSerializer(
             {
                 **state,
-                "actions": actions,
-                "events": events,
-                "next_state": next_state,
+                **outcome,
             }
         )
         return Response(response_serializer.data)
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class BallbyballConfig(AppConfig):
     name = 'ballbyball'
+
+    def ready(self):
+        from ballbyball import signals  # noqa: F401
@@ -0,0 +1,226 @@
+"""
+CONSUMERS: Live Match Changes
+
+RESPONSIBILITY:
+- WebSocket: one per viewer, joined to its match's group; relay the
+  changes broadcast after each committed mutation, trimmed to the
+  sections the viewer asked for (`?fields=`). On connect with
+  `?since=<seq>`, send the changes missed before joining
+- Long-poll: for clients that cannot hold a WebSocket, hold one HTTP
+  request open until the match's next change commits
+
+MUST NEVER DO:
+- Modify data
+- Query the database per broadcast
+- Hold a worker thread while waiting
+"""
+import asyncio
+import json
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
+from channels.generic.http import AsyncHttpConsumer
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.exceptions import PermissionDenied
+
+from ballbyball.selectors.ball_entries import parse_entry_fields, trim_entry
+from ballbyball.selectors.match_changes import (
+    MAX_MATCH_CHANGES_LIMIT,
+    select_match_changes,
+)
+from ballbyball.services.broadcast_match_changes import match_changes_group
+from ballbyball.services.match_change_notifier import match_change_notifier
+from ballbyball.services.validate_match_and_scorer_ownership import (
+    validate_match_and_scorer_ownership,
+)
+from matches.models import Match
+
+# WebSocket close codes (4000-4999 are application-defined)
+CLOSE_UNAUTHORIZED = 4401
+CLOSE_FORBIDDEN = 4403
+CLOSE_NOT_FOUND = 4404
+CLOSE_BAD_REQUEST = 4400
+
+
+def trim_change(change, *, fields):
+    """
+    A broadcast change (full entries) cut down to `fields`.
+    """
+    if "entries" not in change:
+        return change
+    return {
+        **change,
+        "entries": [
+            trim_entry(entry, fields=fields) for entry in change["entries"]
+        ],
+    }
+
+
+@database_sync_to_async
+def load_viewable_match(*, user, match_id):
+    match = Match.objects.get(id=match_id)
+    validate_match_and_scorer_ownership(user=user, match=match)
+    return match
+
+
+class MatchChangesConsumer(AsyncJsonWebsocketConsumer):
+
+    async def connect(self):
+        self.group_name = None
+        user = self.scope.get("user")
+        if user is None or not user.is_authenticated:
+            await self.close(code=CLOSE_UNAUTHORIZED)
+            return
+
+        params = parse_qs(self.scope.get("query_string", b"").decode())
+        try:
+            self.fields = parse_entry_fields(params.get("fields", [""])[0])
+            since = params.get("since", [None])[0]
+            since = None if since is None else int(since)
+        except ValueError:
+            await self.close(code=CLOSE_BAD_REQUEST)
+            return
+
+        match_id = self.scope["url_route"]["kwargs"]["match_id"]
+        try:
+            match = await load_viewable_match(user=user, match_id=match_id)
+        except Match.DoesNotExist:
+            await self.close(code=CLOSE_NOT_FOUND)
+            return
+        except PermissionDenied:
+            await self.close(code=CLOSE_FORBIDDEN)
+            return
+
+        # Join before catching up: a change committed in between is
+        # sent twice rather than lost, and clients drop repeated seqs
+        self.group_name = match_changes_group(match.id)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+
+        while since is not None:
+            page = await database_sync_to_async(select_match_changes)(
+                match=match,
+                since=since,
+                fields=self.fields,
+                limit=MAX_MATCH_CHANGES_LIMIT,
+            )
+            if page["changes"]:
+                await self.send_json(
+                    {"type": "changes", "changes": page["changes"]}
+                )
+            since = page["last_seq"] if page["has_more"] else None
+
+    async def disconnect(self, code):
+        if self.group_name:
+            await self.channel_layer.group_discard(
+                self.group_name, self.channel_name
+            )
+
+    async def receive_json(self, content, **kwargs):
+        # Push only; viewers have nothing to send
+        pass
+
+    async def match_changes(self, event):
+        await self.send_json({
+            "type": "changes",
+            "changes": [
+                trim_change(change, fields=self.fields)
+                for change in event["changes"]
+            ],
+        })
+
+
+DEFAULT_WAIT_SECONDS = 25
+MAX_WAIT_SECONDS = 60
+
+
+class MatchChangesLongPollConsumer(AsyncHttpConsumer):
+    """
+    GET ?match_id=&since=<seq>[&fields=&timeout=]: answers at once when
+    changes after `since` exist, otherwise holds the request open (no
+    worker thread) until the next change commits or `timeout` seconds
+    pass. The body has the shape of the match-changes feed; on timeout
+    `changes` is empty and `last_seq` is `since`.
+    """
+
+    async def handle(self, body):
+        user = self.scope.get("user")
+        if user is None or not user.is_authenticated:
+            await self.send_json(401, {"detail": "Authentication required"})
+            return
+
+        params = parse_qs(self.scope.get("query_string", b"").decode())
+        try:
+            match_id = params["match_id"][0]
+            since = int(params["since"][0])
+            fields = parse_entry_fields(params.get("fields", [""])[0])
+            timeout = float(params.get("timeout", [DEFAULT_WAIT_SECONDS])[0])
+        except KeyError as exc:
+            await self.send_json(400, {"detail": f"{exc.args[0]} is required"})
+            return
+        except ValueError as exc:
+            await self.send_json(400, {"detail": str(exc)})
+            return
+        if since < 0 or not 0 < timeout <= MAX_WAIT_SECONDS:
+            await self.send_json(
+                400,
+                {"detail": f"since must be >= 0 and timeout in (0, {MAX_WAIT_SECONDS}]"},
+            )
+            return
+
+        try:
+            match = await load_viewable_match(user=user, match_id=match_id)
+        except (Match.DoesNotExist, DjangoValidationError):
+            await self.send_json(404, {"detail": "Match not found"})
+            return
+        except PermissionDenied as exc:
+            await self.send_json(403, {"detail": str(exc.detail)})
+            return
+
+        waiter = await match_change_notifier.subscribe(match.id)
+        try:
+            page = await database_sync_to_async(select_match_changes)(
+                match=match, since=since, fields=fields
+            )
+            if not page["changes"]:
+                try:
+                    broadcast = await asyncio.wait_for(waiter, timeout)
+                except asyncio.TimeoutError:
+                    broadcast = []
+                page = await self.changes_after(
+                    match=match, since=since, fields=fields, broadcast=broadcast
+                )
+        finally:
+            match_change_notifier.unsubscribe(match.id, waiter)
+
+        await self.send_json(
+            200, {"match_id": str(match.id), "since": since, **page}
+        )
+
+    async def changes_after(self, *, match, since, fields, broadcast):
+        """
+        The woken page, served from the broadcast itself unless it does
+        not follow on from `since`.
+        """
+        changes = [change for change in broadcast if change["seq"] > since]
+        if changes and changes[0]["seq"] != since + 1:
+            return await database_sync_to_async(select_match_changes)(
+                match=match, since=since, fields=fields
+            )
+        return {
+            "changes": [trim_change(change, fields=fields) for change in changes],
+            "last_seq": changes[-1]["seq"] if changes else since,
+            "has_more": False,
+        }
+
+    async def send_json(self, status, content):
+        await self.send_response(
+            status,
+            json.dumps(content, cls=DjangoJSONEncoder).encode(),
+            headers=[
+                (b"Content-Type", b"application/json"),
+                (b"Cache-Control", b"no-store"),
+            ],
+        )
@@ -8,3 +8,21 @@ RESPONSIBILITY:
 MUST NEVER DO:
 - Handle HTTP responses
 """
+
+
+class DerivedStatisticsOutOfSync(Exception):
+    """
+    Aggregate or player stats do not match the recorded ball history,
+    so an incremental change cannot be applied safely.
+    """
+
+
+class InvalidBallBatch(ValueError):
+    """
+    A delivery in a batch failed validation or sequencing. `index` is
+    its position in the batch; nothing from the batch was recorded.
+    """
+
+    def __init__(self, message, *, index):
+        super().__init__(message)
+        self.index = index
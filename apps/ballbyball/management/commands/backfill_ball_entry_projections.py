@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from ballbyball.models import BallEntryProjection
+from ballbyball.selectors.ball_entries import ball_entry_queryset
+from ballbyball.services.build_ball_entry import (
+    SECTION_BUILDERS,
+    build_ball_entry,
+)
+from ballbyball.services.write_ball_entry_projections import (
+    build_ball_entry_projection,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Write ball-feed entry projections for balls recorded without one "
+        "(before projections existed, or outside the ball-by-ball API)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--match", dest="match_id",
+            help="Only backfill this match",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=500,
+            help="Balls rendered per transaction. Default: 500",
+        )
+
+    def handle(self, *args, **options):
+        balls = (
+            ball_entry_queryset(fields=set(SECTION_BUILDERS))
+            .filter(entry_projection__isnull=True)
+            .order_by("match_id", "innings__innings_number", "ball_number")
+        )
+        if options["match_id"]:
+            balls = balls.filter(match_id=options["match_id"])
+
+        written = 0
+        while True:
+            # Written balls drop out of the filter, so always take the head
+            with transaction.atomic():
+                batch = list(balls[:options["batch_size"]])
+                if not batch:
+                    break
+                BallEntryProjection.objects.bulk_create(
+                    build_ball_entry_projection(
+                        ball=ball,
+                        innings_number=ball.innings_number,
+                        entry=build_ball_entry(
+                            ball=ball,
+                            innings_number=ball.innings_number,
+                        ),
+                    )
+                    for ball in batch
+                )
+            written += len(batch)
+            self.stdout.write(f"{written} projections written")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Backfilled {written} ball entry projections"
+        ))
@@ -0,0 +1,303 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import User
+from organizations.models import Organization
+from competitions.models import (
+    Tournament,
+    Competition,
+    CompetitionTeam,
+    CompetitionSquad,
+)
+from coredata.models import Nationality, Team, Player, Umpire
+from matches.models import Match, MatchType, Innings, PlayingXI, Toss
+from scoring.models import InningsAggregate
+from ballbyball.services.generate_synthetic_innings import (
+    generate_synthetic_innings,
+)
+from ballbyball.services.persist_ball_and_derived_statistics import (
+    persist_ball_and_derived_statistics,
+)
+from ballbyball.services.persist_ball_batch_and_derived_statistics import (
+    persist_ball_batch_and_derived_statistics,
+)
+
+MATCH_FORMATS = {
+    "T20": {"name": "T20", "balls_per_over": 6, "max_overs": 20, "max_innings": 2},
+    "ODI": {"name": "ODI", "balls_per_over": 6, "max_overs": 50, "max_innings": 2},
+    "TEST": {"name": "Test", "balls_per_over": 6, "max_overs": None, "max_innings": 4},
+}
+TEAMS_PER_COMPETITION = 4
+PLAYERS_PER_TEAM = 11
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate seeded organizations, competitions and completed matches "
+        "with full ball-by-ball histories, for load and performance testing."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--organizations", type=int, default=1)
+        parser.add_argument(
+            "--competitions", type=int, default=1,
+            help="Competitions per organization. Default: 1",
+        )
+        parser.add_argument(
+            "--matches", type=int, default=10,
+            help="Matches per competition. Default: 10",
+        )
+        parser.add_argument(
+            "--format", choices=sorted(MATCH_FORMATS), default="T20",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--path", choices=("bulk", "single"), default="bulk",
+            help=(
+                "bulk: one batch insert per chunk of deliveries (fast). "
+                "single: the per-ball scoring path, as the live API writes."
+            ),
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=600,
+            help="Deliveries per batch on the bulk path. Default: 600",
+        )
+        parser.add_argument(
+            "--trajectory-points", type=int, default=8,
+            help="Trajectory points per ball. Default: 8",
+        )
+
+    def handle(self, *args, **options):
+        seed = options["seed"]
+        self.rng = random.Random(seed)
+        self.options = options
+        self.match_type = self.get_match_type(options["format"])
+        self.nationality, _ = Nationality.objects.get_or_create(
+            code="SYN", defaults={"name": "Synthetic"}
+        )
+
+        username_prefix = f"synthetic-{seed}-"
+        if User.objects.filter(username__startswith=username_prefix).exists():
+            raise CommandError(
+                f"Data for seed {seed} already exists; pick another --seed"
+            )
+
+        started = time.perf_counter()
+        total_matches = 0
+        total_balls = 0
+
+        for org_index in range(options["organizations"]):
+            user = User.objects.create_user(username=f"{username_prefix}{org_index}")
+            organization = Organization.objects.create(
+                name=f"Synthetic Org {seed}-{org_index}",
+                created_by=user,
+            )
+            user.organization = organization
+            user.save(update_fields=["organization"])
+
+            for comp_index in range(options["competitions"]):
+                squads, umpires, competition = self.create_competition(
+                    organization=organization,
+                    name=f"Synthetic {seed}-{org_index}-{comp_index}",
+                )
+                for match_index in range(options["matches"]):
+                    balls = self.create_match(
+                        user=user,
+                        organization=organization,
+                        competition=competition,
+                        squads=squads,
+                        umpires=umpires,
+                        match_index=match_index,
+                    )
+                    total_matches += 1
+                    total_balls += balls
+                    elapsed = time.perf_counter() - started
+                    self.stdout.write(
+                        f"match {total_matches}: {balls} balls "
+                        f"({total_balls} total, {total_balls / elapsed:.0f} balls/s)"
+                    )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {total_matches} matches and {total_balls} balls "
+            f"in {time.perf_counter() - started:.1f}s (seed={seed})"
+        ))
+
+    def get_match_type(self, code):
+        spec = MATCH_FORMATS[code]
+        match_type, _ = MatchType.objects.get_or_create(code=code, defaults=spec)
+        return match_type
+
+    def create_competition(self, *, organization, name):
+        owned = {"owner_type": "ORG", "owner_id": organization.id}
+        tournament = Tournament.objects.create(
+            name=name, short_name=name[:50], tournament_type="LEAGUE", **owned
+        )
+        competition = Competition.objects.create(
+            name=name, tournament=tournament, **owned
+        )
+
+        squads = []
+        for team_index in range(TEAMS_PER_COMPETITION):
+            team = Team.objects.create(
+                name=f"{name} Team {team_index}",
+                short_name=f"T{team_index}",
+                team_type="LEAGUE",
+                nationality=self.nationality,
+                **owned,
+            )
+            players = Player.objects.bulk_create(
+                Player(
+                    first_name=f"{team.short_name}P{number}",
+                    last_name=name,
+                    nationality=self.nationality,
+                    gender="MALE",
+                    **owned,
+                )
+                for number in range(PLAYERS_PER_TEAM)
+            )
+            competition_team = CompetitionTeam.objects.create(
+                competition=competition, team=team
+            )
+            CompetitionSquad.objects.bulk_create(
+                CompetitionSquad(competition_team=competition_team, player=player)
+                for player in players
+            )
+            squads.append((team, players))
+
+        umpires = [
+            Umpire.objects.create(
+                name=f"{name} Umpire {number}",
+                nationality=self.nationality,
+                **owned,
+            )
+            for number in range(2)
+        ]
+        return squads, umpires, competition
+
+    @transaction.atomic
+    def create_match(
+        self,
+        *,
+        user,
+        organization,
+        competition,
+        squads,
+        umpires,
+        match_index,
+    ):
+        first = match_index % len(squads)
+        second = (first + 1 + match_index // len(squads)) % len(squads)
+        if second == first:
+            second = (first + 1) % len(squads)
+        (team1, players1), (team2, players2) = squads[first], squads[second]
+
+        match = Match.objects.create(
+            competition=competition,
+            match_type=self.match_type,
+            team1=team1,
+            team2=team2,
+            match_date=timezone.localdate(),
+            state="IN_PROGRESS",
+            match_mode="ONLINE",
+            owner_type="ORG",
+            owner_id=organization.id,
+        )
+        Toss.objects.create(match=match, won_by=team1, decision="BAT")
+        match.umpires.add(*umpires)
+        PlayingXI.objects.bulk_create(
+            PlayingXI(
+                match=match,
+                team=team,
+                player=player,
+                batting_position=position + 1,
+            )
+            for team, players in ((team1, players1), (team2, players2))
+            for position, player in enumerate(players)
+        )
+
+        sides = [(team1, players1, team2, players2), (team2, players2, team1, players1)]
+        innings_runs = []
+        balls = 0
+
+        for innings_number in range(1, self.match_type.max_innings + 1):
+            batting_team, batters, bowling_team, fielders = sides[(innings_number - 1) % 2]
+            target_runs = None
+            if innings_number == self.match_type.max_innings:
+                # The side batting last chases the other side's total,
+                # less what it already has; a negative target is an
+                # innings win
+                target_runs = sum(innings_runs[::2]) - sum(innings_runs[1::2])
+                if target_runs < 0:
+                    break
+
+            innings = Innings.objects.create(
+                match=match,
+                innings_number=innings_number,
+                batting_team=batting_team,
+                bowling_team=bowling_team,
+                state=Innings.State.ACTIVE,
+                start_time=timezone.now(),
+            )
+            InningsAggregate.objects.create(
+                innings=innings,
+                is_chasing=target_runs is not None,
+                target_runs=target_runs,
+            )
+
+            deliveries = generate_synthetic_innings(
+                rng=self.rng,
+                batter_ids=[player.id for player in batters],
+                bowler_ids=[player.id for player in fielders[-5:]],
+                fielder_ids=[player.id for player in fielders],
+                umpire_ids=[umpire.id for umpire in umpires],
+                review_team_id=bowling_team.id,
+                balls_per_over=self.match_type.balls_per_over,
+                max_overs=self.match_type.max_overs,
+                target_runs=target_runs,
+                trajectory_points=self.options["trajectory_points"],
+            )
+            self.persist_deliveries(
+                user=user,
+                innings=innings,
+                deliveries=deliveries,
+                players={player.id: player for player in batters + fielders},
+            )
+            balls += len(deliveries)
+
+            innings.state = Innings.State.COMPLETED
+            innings.end_time = timezone.now()
+            innings.save(update_fields=["state", "end_time"])
+            innings_runs.append(
+                InningsAggregate.objects.values_list("runs", flat=True)
+                .get(innings=innings)
+            )
+
+        match.state = "COMPLETED"
+        match.save(update_fields=["state"])
+        return balls
+
+    def persist_deliveries(self, *, user, innings, deliveries, players):
+        if self.options["path"] == "bulk":
+            batch_size = self.options["batch_size"]
+            for start in range(0, len(deliveries), batch_size):
+                persist_ball_batch_and_derived_statistics(
+                    user=user,
+                    innings=innings,
+                    deliveries=deliveries[start:start + batch_size],
+                )
+            return
+
+        for delivery in deliveries:
+            delivery = dict(delivery)
+            persist_ball_and_derived_statistics(
+                user=user,
+                innings=innings,
+                striker=players[delivery.pop("striker_id")],
+                non_striker=players[delivery.pop("non_striker_id")],
+                bowler=players[delivery.pop("bowler_id")],
+                **delivery,
+            )
@@ -0,0 +1,32 @@
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("matches", "0003_match_match_referee_match_third_umpire_and_more"),
+        ("scoring", "0022_inningsovercheckpoint"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BallEntryProjection",
+            fields=[
+                ("id", models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ("innings_number", models.PositiveSmallIntegerField()),
+                ("ball_number", models.PositiveIntegerField()),
+                ("entry", models.JSONField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("ball", models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name="entry_projection", to="scoring.ball")),
+                ("innings", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="ball_entry_projections", to="matches.innings")),
+                ("match", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="ball_entry_projections", to="matches.match")),
+            ],
+            options={
+                "indexes": [models.Index(fields=["match", "innings_number", "ball_number"], name="ballbyball__match_i_f448fa_idx")],
+            },
+        ),
+    ]
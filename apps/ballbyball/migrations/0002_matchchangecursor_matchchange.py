@@ -0,0 +1,36 @@
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ballbyball", "0001_initial"),
+        ("matches", "0003_match_match_referee_match_third_umpire_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MatchChangeCursor",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("last_seq", models.PositiveBigIntegerField(default=0)),
+                ("match", models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name="change_cursor", to="matches.match")),
+            ],
+        ),
+        migrations.CreateModel(
+            name="MatchChange",
+            fields=[
+                ("id", models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ("seq", models.PositiveBigIntegerField()),
+                ("kind", models.CharField(choices=[("BALL", "Ball"), ("UNDO", "Undo"), ("PENALTY", "Penalty"), ("DLS", "Dls"), ("INNINGS", "Innings"), ("MATCH", "Match")], max_length=16)),
+                ("data", models.JSONField(default=dict)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("match", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="changes", to="matches.match")),
+            ],
+            options={
+                "constraints": [models.UniqueConstraint(fields=("match", "seq"), name="unique_match_change_seq")],
+            },
+        ),
+    ]
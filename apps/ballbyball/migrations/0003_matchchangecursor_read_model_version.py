@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ballbyball", "0002_matchchangecursor_matchchange"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="matchchangecursor",
+            name="read_model_version",
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
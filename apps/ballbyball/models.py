@@ -1,3 +1,116 @@
+import uuid
 from django.db import models
+from matches.models import Match, Innings
+from scoring.models import Ball
 
-# Create your models here.
+
+class BallEntryProjection(models.Model):
+    """
+    Ready-to-serve ball-feed entry for one Ball, rendered when the ball
+    is recorded. Derived: deleted with its ball, rebuildable from it.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    ball = models.OneToOneField(
+        Ball,
+        on_delete=models.CASCADE,
+        related_name="entry_projection"
+    )
+
+    match = models.ForeignKey(
+        Match,
+        on_delete=models.CASCADE,
+        related_name="ball_entry_projections"
+    )
+
+    innings = models.ForeignKey(
+        Innings,
+        on_delete=models.CASCADE,
+        related_name="ball_entry_projections"
+    )
+
+    # Copied from innings/ball so feed pages are a range scan on one table
+    innings_number = models.PositiveSmallIntegerField()
+    ball_number = models.PositiveIntegerField()
+
+    # build_ball_entry output with every section
+    entry = models.JSONField()
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["match", "innings_number", "ball_number"]),
+        ]
+
+    def __str__(self):
+        return f"Entry projection for Ball {self.ball_id}"
+
+
+class MatchChangeCursor(models.Model):
+    """
+    Last change sequence number handed out for a match. Writers bump it
+    with an UPDATE, so its row lock orders concurrent mutations and
+    sequence numbers commit in order.
+
+    `read_model_version` is bumped when what a match's read models show
+    besides the score changes (XI, umpires, names, title), so every
+    worker builds the same cache keys and ETags from it.
+    """
+
+    match = models.OneToOneField(
+        Match,
+        on_delete=models.CASCADE,
+        related_name="change_cursor"
+    )
+
+    last_seq = models.PositiveBigIntegerField(default=0)
+    read_model_version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"Change cursor for Match {self.match_id} at {self.last_seq}"
+
+
+class MatchChange(models.Model):
+    """
+    One scoring mutation of a match, in compact form, numbered by a
+    per-match sequence so clients can pull only what they missed.
+    """
+
+    class Kind(models.TextChoices):
+        BALL = "BALL"
+        UNDO = "UNDO"
+        PENALTY = "PENALTY"
+        DLS = "DLS"
+        INNINGS = "INNINGS"
+        MATCH = "MATCH"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    match = models.ForeignKey(
+        Match,
+        on_delete=models.CASCADE,
+        related_name="changes"
+    )
+
+    seq = models.PositiveBigIntegerField()
+
+    kind = models.CharField(max_length=16, choices=Kind.choices)
+
+    # Ids, numbers and the score after the change; ball entries are
+    # joined from their projections when served
+    data = models.JSONField(default=dict)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["match", "seq"],
+                name="unique_match_change_seq",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.seq} for Match {self.match_id}"
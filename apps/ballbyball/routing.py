@@ -0,0 +1,24 @@
+from channels.auth import AuthMiddlewareStack
+from django.urls import path
+from ballbyball.consumers import (
+    MatchChangesConsumer,
+    MatchChangesLongPollConsumer,
+)
+
+websocket_urlpatterns = [
+    path(
+        "ws/ballbyball/matches/<uuid:match_id>/changes/",
+        MatchChangesConsumer.as_asgi(),
+        name="match-changes-stream",
+    ),
+]
+
+# Served by Channels ahead of Django's URLconf (ASGI only), so a
+# waiting request holds no thread
+http_urlpatterns = [
+    path(
+        "api/ballbyball/wait-for-match-changes/",
+        AuthMiddlewareStack(MatchChangesLongPollConsumer.as_asgi()),
+        name="wait-for-match-changes",
+    ),
+]
@@ -0,0 +1,273 @@
+"""
+SELECTOR: Ball Entries
+
+RESPONSIBILITY:
+- Page through a match's balls newest-first, keyed on
+  (innings_number, ball_number)
+- Serve stored entry projections, trimmed to the requested sections,
+  read with a range scan on the projection table
+- Render balls without a projection live, joining or prefetching only
+  what the requested sections read
+
+MUST NEVER DO:
+- Modify data
+- Use OFFSET paging
+"""
+import base64
+from functools import reduce
+from itertools import islice
+from operator import or_
+from django.db.models import F, Prefetch, Q
+from scoring.models import Ball, BallFielding, InningsAggregate
+from ballbyball.models import BallEntryProjection
+from ballbyball.services.build_ball_entry import (
+    SECTION_BUILDERS,
+    build_ball_entry,
+)
+
+DEFAULT_BALL_ENTRIES_LIMIT = 10
+MAX_BALL_ENTRIES_LIMIT = 120
+
+SECTION_SELECT_RELATED = {
+    "participants": (
+        "batting_team",
+        "bowling_team",
+        "striker",
+        "non_striker",
+        "bowler",
+        "umpire_bowler_end",
+        "umpire_square_leg",
+    ),
+    "wicket": (
+        "wicket__dismissed_player",
+        "wicket__dismissed_by",
+        "wicket__caught_by",
+        "wicket__stumped_by",
+        "wicket__run_out_fielder_1",
+        "wicket__run_out_fielder_2",
+    ),
+    "analytics": ("analytics",),
+    "spatial": ("spatial_outcome",),
+    "release": ("release_data",),
+    "drs": (
+        "drs__review_team",
+        "drs__decision_given_by_umpire",
+        "drs__third_umpire",
+    ),
+    "video": ("video",),
+    "trajectory": ("packed_trajectory",),
+}
+
+SECTION_PREFETCH = {
+    "fielding": lambda: Prefetch(
+        "fieldings",
+        queryset=BallFielding.objects.select_related(
+            "player",
+            "fielder2",
+        ).order_by("created_at"),
+    ),
+    # Balls recorded before packed storage still have point rows
+    "trajectory": lambda: "trajectory_points",
+}
+
+
+def parse_entry_fields(raw):
+    """
+    Comma-separated optional sections; None or empty means all of them.
+    Raises ValueError for unknown names.
+    """
+    if not raw:
+        return set(SECTION_BUILDERS)
+    fields = {name.strip() for name in raw.split(",") if name.strip()}
+    unknown = fields - set(SECTION_BUILDERS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return fields
+
+
+def encode_cursor(*, innings_number, ball_number):
+    raw = f"{innings_number}:{ball_number}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    (innings_number, ball_number); raises ValueError for a bad cursor.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        innings_number, ball_number = (
+            base64.urlsafe_b64decode(padded).decode().split(":")
+        )
+        return int(innings_number), int(ball_number)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def ball_entry_queryset(*, fields):
+    """
+    Balls annotated with innings_number, loading what `fields` render.
+    """
+    return (
+        Ball.objects.annotate(innings_number=F("innings__innings_number"))
+        .select_related(*(
+            relation
+            for section in fields
+            for relation in SECTION_SELECT_RELATED.get(section, ())
+        ))
+        .prefetch_related(*(
+            SECTION_PREFETCH[section]()
+            for section in fields
+            if section in SECTION_PREFETCH
+        ))
+    )
+
+
+def trim_entry(entry, *, fields):
+    return {
+        key: value
+        for key, value in entry.items()
+        if key not in SECTION_BUILDERS or key in fields
+    }
+
+
+def innings_last_ball_numbers(*, match):
+    """
+    {innings_number: ball_number of its last ball}; ball numbers run
+    1..last in every innings.
+    """
+    return {
+        innings_number: last_ball_number or 0
+        for innings_number, last_ball_number in (
+            InningsAggregate.objects.filter(innings__match=match)
+            .values_list("innings__innings_number", "last_ball__ball_number")
+        )
+    }
+
+
+def ball_keys(last_ball_numbers, *, before=None, after=None):
+    """
+    (innings_number, ball_number) of every ball before `before`, newest
+    first, or after `after`, oldest first.
+    """
+    if after is not None:
+        for innings_number in sorted(last_ball_numbers):
+            if innings_number < after[0]:
+                continue
+            first = after[1] + 1 if innings_number == after[0] else 1
+            for ball_number in range(first, last_ball_numbers[innings_number] + 1):
+                yield innings_number, ball_number
+        return
+
+    for innings_number in sorted(last_ball_numbers, reverse=True):
+        last = last_ball_numbers[innings_number]
+        if before is not None:
+            if innings_number > before[0]:
+                continue
+            if innings_number == before[0]:
+                last = min(last, before[1] - 1)
+        for ball_number in range(last, 0, -1):
+            yield innings_number, ball_number
+
+
+def keys_filter(keys, *, prefix=""):
+    """
+    One ball-number range per innings covering `keys`.
+    """
+    ranges = {}
+    for innings_number, ball_number in keys:
+        low, high = ranges.get(innings_number, (ball_number, ball_number))
+        ranges[innings_number] = min(low, ball_number), max(high, ball_number)
+    return reduce(or_, (
+        Q(**{
+            f"{prefix}innings_number": innings_number,
+            "ball_number__gte": low,
+            "ball_number__lte": high,
+        })
+        for innings_number, (low, high) in ranges.items()
+    ))
+
+
+def select_ball_entries(
+    *,
+    match,
+    fields,
+    limit=DEFAULT_BALL_ENTRIES_LIMIT,
+    before=None,
+    after=None,
+):
+    """
+    Entries for one page, newest first, with cursors to the next older
+    page (None at the first ball) and to anything newer than this page.
+    """
+    # The page's keys come from the innings' last ball numbers, so balls
+    # without a projection (recorded before projections existed) still
+    # take their place in the feed
+    keys = list(islice(
+        ball_keys(
+            innings_last_ball_numbers(match=match),
+            before=before,
+            after=after,
+        ),
+        limit if after is not None else limit + 1,
+    ))
+    if after is not None:
+        # An older page always exists: it holds the `after` ball itself
+        has_older = True
+        keys.reverse()
+    else:
+        has_older = len(keys) > limit
+        keys = keys[:limit]
+
+    if keys:
+        newer_cursor = encode_cursor(
+            innings_number=keys[0][0], ball_number=keys[0][1]
+        )
+    elif after is not None:
+        newer_cursor = encode_cursor(
+            innings_number=after[0], ball_number=after[1]
+        )
+    else:
+        newer_cursor = None
+
+    projected = {}
+    if keys:
+        projected = {
+            (innings_number, ball_number): entry
+            for innings_number, ball_number, entry in (
+                BallEntryProjection.objects.filter(match=match)
+                .filter(keys_filter(keys))
+                .values_list("innings_number", "ball_number", "entry")
+            )
+        }
+    unprojected = [key for key in keys if key not in projected]
+    live_balls = {}
+    if unprojected:
+        live_balls = {
+            (ball.innings_number, ball.ball_number): ball
+            for ball in ball_entry_queryset(fields=fields)
+            .filter(match=match)
+            .filter(keys_filter(unprojected, prefix="innings__"))
+        }
+
+    entries = []
+    for key in keys:
+        if key in projected:
+            entries.append(trim_entry(projected[key], fields=fields))
+        elif key in live_balls:
+            entries.append(build_ball_entry(
+                ball=live_balls[key],
+                innings_number=key[0],
+                sections=fields,
+            ))
+
+    older_cursor = None
+    if keys and has_older:
+        older_cursor = encode_cursor(
+            innings_number=keys[-1][0], ball_number=keys[-1][1]
+        )
+    return {
+        "entries": entries,
+        "older_cursor": older_cursor,
+        "newer_cursor": newer_cursor,
+    }
@@ -3,16 +3,79 @@ SELECTOR: Innings State
 
 RESPONSIBILITY:
 - Fetch active innings with aggregate and stats
+- Cache the read model:
+  static parts (XI lists, umpires) by innings teams and match version,
+  stats and penalties by innings version
 
 MUST NEVER DO:
 - Compute derived values
 """
+from django.core.cache import cache
+from django.db.models import F
+from ballbyball.models import MatchChangeCursor
 from scoring.models import InningsAggregate, BatterStats, BowlerStats
 from ballbyball.selectors.players import get_selectable_players
 
+READ_MODEL_CACHE_TIMEOUT = 60 * 60
 
-def build_active_innings_read_model(*, innings):
-    aggregate, _ = InningsAggregate.objects.get_or_create(innings=innings)
+
+def get_match_version(*, match):
+    """
+    The match's read-model version; no query when the match was loaded
+    with select_related("change_cursor").
+    """
+    try:
+        return match.change_cursor.read_model_version
+    except MatchChangeCursor.DoesNotExist:
+        return 0
+
+
+def bump_match_versions(*, match_ids):
+    """
+    Invalidate cached static read-model parts (XI lists, umpires) and
+    the validators built from the match version.
+    """
+    match_ids = list(match_ids)
+    if not match_ids:
+        return
+    MatchChangeCursor.objects.bulk_create(
+        [MatchChangeCursor(match_id=match_id) for match_id in match_ids],
+        ignore_conflicts=True,
+    )
+    MatchChangeCursor.objects.filter(match_id__in=match_ids).update(
+        read_model_version=F("read_model_version") + 1
+    )
+
+
+def bump_match_version(*, match_id):
+    bump_match_versions(match_ids=[match_id])
+
+
+def innings_read_model_version(*, aggregate):
+    # Every ball, undo or DLS change saves the aggregate; a penalty saves
+    # both the awarded innings' and the one it is listed under
+    return f"{aggregate.last_ball_id}:{aggregate.updated_at.isoformat()}"
+
+
+def stat_row_values(instance):
+    """
+    The dict `.values()` would return for this stats row.
+    """
+    return {
+        field.attname: getattr(instance, field.attname)
+        for field in instance._meta.concrete_fields
+    }
+
+
+def build_active_innings_read_model(*, innings, context=None):
+    """
+    With a ScoringContext, the aggregate and players come from it, and
+    the stat rows persist just wrote are patched into the cached lists.
+    """
+    if context is not None:
+        aggregate = context.aggregate
+    else:
+        aggregate, _ = InningsAggregate.objects.get_or_create(innings=innings)
 
     return {
         "match_id": innings.match_id,
@@ -34,32 +97,95 @@ def build_active_innings_read_model(*, innings):
             "revised_target_runs": aggregate.revised_target_runs,
             "target_achieved": aggregate.target_achieved,
         },
-        "batting_stats": list(
-            BatterStats.objects.filter(innings=innings).values()
-        ),
-        "bowling_stats": list(
-            BowlerStats.objects.filter(innings=innings).values()
-        ),
-        "players": get_selectable_players(
-            match=innings.match,
-            innings=innings
-        ),
-        "umpires": list(
-            innings.match.umpires.values(
-                "id",
-                "name",
-                "short_name",
-                "last_name",
-            )
-        ),
-        "penalties": list(
-            innings.penalties_happened.values(
-                "id",
-                "awarded_to",
-                "reason",
-                "reason_other",
-                "runs",
-                "created_at",
-            ).order_by("-created_at")
+        **get_innings_stats_read_model(
+            innings=innings,
+            aggregate=aggregate,
+            context=context,
         ),
+        **get_static_read_model(innings=innings, context=context),
     }
+
+
+def get_static_read_model(*, innings, context=None):
+    # The XI lists are split by the innings' teams, which can be swapped
+    # (follow-on, reopened innings) without touching the XI
+    key = (
+        f"ballbyball:read-model:static:{innings.id}:"
+        f"{innings.batting_team_id}:{innings.bowling_team_id}:"
+        f"{get_match_version(match=innings.match)}"
+    )
+    static = cache.get(key)
+    if static is None:
+        static = {
+            "players": get_selectable_players(
+                match=innings.match,
+                innings=innings,
+                playing_xi=(
+                    context.playing_xi if context is not None else None
+                ),
+            ),
+            "umpires": list(
+                innings.match.umpires.values(
+                    "id",
+                    "name",
+                    "short_name",
+                    "last_name",
+                )
+            ),
+        }
+        cache.set(key, static, READ_MODEL_CACHE_TIMEOUT)
+    return static
+
+
+def get_innings_stats_read_model(*, innings, aggregate, context=None):
+    key = f"ballbyball:read-model:stats:{innings.id}"
+    version = innings_read_model_version(aggregate=aggregate)
+    entry = cache.get(key)
+
+    if entry is not None and entry["version"] == version:
+        return entry["stats"]
+
+    patch = context.stat_rows_patch if context is not None else None
+    if (
+        entry is not None and
+        patch is not None and
+        entry["version"] == patch["base_version"]
+    ):
+        stats = entry["stats"]
+        for row in patch["rows"]:
+            section = (
+                "batting_stats" if isinstance(row, BatterStats)
+                else "bowling_stats"
+            )
+            values = stat_row_values(row)
+            stats[section] = [
+                existing for existing in stats[section]
+                if existing["id"] != values["id"]
+            ] + [values]
+            stats[section].sort(key=lambda existing: existing["id"])
+    else:
+        stats = {
+            "batting_stats": list(
+                BatterStats.objects.filter(innings=innings).order_by("id").values()
+            ),
+            "bowling_stats": list(
+                BowlerStats.objects.filter(innings=innings).order_by("id").values()
+            ),
+            "penalties": list(
+                innings.penalties_happened.values(
+                    "id",
+                    "awarded_to",
+                    "reason",
+                    "reason_other",
+                    "runs",
+                    "created_at",
+                ).order_by("-created_at")
+            ),
+        }
+
+    cache.set(
+        key,
+        {"version": version, "stats": stats},
+        READ_MODEL_CACHE_TIMEOUT,
+    )
+    return stats
@@ -3,7 +3,113 @@ SELECTOR: Match Context
 
 RESPONSIBILITY:
 - Fetch match with related context (teams, type, toss)
+- Hold it for one request as a ScoringContext identity map
 
 MUST NEVER DO:
 - Modify data
 """
+from coredata.models import Player
+from matches.models import Match, Innings, PlayingXI
+from scoring.models import InningsAggregate
+
+
+class ScoringContext:
+    """
+    Match, MatchType, active Innings, its InningsAggregate and the
+    PlayingXI players, loaded once per request. Services read from here
+    instead of walking relations, and write the locked aggregate back.
+    """
+
+    def __init__(self, *, match, innings, aggregate, playing_xi):
+        self.match = match
+        self.match_type = match.match_type
+        self.innings = innings
+        self.aggregate = aggregate
+        self.playing_xi = playing_xi
+        self.players = {xi.player_id: xi.player for xi in playing_xi}
+        # Set by persist: stat rows it wrote and the read-model version
+        # they apply on top of
+        self.stat_rows_patch = None
+
+    @property
+    def balls_per_over(self):
+        return self.match_type.balls_per_over
+
+    def team_playing_xi(self, *, team_id):
+        return [xi for xi in self.playing_xi if xi.team_id == team_id]
+
+    def get_players(self, player_ids):
+        """
+        Players by id; anyone outside the PlayingXI is fetched in one query.
+        """
+        missing = [pid for pid in player_ids if pid not in self.players]
+        if missing:
+            self.players.update(Player.objects.in_bulk(missing))
+        for pid in player_ids:
+            if pid not in self.players:
+                raise Player.DoesNotExist(f"Player {pid} does not exist")
+        return [self.players[pid] for pid in player_ids]
+
+    def refresh_aggregate(self):
+        self.aggregate = load_innings_aggregate(innings=self.innings)
+        return self.aggregate
+
+
+def load_innings_aggregate(*, innings):
+    aggregate, _ = (
+        InningsAggregate.objects.select_related("last_ball__wicket")
+        .get_or_create(innings=innings)
+    )
+    aggregate.innings = innings
+    return aggregate
+
+
+def load_scoring_match(*, match_id):
+    return Match.objects.select_related(
+        "match_type", "change_cursor"
+    ).get(id=match_id)
+
+
+def load_active_innings(*, match):
+    return (
+        Innings.objects.filter(match=match, state=Innings.State.ACTIVE)
+        .select_related(
+            "batting_team",
+            "bowling_team",
+            "aggregate__last_ball__wicket",
+        )
+        .order_by("-innings_number")
+        .first()
+    )
+
+
+def load_scoring_context(*, match_id=None, match=None, innings=None):
+    """
+    Build the context for the active innings (or the given one), from
+    the match id or a match already loaded with load_scoring_match.
+    Raises Match.DoesNotExist; innings and aggregate are None when the
+    match has no active innings.
+    """
+    if match is None:
+        match = load_scoring_match(match_id=match_id)
+
+    if innings is None:
+        innings = load_active_innings(match=match)
+    innings_aggregate = None
+    if innings is not None:
+        innings.match = match
+        try:
+            innings_aggregate = innings.aggregate
+            innings_aggregate.innings = innings
+        except InningsAggregate.DoesNotExist:
+            innings_aggregate = load_innings_aggregate(innings=innings)
+
+    playing_xi = list(
+        PlayingXI.objects.filter(match=match).select_related("player")
+    )
+    return ScoringContext(
+        match=match,
+        innings=innings,
+        aggregate=innings_aggregate,
+        playing_xi=playing_xi,
+    )
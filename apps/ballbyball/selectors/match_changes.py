@@ -0,0 +1,75 @@
+"""
+SELECTOR: Match Changes
+
+RESPONSIBILITY:
+- Return a match's changes after a sequence number, oldest first
+- Attach the stored feed entries of recorded balls, trimmed to the
+  requested sections
+
+MUST NEVER DO:
+- Modify data
+- Render entries live (changes are only recorded alongside projections)
+"""
+from ballbyball.models import BallEntryProjection, MatchChange
+from ballbyball.selectors.ball_entries import trim_entry
+
+DEFAULT_MATCH_CHANGES_LIMIT = 50
+MAX_MATCH_CHANGES_LIMIT = 200
+
+
+def serialize_match_change(change, *, entries, fields):
+    """
+    `entries` maps ball id to its full feed entry; balls missing from
+    it have been undone.
+    """
+    item = {"seq": change.seq, "kind": change.kind, **change.data}
+    if change.kind == MatchChange.Kind.BALL:
+        item["entries"] = [
+            trim_entry(entries[ball_id], fields=fields)
+            for ball_id in change.data["ball_ids"]
+            if ball_id in entries
+        ]
+    return item
+
+
+def select_match_changes(
+    *,
+    match,
+    since,
+    fields,
+    limit=DEFAULT_MATCH_CHANGES_LIMIT,
+):
+    """
+    Up to `limit` changes with seq > `since`, the sequence number to
+    resume from, and whether more changes are waiting. Entries of balls
+    undone since are left out; the UNDO change says so.
+    """
+    changes = list(
+        MatchChange.objects.filter(match=match, seq__gt=since)
+        .order_by("seq")
+        .only("seq", "kind", "data")[:limit + 1]
+    )
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+
+    ball_ids = [
+        ball_id
+        for change in changes
+        if change.kind == MatchChange.Kind.BALL
+        for ball_id in change.data["ball_ids"]
+    ]
+    entries = {
+        str(ball_id): entry
+        for ball_id, entry in BallEntryProjection.objects.filter(
+            ball_id__in=ball_ids
+        ).values_list("ball_id", "entry")
+    } if ball_ids else {}
+
+    return {
+        "changes": [
+            serialize_match_change(change, entries=entries, fields=fields)
+            for change in changes
+        ],
+        "last_seq": changes[-1].seq if changes else since,
+        "has_more": has_more,
+    }
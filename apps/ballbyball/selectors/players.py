@@ -12,16 +12,31 @@ from coredata.models import Player
 from matches.models import PlayingXI
 
 
-def get_selectable_players(*, match, innings):
-    batting_players = PlayingXI.objects.filter(
-        match=match,
-        team=innings.batting_team
-    ).select_related("player").order_by("batting_position")
+def get_selectable_players(*, match, innings, playing_xi=None):
+    """
+    Pass `playing_xi` (PlayingXI rows with player joined, e.g. from a
+    ScoringContext) to avoid querying.
+    """
+    if playing_xi is None:
+        batting_players = PlayingXI.objects.filter(
+            match=match,
+            team_id=innings.batting_team_id
+        ).select_related("player").order_by("batting_position")
 
-    bowling_players = PlayingXI.objects.filter(
-        match=match,
-        team=innings.bowling_team
-    ).select_related("player").order_by("-batting_position")  # 🔥 reverse
+        bowling_players = PlayingXI.objects.filter(
+            match=match,
+            team_id=innings.bowling_team_id
+        ).select_related("player").order_by("-batting_position")  # 🔥 reverse
+    else:
+        batting_players = sorted(
+            (xi for xi in playing_xi if xi.team_id == innings.batting_team_id),
+            key=lambda xi: xi.batting_position,
+        )
+        bowling_players = sorted(
+            (xi for xi in playing_xi if xi.team_id == innings.bowling_team_id),
+            key=lambda xi: xi.batting_position,
+            reverse=True,
+        )
 
     return {
         "batters": [
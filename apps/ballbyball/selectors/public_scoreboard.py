@@ -0,0 +1,219 @@
+"""
+SELECTOR: Public Scoreboard
+
+RESPONSIBILITY:
+- Fetch matches flagged public, for spectators without an account
+- Build the live scoreboard (innings totals, batters at the crease,
+  current bowler) and the full scorecard
+- Derive the version key their HTTP validators are built from
+
+MUST NEVER DO:
+- Modify data
+- Expose matches that are not public
+"""
+from django.core.exceptions import ValidationError
+
+from matches.models import Match, Innings
+from scoring.models import BatterStats, BowlerStats
+from ballbyball.selectors.innings import get_match_version
+
+
+def get_public_match(*, match_id):
+    """
+    Raises Match.DoesNotExist, also for malformed ids.
+    """
+    try:
+        return Match.objects.select_related(
+            "team1", "team2", "match_type", "change_cursor"
+        ).get(id=match_id, is_public=True)
+    except ValidationError:
+        raise Match.DoesNotExist(f"Match {match_id} does not exist")
+
+
+def load_public_innings(*, match):
+    return list(
+        Innings.objects.filter(match=match)
+        .select_related(
+            "batting_team",
+            "bowling_team",
+            "aggregate__current_striker",
+            "aggregate__current_non_striker",
+            "aggregate__current_bowler",
+        )
+        .order_by("innings_number")
+    )
+
+
+def public_match_version(*, match, innings_list):
+    """
+    Every ball, undo, penalty or DLS change saves the aggregate; innings
+    and match transitions change their state; team and player renames
+    bump the match version.
+    """
+    parts = [match.state, str(get_match_version(match=match))]
+    for innings in innings_list:
+        aggregate = getattr(innings, "aggregate", None)
+        parts.append(
+            f"{innings.id}:{innings.state}:"
+            f"{aggregate.last_ball_id if aggregate else None}:"
+            f"{aggregate.updated_at.isoformat() if aggregate else None}"
+        )
+    return parts
+
+
+def format_overs(*, legal_balls, balls_per_over):
+    return f"{legal_balls // balls_per_over}.{legal_balls % balls_per_over}"
+
+
+def player_name(player):
+    return f"{player.first_name} {player.last_name}".strip()
+
+
+def team_summary(team):
+    return {"id": team.id, "name": team.name}
+
+
+def innings_summary(innings, *, balls_per_over):
+    aggregate = getattr(innings, "aggregate", None)
+    legal_balls = aggregate.legal_balls if aggregate else 0
+    target = None
+    if aggregate and aggregate.is_chasing:
+        target = aggregate.revised_target_runs or aggregate.target_runs
+    return {
+        "innings_number": innings.innings_number,
+        "state": innings.state,
+        "is_super_over": innings.is_super_over,
+        "batting_team": team_summary(innings.batting_team),
+        "bowling_team": team_summary(innings.bowling_team),
+        "runs": aggregate.runs if aggregate else 0,
+        "wickets": aggregate.wickets if aggregate else 0,
+        "legal_balls": legal_balls,
+        "overs": format_overs(
+            legal_balls=legal_balls, balls_per_over=balls_per_over
+        ),
+        "extras": aggregate.extras if aggregate else 0,
+        "target": target,
+    }
+
+
+def batter_line(player, stats):
+    return {
+        "player_id": player.id,
+        "name": player_name(player),
+        "runs": stats.runs if stats else 0,
+        "balls": stats.balls if stats else 0,
+        "fours": stats.fours if stats else 0,
+        "sixes": stats.sixes if stats else 0,
+        "is_out": stats.is_out if stats else False,
+    }
+
+
+def bowler_line(player, stats, *, balls_per_over):
+    return {
+        "player_id": player.id,
+        "name": player_name(player),
+        "overs": format_overs(
+            legal_balls=stats.balls if stats else 0,
+            balls_per_over=balls_per_over,
+        ),
+        "runs_conceded": stats.runs_conceded if stats else 0,
+        "wickets": stats.wickets if stats else 0,
+        "wides": stats.wides if stats else 0,
+        "no_balls": stats.no_balls if stats else 0,
+    }
+
+
+def match_header(*, match, innings_list):
+    balls_per_over = match.match_type.balls_per_over
+    return {
+        "match_id": match.id,
+        "state": match.state,
+        "match_type": match.match_type.name,
+        "team1": team_summary(match.team1),
+        "team2": team_summary(match.team2),
+        "innings": [
+            innings_summary(innings, balls_per_over=balls_per_over)
+            for innings in innings_list
+        ],
+    }
+
+
+def build_public_scoreboard(*, match, innings_list):
+    scoreboard = match_header(match=match, innings_list=innings_list)
+    active = next(
+        (
+            innings for innings in innings_list
+            if innings.state == Innings.State.ACTIVE
+        ),
+        None,
+    )
+    aggregate = getattr(active, "aggregate", None)
+    if aggregate is None:
+        scoreboard["current"] = None
+        return scoreboard
+
+    batters = [
+        player for player in (
+            aggregate.current_striker, aggregate.current_non_striker
+        )
+        if player is not None
+    ]
+    batter_stats = {
+        stats.player_id: stats
+        for stats in BatterStats.objects.filter(
+            innings=active, player__in=batters
+        )
+    }
+    bowler = aggregate.current_bowler
+    bowler_stats = None
+    if bowler is not None:
+        bowler_stats = BowlerStats.objects.filter(
+            innings=active, player=bowler
+        ).first()
+
+    scoreboard["current"] = {
+        "innings_number": active.innings_number,
+        "batters": [
+            {
+                **batter_line(player, batter_stats.get(player.id)),
+                "on_strike": player == aggregate.current_striker,
+            }
+            for player in batters
+        ],
+        "bowler": (
+            bowler_line(
+                bowler,
+                bowler_stats,
+                balls_per_over=match.match_type.balls_per_over,
+            )
+            if bowler is not None else None
+        ),
+    }
+    return scoreboard
+
+
+def build_public_scorecard(*, match, innings_list):
+    scorecard = match_header(match=match, innings_list=innings_list)
+    balls_per_over = match.match_type.balls_per_over
+
+    batting = {}
+    for stats in (
+        BatterStats.objects.filter(innings__match=match)
+        .select_related("player").order_by("id")
+    ):
+        batting.setdefault(stats.innings_id, []).append(
+            batter_line(stats.player, stats)
+        )
+    bowling = {}
+    for stats in (
+        BowlerStats.objects.filter(innings__match=match)
+        .select_related("player").order_by("id")
+    ):
+        bowling.setdefault(stats.innings_id, []).append(
+            bowler_line(stats.player, stats, balls_per_over=balls_per_over)
+        )
+
+    for summary, innings in zip(scorecard["innings"], innings_list):
+        summary["batting"] = batting.get(innings.id, [])
+        summary["bowling"] = bowling.get(innings.id, [])
+    return scorecard
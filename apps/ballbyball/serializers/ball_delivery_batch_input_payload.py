@@ -0,0 +1,31 @@
+"""
+SERIALIZER: Ball Delivery Batch Input Payload
+
+RESPONSIBILITY:
+- Validate shape of an ordered list of ball payloads
+- Accept an optional expected ball_number per delivery
+
+MUST NEVER DO:
+- Validate cricket legality
+- Apply business rules
+"""
+from rest_framework import serializers
+from ballbyball.serializers.ball_delivery_input_payload import (
+    BallDeliveryInputPayloadSerializer,
+)
+
+MAX_DELIVERIES_PER_BATCH = 120
+
+
+class BallDeliveryBatchItemSerializer(BallDeliveryInputPayloadSerializer):
+    match_id = None
+    ball_number = serializers.IntegerField(min_value=1, required=False)
+
+
+class BallDeliveryBatchInputPayloadSerializer(serializers.Serializer):
+    match_id = serializers.UUIDField()
+    deliveries = BallDeliveryBatchItemSerializer(
+        many=True,
+        allow_empty=False,
+        max_length=MAX_DELIVERIES_PER_BATCH,
+    )
@@ -0,0 +1,86 @@
+"""
+SERVICE: Ball Statistics Delta (Pure)
+
+RESPONSIBILITY:
+- Describe what ONE ball contributes to the innings aggregate,
+  the striker's BatterStats and the bowler's BowlerStats
+- Apply or reverse that contribution on in-memory rows
+
+MUST DO:
+- Be pure
+- Stay the single definition shared by persist, undo and rebuild
+
+MUST NEVER DO:
+- Write to database
+"""
+from ballbyball.exceptions import DerivedStatisticsOutOfSync
+from ballbyball.services.ball_outcome_engine import is_over_end
+
+
+BOWLER_CREDITED_WICKET_TYPES = {
+    "BOWLED",
+    "LBW",
+    "CAUGHT",
+    "STUMPED",
+    "HIT_WICKET",
+}
+
+
+def compute_ball_statistics_delta(
+    *,
+    ball,
+    balls_per_over,
+    wicket_type=None,
+    dismissed_player_id=None,
+    dismissed_by_id=None,
+):
+    has_wicket = bool(wicket_type and dismissed_player_id)
+    credited_to_bowler = (
+        wicket_type in BOWLER_CREDITED_WICKET_TYPES and
+        (dismissed_by_id is None or dismissed_by_id == ball.bowler_id)
+    )
+
+    return {
+        "aggregate": {
+            "runs": ball.runs_off_bat + ball.extra_runs,
+            "extras": ball.extra_runs,
+            "wickets": int(has_wicket),
+            "legal_balls": int(ball.is_legal_delivery),
+            "completed_overs": int(
+                is_over_end(ball=ball, balls_per_over=balls_per_over)
+            ),
+        },
+        "batter": {
+            "runs": ball.runs_off_bat,
+            # Wides are not faced; no-balls are
+            "balls": int(not ball.wide_runs),
+            "fours": int(ball.runs_off_bat == 4),
+            "sixes": int(ball.runs_off_bat == 6),
+        },
+        "batter_dismissed": (
+            has_wicket and dismissed_player_id == ball.striker_id
+        ),
+        "bowler": {
+            "runs_conceded": (
+                ball.runs_off_bat + ball.wide_runs + ball.no_ball_runs
+            ),
+            "balls": int(ball.is_legal_delivery),
+            "wickets": int(credited_to_bowler),
+            # Wides count = total wide runs (penalty + runs taken)
+            "wides": ball.wide_runs,
+            "no_balls": int(bool(ball.no_ball_runs)),
+        },
+    }
+
+
+def apply_statistics_delta(*, instance, values, sign=1):
+    """
+    Add (sign=1) or subtract (sign=-1) delta values on a model instance.
+    """
+    for field, value in values.items():
+        updated = getattr(instance, field) + sign * value
+        if updated < 0:
+            raise DerivedStatisticsOutOfSync(
+                f"{type(instance).__name__}.{field} would become negative"
+            )
+        setattr(instance, field, updated)
@@ -0,0 +1,40 @@
+"""
+SERVICE: Broadcast Match Changes
+
+RESPONSIBILITY:
+- Push committed match changes to the match's channel-layer group,
+  once for every viewer connected to it
+
+MUST DO:
+- Run only after the changes commit
+- Send what the match-changes feed would serve, with full entries
+
+MUST NEVER DO:
+- Query the database (viewers cost nothing per ball)
+"""
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from ballbyball.selectors.match_changes import serialize_match_change
+from ballbyball.services.build_ball_entry import SECTION_BUILDERS
+
+
+def match_changes_group(match_id):
+    return f"match-changes.{match_id}"
+
+
+def broadcast_match_changes(*, match_id, changes, entries):
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    async_to_sync(channel_layer.group_send)(
+        match_changes_group(match_id),
+        {
+            "type": "match.changes",
+            "changes": [
+                serialize_match_change(
+                    change, entries=entries, fields=set(SECTION_BUILDERS)
+                )
+                for change in changes
+            ],
+        },
+    )
@@ -0,0 +1,275 @@
+"""
+SERVICE: Build Ball Entry (Pure)
+
+RESPONSIBILITY:
+- Render one recorded Ball as a ball-feed entry dict
+- Render only the requested optional sections
+
+MUST DO:
+- Be pure
+- Read only relations the caller loaded for the requested sections
+
+MUST NEVER DO:
+- Query the database itself
+"""
+
+
+def serialize_player(player):
+    if not player:
+        return None
+    return {
+        "id": str(player.id),
+        "first_name": player.first_name,
+        "last_name": player.last_name,
+        "name": f"{player.first_name} {player.last_name}".strip(),
+    }
+
+
+def serialize_team(team):
+    if not team:
+        return None
+    return {
+        "id": str(team.id),
+        "name": team.name,
+        "short_name": team.short_name,
+    }
+
+
+def serialize_umpire(umpire):
+    if not umpire:
+        return None
+    return {
+        "id": str(umpire.id),
+        "name": umpire.name,
+        "short_name": umpire.short_name,
+    }
+
+
+def build_participants_section(ball):
+    return {
+        "batting_team": serialize_team(ball.batting_team),
+        "bowling_team": serialize_team(ball.bowling_team),
+        "striker": serialize_player(ball.striker),
+        "non_striker": serialize_player(ball.non_striker),
+        "bowler": serialize_player(ball.bowler),
+        "striker_hand": ball.striker_hand,
+        "bowler_hand": ball.bowler_hand,
+        "umpire_bowler_end": serialize_umpire(ball.umpire_bowler_end),
+        "umpire_square_leg": serialize_umpire(ball.umpire_square_leg),
+    }
+
+
+def build_scoring_section(ball):
+    return {
+        "runs_off_bat": ball.runs_off_bat,
+        "completed_runs": ball.completed_runs,
+        "extra_runs": ball.extra_runs,
+        "bye_runs": ball.bye_runs,
+        "leg_bye_runs": ball.leg_bye_runs,
+        "wide_runs": ball.wide_runs,
+        "no_ball_runs": ball.no_ball_runs,
+        "penalty_runs": ball.penalty_runs,
+        "overthrow_runs": ball.overthrow_runs,
+        "is_boundary": ball.is_boundary,
+        "is_short_run": ball.is_short_run,
+        "is_quick_running": ball.is_quick_running,
+        "is_free_hit": ball.is_free_hit,
+        "no_ball_type": ball.no_ball_type,
+        "edit_later": ball.edit_later,
+    }
+
+
+def build_wicket_section(ball):
+    wicket = getattr(ball, "wicket", None)
+    if not wicket:
+        return None
+    return {
+        "wicket_type": wicket.wicket_type,
+        "dismissed_player": serialize_player(wicket.dismissed_player),
+        "dismissed_by": serialize_player(wicket.dismissed_by),
+        "caught_by": serialize_player(wicket.caught_by),
+        "stumped_by": serialize_player(wicket.stumped_by),
+        "run_out_fielder_1": serialize_player(wicket.run_out_fielder_1),
+        "run_out_fielder_2": serialize_player(wicket.run_out_fielder_2),
+    }
+
+
+def build_analytics_section(ball):
+    analytics = getattr(ball, "analytics", None)
+    if not analytics:
+        return None
+    return {
+        "delivery_type": analytics.delivery_type,
+        "foot_movement": analytics.foot_movement,
+        "air_movement": analytics.air_movement,
+        "control": analytics.control,
+        "shot_connection": analytics.shot_connection,
+        "bat_subject": analytics.bat_subject,
+        "stroke": analytics.stroke,
+        "keeper_activity": analytics.keeper_activity,
+        "fielding_activity": analytics.fielding_activity,
+        "batsman_activity": analytics.batsman_activity,
+        "umpire_activity": analytics.umpire_activity,
+    }
+
+
+def build_spatial_section(ball):
+    spatial = getattr(ball, "spatial_outcome", None)
+    if not spatial:
+        return None
+    return {
+        "shot_zone_x": spatial.shot_zone_x,
+        "shot_zone_y": spatial.shot_zone_y,
+        "wagon_wheel_x": spatial.wagon_wheel_x,
+        "wagon_wheel_y": spatial.wagon_wheel_y,
+        "pitch_zone": spatial.pitch_zone,
+        "stump_zone": spatial.stump_zone,
+        "height_zone": spatial.height_zone,
+        "batter_stump_zone": spatial.batter_stump_zone,
+        "structured_region_id": spatial.structured_region_id,
+        "structured_slice_index": spatial.structured_slice_index,
+        "structured_band_index": spatial.structured_band_index,
+        "structured_position": spatial.structured_position,
+    }
+
+
+def build_release_section(ball):
+    release = getattr(ball, "release_data", None)
+    if not release:
+        return None
+    return {
+        "bowler_release_x": release.bowler_release_x,
+        "bowler_release_y": release.bowler_release_y,
+        "bowler_release_position": release.bowler_release_position,
+        "wicket_keeper_position": release.wicket_keeper_position,
+        "ball_type": release.ball_type,
+        "is_break": release.is_break,
+        "break_type": release.break_type,
+    }
+
+
+def build_fielding_section(fieldings):
+    # A ball can carry several fielding rows; the entry shows the first
+    fielding = next(iter(fieldings), None)
+    if not fielding:
+        return None
+    return {
+        "fielder1": serialize_player(fielding.player),
+        "fielder2": serialize_player(fielding.fielder2),
+        "action": fielding.action,
+        "fielding_position": fielding.fielding_position,
+        "runs_saved": fielding.runs_saved,
+        "runs_misfielded": fielding.runs_misfielded,
+        "overthrow_runs": fielding.overthrow_runs,
+        "difficulty": fielding.difficulty,
+    }
+
+
+def build_drs_section(ball):
+    drs = getattr(ball, "drs", None)
+    if not drs:
+        return None
+    return {
+        "is_appealed": drs.is_appealed,
+        "review_team": serialize_team(drs.review_team),
+        "review_team_side": drs.review_team_side,
+        "on_field_decision": drs.on_field_decision,
+        "overruled": drs.overruled,
+        "final_decision": drs.final_decision,
+        "decision_given_by_umpire": serialize_umpire(
+            drs.decision_given_by_umpire
+        ),
+        "third_umpire": serialize_umpire(drs.third_umpire),
+    }
+
+
+def build_video_section(ball):
+    video = getattr(ball, "video", None)
+    if not video:
+        return None
+    return {
+        "video_source_id": video.video_source_id,
+        "video_start_ms": video.video_start_ms,
+        "video_end_ms": video.video_end_ms,
+        "camera_angle": video.camera_angle,
+    }
+
+
+def build_trajectory_section(ball, trajectory_points=None):
+    """
+    The packed trajectory when the ball has one, else its point rows
+    (`trajectory_points`, or the ball's prefetched rows).
+    """
+    packed = getattr(ball, "packed_trajectory", None)
+    if packed:
+        return packed.as_points()
+    if trajectory_points is None:
+        trajectory_points = ball.trajectory_points.all()
+    return [
+        {
+            "sequence_index": point.sequence_index,
+            "x": point.x,
+            "y": point.y,
+            "z": point.z,
+            "time_ms": point.time_ms,
+        }
+        for point in trajectory_points
+    ]
+
+
+SECTION_BUILDERS = {
+    "participants": build_participants_section,
+    "scoring": build_scoring_section,
+    "wicket": build_wicket_section,
+    "analytics": build_analytics_section,
+    "spatial": build_spatial_section,
+    "release": build_release_section,
+    "fielding": lambda ball: build_fielding_section(ball.fieldings.all()),
+    "drs": build_drs_section,
+    "video": build_video_section,
+    "trajectory": build_trajectory_section,
+}
+
+
+def build_ball_entry(
+    *,
+    ball,
+    innings_number,
+    sections=SECTION_BUILDERS,
+    fieldings=None,
+    trajectory_points=None,
+):
+    """
+    `sections` names the optional sections to render; id, innings and
+    sequence are always present. `fieldings` and `trajectory_points`
+    stand in for the reverse relations of a ball that was just built.
+    """
+    builders = dict(SECTION_BUILDERS)
+    if fieldings is not None:
+        builders["fielding"] = lambda _: build_fielding_section(fieldings)
+    if trajectory_points is not None:
+        builders["trajectory"] = lambda ball: build_trajectory_section(
+            ball, trajectory_points
+        )
+
+    display_over_number = max(ball.over_number - 1, 0)
+    entry = {
+        "id": str(ball.id),
+        "created_at": ball.created_at.isoformat(),
+        "innings": {
+            "id": ball.innings_id,
+            "innings_number": innings_number,
+        },
+        "sequence": {
+            "ball_number": ball.ball_number,
+            "over_number": ball.over_number,
+            "display_over_number": display_over_number,
+            "ball_in_over": ball.ball_in_over,
+            "display": f"{display_over_number}.{ball.ball_in_over}",
+            "is_legal_delivery": ball.is_legal_delivery,
+        },
+    }
+    for section, build_section in builders.items():
+        if section in sections:
+            entry[section] = build_section(ball)
+    return entry
@@ -0,0 +1,278 @@
+"""
+SERVICE: Build Ball Records (Pure)
+
+RESPONSIBILITY:
+- Validate one delivery payload
+- Classify completed runs into bat runs and extras
+- Build the unsaved Ball and its child rows
+
+MUST DO:
+- Be pure
+- Stay the single definition shared by single and batch persistence
+
+MUST NEVER DO:
+- Write to database
+- Touch aggregates or stats
+"""
+import re
+from functools import lru_cache
+from django.conf import settings
+from scoring.models import (
+    Ball,
+    BallWicket,
+    BallAnalytics,
+    BallSpatialOutcome,
+    BallTrajectory,
+    BallTrajectoryPacked,
+    BallReleaseData,
+    BallVideo,
+    BallFielding,
+    BallDRS,
+)
+
+
+@lru_cache(maxsize=1024)
+def to_snake(value):
+    """
+    Payload keys come from a small fixed vocabulary, so each distinct key
+    is converted once per process.
+    """
+    return re.sub(r"(?<!^)([A-Z])", r"_\1", value).lower()
+
+
+def normalize_keys(payload):
+    if not payload:
+        return payload
+    return {to_snake(k): v for k, v in payload.items()}
+
+
+def normalize_list(payload_list):
+    if not payload_list:
+        return payload_list
+    return [normalize_keys(item) for item in payload_list]
+
+
+def validate_delivery(
+    *,
+    striker_id,
+    non_striker_id,
+    bowler_id,
+    is_wide,
+    is_bye,
+    is_leg_bye,
+    wicket_type=None,
+    dismissed_player_id=None,
+):
+    if striker_id == non_striker_id:
+        raise ValueError("Striker and non-striker cannot be same")
+
+    if bowler_id == striker_id or bowler_id == non_striker_id:
+        raise ValueError("Bowler cannot be a batter")
+
+    if is_bye and is_leg_bye:
+        raise ValueError("Ball cannot be both bye and leg-bye")
+
+    if is_wide and (is_bye or is_leg_bye):
+        raise ValueError("Wide cannot be a bye or leg-bye")
+
+    if wicket_type and not dismissed_player_id:
+        raise ValueError("dismissed_player_id required for wicket")
+
+    if (
+        wicket_type and
+        wicket_type != "RUN_OUT" and
+        dismissed_player_id != striker_id
+    ):
+        raise ValueError("Only run-out can dismiss non-striker")
+
+
+def build_ball(
+    *,
+    user,
+    innings,
+    ball_number,
+    over_number,
+    ball_in_over,
+    striker_id,
+    non_striker_id,
+    bowler_id,
+    completed_runs,
+    is_wide,
+    is_no_ball,
+    is_bye,
+    is_leg_bye,
+    is_boundary=False,
+    is_short_run=False,
+    is_quick_running=False,
+    is_free_hit=False,
+    striker_hand="RIGHT",
+    bowler_hand="RIGHT",
+    umpire_bowler_end_id=None,
+    umpire_square_leg_id=None,
+):
+    # Legality
+    is_legal_delivery = not (is_wide or is_no_ball)
+
+    # Classify completed runs
+    runs_off_bat = 0
+    bye_runs = 0
+    leg_bye_runs = 0
+
+    if completed_runs > 0:
+        # Wides can include physically completed runs, but those are extras,
+        # never runs_off_bat.
+        if is_wide:
+            pass
+        elif is_bye:
+            bye_runs = completed_runs
+        elif is_leg_bye:
+            leg_bye_runs = completed_runs
+        else:
+            runs_off_bat = completed_runs
+
+    # Extras breakdown
+    wide_runs = 0
+    no_ball_runs = 0
+    penalty_runs = 0
+
+    if is_wide:
+        wide_runs = 1 + completed_runs
+        penalty_runs += 1
+
+    if is_no_ball:
+        no_ball_runs = 1
+        penalty_runs += 1
+
+    extra_runs = wide_runs + no_ball_runs + bye_runs + leg_bye_runs
+
+    return Ball(
+        user=user,
+        match_id=innings.match_id,
+        innings=innings,
+        ball_number=ball_number,
+        over_number=over_number,
+        ball_in_over=ball_in_over,
+        is_legal_delivery=is_legal_delivery,
+        batting_team_id=innings.batting_team_id,
+        bowling_team_id=innings.bowling_team_id,
+        striker_id=striker_id,
+        non_striker_id=non_striker_id,
+        bowler_id=bowler_id,
+        striker_hand=striker_hand or "RIGHT",
+        bowler_hand=bowler_hand or "RIGHT",
+        umpire_bowler_end_id=umpire_bowler_end_id,
+        umpire_square_leg_id=umpire_square_leg_id,
+        runs_off_bat=runs_off_bat,
+        completed_runs=completed_runs,
+        extra_runs=extra_runs,
+        bye_runs=bye_runs,
+        leg_bye_runs=leg_bye_runs,
+        wide_runs=wide_runs,
+        no_ball_runs=no_ball_runs,
+        penalty_runs=penalty_runs,
+        is_boundary=is_boundary,
+        is_short_run=is_short_run,
+        is_quick_running=is_quick_running,
+        is_free_hit=is_free_hit,
+        # Both persist paths fold it in with the shared statistics delta
+        stats_from_ball_delta=True,
+    )
+
+
+def build_ball_child_records(
+    *,
+    ball,
+    wicket_type=None,
+    dismissed_player_id=None,
+    dismissed_by_id=None,
+    caught_by_id=None,
+    stumped_by_id=None,
+    run_out_fielder_1_id=None,
+    run_out_fielder_2_id=None,
+    analytics=None,
+    spatial=None,
+    trajectory=None,
+    release=None,
+    video=None,
+    fielding=None,
+    drs=None,
+):
+    """
+    Unsaved child rows of `ball`, in insert order. `ball.wicket` is
+    primed either way, so reading it later does not query. With
+    BALL_TRAJECTORY_STORAGE = "packed" the trajectory becomes one
+    BallTrajectoryPacked row, unless its indexes have gaps.
+    """
+    records = []
+
+    if wicket_type and dismissed_player_id:
+        # Assigning ball= also caches the wicket on ball.wicket
+        records.append(
+            BallWicket(
+                ball=ball,
+                wicket_type=wicket_type,
+                dismissed_player_id=dismissed_player_id,
+                dismissed_by_id=dismissed_by_id,
+                caught_by_id=caught_by_id,
+                stumped_by_id=stumped_by_id,
+                run_out_fielder_1_id=run_out_fielder_1_id,
+                run_out_fielder_2_id=run_out_fielder_2_id,
+            )
+        )
+    else:
+        Ball.wicket.related.set_cached_value(ball, None)
+
+    if analytics:
+        records.append(BallAnalytics(ball=ball, **normalize_keys(analytics)))
+
+    if spatial:
+        records.append(
+            BallSpatialOutcome(ball=ball, **normalize_keys(spatial))
+        )
+
+    if release:
+        records.append(BallReleaseData(ball=ball, **normalize_keys(release)))
+
+    if video:
+        records.append(BallVideo(ball=ball, **normalize_keys(video)))
+
+    if fielding:
+        fielders = fielding.get("fielders", [])
+
+        if not isinstance(fielders, list):
+            raise ValueError("fielding.fielders must be a list")
+
+        for f in fielders:
+            payload = normalize_keys(f)
+
+            if "player" in payload:
+                payload["player_id"] = payload.pop("player")
+
+            records.append(BallFielding(ball=ball, **payload))
+
+    if drs:
+        drs_payload = normalize_keys(drs)
+        if "review_team" in drs_payload:
+            drs_payload["review_team_id"] = drs_payload.pop("review_team")
+        if "decision_given_by_umpire" in drs_payload:
+            drs_payload["decision_given_by_umpire_id"] = drs_payload.pop(
+                "decision_given_by_umpire"
+            )
+        if "third_umpire" in drs_payload:
+            drs_payload["third_umpire_id"] = drs_payload.pop("third_umpire")
+        records.append(BallDRS(ball=ball, **drs_payload))
+
+    if trajectory:
+        points = [
+            BallTrajectory(ball=ball, **point)
+            for point in normalize_list(trajectory)
+        ]
+        packed = None
+        if settings.BALL_TRAJECTORY_STORAGE == "packed":
+            packed = BallTrajectoryPacked.from_points(ball=ball, points=points)
+        if packed:
+            records.append(packed)
+        else:
+            records.extend(points)
+
+    return records
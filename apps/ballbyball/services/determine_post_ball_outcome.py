@@ -0,0 +1,109 @@
+"""
+SERVICE: Determine Post-Ball Outcome
+
+RESPONSIBILITY:
+- Detect innings end, target state, follow-on, super over and match end
+- Build actions, events and next_state for scorer responses
+
+MUST DO:
+- Work from the already-loaded aggregate and last ball
+- Stay the single definition shared by record, undo and session endpoints
+
+MUST NEVER DO:
+- Write to database
+- Re-fetch the aggregate or the last ball
+"""
+from ballbyball.services.ball_outcome_engine import is_over_end
+from ballbyball.services.determine_required_scorer_actions import (
+    determine_required_scorer_actions,
+)
+from ballbyball.services.innings_outcome_engine import (
+    detect_innings_end,
+    detect_target_state,
+    detect_follow_on_required,
+    detect_match_end,
+)
+
+
+def determine_post_ball_outcome(
+    *,
+    state,
+    aggregate,
+    match,
+    innings,
+    last_ball=None,
+):
+    """
+    `last_ball` defaults to aggregate.last_ball; load it with its wicket
+    (select_related, or as returned by persist) to keep this query-free.
+    """
+    match_type = match.match_type
+    if last_ball is None:
+        last_ball = aggregate.last_ball
+
+    innings_end = detect_innings_end(
+        aggregate=aggregate,
+        match_type=match_type,
+    )
+    target_state = detect_target_state(
+        aggregate=aggregate
+    )
+    ask_follow_on = (
+        innings_end and
+        detect_follow_on_required(
+            match_type=match_type,
+            innings_number=innings.innings_number,
+        )
+    )
+    confirm_super_over = (
+        innings_end and
+        target_state == "TIED" and
+        match_type.super_over_allowed
+    )
+    match_end = (
+        innings_end and
+        detect_match_end(
+            aggregate=aggregate,
+            match_type=match_type,
+            innings_number=innings.innings_number,
+            match=match,
+        ) and
+        not confirm_super_over
+    )
+
+    actions = determine_required_scorer_actions(
+        state=state,
+        innings_end=innings_end,
+        match_end=match_end,
+        ask_follow_on=ask_follow_on,
+        confirm_super_over=confirm_super_over,
+    )
+
+    events = {
+        "wicket": (
+            getattr(last_ball, "wicket", None) is not None
+            if last_ball else False
+        ),
+        "over_end": (
+            is_over_end(
+                ball=last_ball,
+                balls_per_over=match_type.balls_per_over,
+            )
+            if last_ball else False
+        ),
+        "innings_end": innings_end,
+        "match_end": match_end,
+        "target_state": target_state,
+    }
+
+    next_state = {
+        "striker": aggregate.current_striker_id,
+        "non_striker": aggregate.current_non_striker_id,
+        "bowler": aggregate.current_bowler_id,
+    }
+
+    return {
+        "actions": actions,
+        "events": events,
+        "next_state": next_state,
+    }
@@ -0,0 +1,262 @@
+"""
+SERVICE: Generate Synthetic Innings (Pure)
+
+RESPONSIBILITY:
+- Produce a realistic, seeded sequence of deliveries for one innings
+- Populate wickets, extras and every per-ball child payload
+
+MUST DO:
+- Be deterministic for a given random.Random
+- Stop exactly where the innings-end rules would (all out, overs, chase)
+- Emit deliveries in persist_ball_batch_and_derived_statistics format
+
+MUST NEVER DO:
+- Write to database
+"""
+
+RUN_WEIGHTS = (
+    (0, 38),
+    (1, 34),
+    (2, 10),
+    (3, 2),
+    (4, 11),
+    (6, 5),
+)
+
+# Probability per delivery, checked in this order
+WIDE_RATE = 0.03
+NO_BALL_RATE = 0.01
+BYE_RATE = 0.01
+LEG_BYE_RATE = 0.02
+
+# Expected wickets per limited-overs innings; Tests use a fixed rate
+LIMITED_OVERS_WICKETS = 7
+TEST_WICKET_RATE = 1 / 65
+
+WICKET_WEIGHTS = (
+    ("CAUGHT", 55),
+    ("BOWLED", 18),
+    ("LBW", 14),
+    ("RUN_OUT", 8),
+    ("STUMPED", 5),
+)
+
+DRS_RATE = 0.04
+FIELDING_POSITIONS = (
+    "SLIP", "GULLY", "POINT", "COVER", "MID_OFF",
+    "MID_ON", "MIDWICKET", "SQUARE_LEG", "FINE_LEG", "THIRD_MAN",
+)
+DELIVERY_TYPES = ("GOOD_LENGTH", "FULL", "SHORT", "YORKER", "BOUNCER")
+STROKES = ("DEFENCE", "DRIVE", "CUT", "PULL", "SWEEP", "FLICK", "LEAVE")
+PITCH_ZONES = ("FULL", "GOOD", "SHORT")
+STUMP_ZONES = ("OUTSIDE_OFF", "OFF", "MIDDLE", "LEG", "OUTSIDE_LEG")
+
+
+def weighted_choice(rng, weights):
+    values, counts = zip(*weights)
+    return rng.choices(values, weights=counts)[0]
+
+
+def build_child_payloads(
+    *,
+    rng,
+    index,
+    fielder_ids,
+    umpire_ids,
+    review_team_id,
+    trajectory_points,
+):
+    """
+    camelCase payloads, as the scoring client sends them.
+    """
+    wagon_angle = rng.random()
+    payloads = {
+        "analytics": {
+            "deliveryType": rng.choice(DELIVERY_TYPES),
+            "stroke": rng.choice(STROKES),
+            "shotConnection": rng.choice(("MIDDLE", "EDGE", "MISS")),
+        },
+        "spatial": {
+            "wagonWheelX": round(wagon_angle, 3),
+            "wagonWheelY": round(rng.random(), 3),
+            "pitchZone": rng.choice(PITCH_ZONES),
+            "stumpZone": rng.choice(STUMP_ZONES),
+        },
+        "release": {
+            "bowlerReleaseX": round(rng.uniform(-0.6, 0.6), 3),
+            "bowlerReleaseY": round(rng.uniform(1.9, 2.3), 3),
+            "ballType": "NEW" if index < 60 else "OLD",
+        },
+        "video": {
+            "videoSourceId": "synthetic",
+            "videoStartMs": index * 40000,
+            "videoEndMs": index * 40000 + 9000,
+            "cameraAngle": "END_ON",
+        },
+        "fielding": {
+            "fielders": [
+                {
+                    "player": rng.choice(fielder_ids),
+                    "action": "STOP",
+                    "fieldingPosition": rng.choice(FIELDING_POSITIONS),
+                    "runsSaved": rng.randint(0, 2),
+                },
+            ],
+        },
+        "trajectory": [
+            {
+                "sequenceIndex": point,
+                "x": round(point / trajectory_points, 3),
+                "y": round(2.0 - point * 0.15, 3),
+                "z": round(rng.uniform(-0.2, 0.2), 3),
+                "timeMs": point * 45,
+            }
+            for point in range(trajectory_points)
+        ],
+    }
+    if rng.random() < DRS_RATE:
+        payloads["drs"] = {
+            "isAppealed": True,
+            "reviewTeam": review_team_id,
+            "onFieldDecision": "NOT_OUT",
+            "finalDecision": "NOT_OUT",
+            "decisionGivenByUmpire": umpire_ids[0],
+        }
+    return payloads
+
+
+def generate_synthetic_innings(
+    *,
+    rng,
+    batter_ids,
+    bowler_ids,
+    fielder_ids,
+    umpire_ids,
+    review_team_id,
+    balls_per_over,
+    max_overs=None,
+    target_runs=None,
+    trajectory_points=8,
+):
+    """
+    Deliveries for one innings, ending on ten wickets, the last over of
+    a limited-overs innings, or the runs passing `target_runs`.
+    """
+    max_legal_balls = max_overs * balls_per_over if max_overs else None
+    wicket_rate = (
+        LIMITED_OVERS_WICKETS / max_legal_balls
+        if max_legal_balls
+        else TEST_WICKET_RATE
+    )
+
+    striker, non_striker = batter_ids[0], batter_ids[1]
+    next_batter = 2
+    bowler_index = 0
+    legal_balls = 0
+    runs = 0
+    wickets = 0
+    deliveries = []
+
+    while True:
+        if wickets >= 10:
+            break
+        if max_legal_balls is not None and legal_balls >= max_legal_balls:
+            break
+        if target_runs is not None and runs > target_runs:
+            break
+
+        index = len(deliveries)
+        roll = rng.random()
+        is_wide = roll < WIDE_RATE
+        is_no_ball = not is_wide and roll < WIDE_RATE + NO_BALL_RATE
+        is_bye = (
+            not (is_wide or is_no_ball) and
+            roll < WIDE_RATE + NO_BALL_RATE + BYE_RATE
+        )
+        is_leg_bye = (
+            not (is_wide or is_no_ball or is_bye) and
+            roll < WIDE_RATE + NO_BALL_RATE + BYE_RATE + LEG_BYE_RATE
+        )
+
+        if is_wide:
+            completed_runs = 4 if rng.random() < 0.05 else 0
+        elif is_bye or is_leg_bye:
+            completed_runs = rng.choice((1, 1, 2, 4))
+        else:
+            completed_runs = weighted_choice(rng, RUN_WEIGHTS)
+
+        bowler = bowler_ids[bowler_index % len(bowler_ids)]
+        delivery = {
+            "striker_id": striker,
+            "non_striker_id": non_striker,
+            "bowler_id": bowler,
+            "completed_runs": completed_runs,
+            "is_wide": is_wide,
+            "is_no_ball": is_no_ball,
+            "is_bye": is_bye,
+            "is_leg_bye": is_leg_bye,
+            "is_boundary": (
+                completed_runs in (4, 6) and not (is_bye or is_leg_bye or is_wide)
+            ),
+            "umpire_bowler_end_id": umpire_ids[0],
+            "umpire_square_leg_id": umpire_ids[1],
+            **build_child_payloads(
+                rng=rng,
+                index=index,
+                fielder_ids=fielder_ids,
+                umpire_ids=umpire_ids,
+                review_team_id=review_team_id,
+                trajectory_points=trajectory_points,
+            ),
+        }
+
+        dismissed = None
+        if not (is_wide or is_no_ball) and rng.random() < wicket_rate:
+            wicket_type = weighted_choice(rng, WICKET_WEIGHTS)
+            dismissed = (
+                rng.choice((striker, non_striker))
+                if wicket_type == "RUN_OUT"
+                else striker
+            )
+            fielder = rng.choice(fielder_ids)
+            delivery.update(
+                wicket_type=wicket_type,
+                dismissed_player_id=dismissed,
+                dismissed_by_id=bowler if wicket_type != "RUN_OUT" else None,
+                caught_by_id=fielder if wicket_type == "CAUGHT" else None,
+                stumped_by_id=fielder if wicket_type == "STUMPED" else None,
+                run_out_fielder_1_id=fielder if wicket_type == "RUN_OUT" else None,
+            )
+            if wicket_type != "RUN_OUT":
+                delivery["completed_runs"] = 0
+                delivery["is_boundary"] = False
+                delivery["is_bye"] = delivery["is_leg_bye"] = False
+
+        deliveries.append(delivery)
+        runs += delivery["completed_runs"] + is_wide + is_no_ball
+
+        if dismissed is not None:
+            wickets += 1
+            replacement = (
+                batter_ids[next_batter]
+                if next_batter < len(batter_ids)
+                else None
+            )
+            next_batter += 1
+            if dismissed == striker:
+                striker = replacement
+            else:
+                non_striker = replacement
+            if replacement is None:
+                break
+
+        if delivery["completed_runs"] % 2:
+            striker, non_striker = non_striker, striker
+
+        if not (is_wide or is_no_ball):
+            legal_balls += 1
+            if legal_balls % balls_per_over == 0:
+                striker, non_striker = non_striker, striker
+                bowler_index += 1
+
+    return deliveries
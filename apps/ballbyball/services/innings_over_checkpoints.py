@@ -0,0 +1,89 @@
+"""
+SERVICE: Innings Over Checkpoints
+
+RESPONSIBILITY:
+- Record packed innings state when a ball completes an over
+- Restore innings state as of any ball from the nearest checkpoint
+- Rebuild derived rows starting at the nearest checkpoint
+
+MUST DO:
+- Derive checkpoints from ball history, never from derived rows
+- Replay at most the balls bowled since the nearest checkpoint
+
+MUST NEVER DO:
+- Treat a checkpoint as source of truth (balls are)
+- Include penalty runs in checkpoint state
+"""
+from django.db import transaction
+from scoring.models import InningsOverCheckpoint
+from ballbyball.services.innings_state_engine import (
+    fold_balls_into_innings_state,
+    pack_innings_state,
+    unpack_innings_state,
+)
+from ballbyball.services.rebuild_entire_innings_from_ball_history import (
+    load_innings_ball_history,
+    write_innings_state,
+)
+
+
+def find_nearest_over_checkpoint(*, innings, ball_number=None):
+    checkpoints = InningsOverCheckpoint.objects.filter(innings=innings)
+    if ball_number is not None:
+        checkpoints = checkpoints.filter(ball_number__lte=ball_number)
+    return (
+        checkpoints.only("ball_number", "state")
+        .order_by("-ball_number")
+        .first()
+    )
+
+
+def load_innings_state_as_of_ball(*, innings, ball_number=None):
+    """
+    Innings state after ball_number (or after the last ball when None),
+    folded forward from the nearest checkpoint at or before it.
+    """
+    checkpoint = find_nearest_over_checkpoint(
+        innings=innings,
+        ball_number=ball_number,
+    )
+    balls = load_innings_ball_history(
+        innings=innings,
+        after_ball_number=checkpoint.ball_number if checkpoint else 0,
+    )
+    if ball_number is not None:
+        balls = balls.filter(ball_number__lte=ball_number)
+
+    return fold_balls_into_innings_state(
+        balls=balls,
+        balls_per_over=innings.match.match_type.balls_per_over,
+        state=unpack_innings_state(checkpoint.state) if checkpoint else None,
+    )
+
+
+def record_over_checkpoint(*, innings, ball):
+    """
+    Store the state after `ball`, which must be the ball that completed
+    the over. Costs one checkpoint read and at most one over of balls.
+    """
+    state = load_innings_state_as_of_ball(
+        innings=innings,
+        ball_number=ball.ball_number,
+    )
+    checkpoint, _ = InningsOverCheckpoint.objects.update_or_create(
+        innings=innings,
+        over_number=state["completed_overs"],
+        defaults={
+            "ball": ball,
+            "ball_number": ball.ball_number,
+            "state": pack_innings_state(state),
+        },
+    )
+    return checkpoint
+
+
+@transaction.atomic
+def rebuild_innings_from_nearest_over_checkpoint(*, innings):
+    state = load_innings_state_as_of_ball(innings=innings)
+    write_innings_state(innings=innings, state=state)
+    return state
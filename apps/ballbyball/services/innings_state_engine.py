@@ -0,0 +1,225 @@
+"""
+SERVICE: Innings State Engine (Pure)
+
+RESPONSIBILITY:
+- Fold recorded balls into innings totals, participants and player stats
+- Hold all intermediate state in memory
+- Pack state into a compact JSON form for over checkpoints
+
+MUST DO:
+- Be pure
+- Use the same per-ball rules as persist and undo
+
+MUST NEVER DO:
+- Write to database
+- Include penalty runs (they are not part of ball history)
+"""
+import uuid
+from ballbyball.services.ball_outcome_engine import derive_next_state
+from ballbyball.services.ball_statistics_delta import (
+    compute_ball_statistics_delta,
+)
+
+
+def empty_innings_state():
+    return {
+        "runs": 0,
+        "extras": 0,
+        "wickets": 0,
+        "legal_balls": 0,
+        "completed_overs": 0,
+        "current_striker": None,
+        "current_non_striker": None,
+        "current_bowler": None,
+        "last_ball_id": None,
+        "last_ball_number": 0,
+        "batters": {},
+        "bowlers": {},
+    }
+
+
+def empty_batter_stats():
+    return {
+        "runs": 0,
+        "balls": 0,
+        "fours": 0,
+        "sixes": 0,
+        "is_out": False,
+        "dismissal_ball_id": None,
+    }
+
+
+def empty_bowler_stats():
+    return {
+        "runs_conceded": 0,
+        "balls": 0,
+        "wickets": 0,
+        "wides": 0,
+        "no_balls": 0,
+    }
+
+
+def fold_ball_into_innings_state(
+    *,
+    state,
+    ball,
+    balls_per_over,
+    wicket_type=None,
+    dismissed_player_id=None,
+    dismissed_by_id=None,
+    over_checkpoints=None,
+):
+    """
+    When over_checkpoints is a list, (over_number, ball, packed state) is
+    appended if this ball completes an over.
+    """
+    delta = compute_ball_statistics_delta(
+        ball=ball,
+        balls_per_over=balls_per_over,
+        wicket_type=wicket_type,
+        dismissed_player_id=dismissed_player_id,
+        dismissed_by_id=dismissed_by_id,
+    )
+    outcome = derive_next_state(
+        striker_id=ball.striker_id,
+        non_striker_id=ball.non_striker_id,
+        bowler_id=ball.bowler_id,
+        ball=ball,
+        balls_per_over=balls_per_over,
+        dismissed_player_id=dismissed_player_id,
+    )
+
+    for field, value in delta["aggregate"].items():
+        state[field] += value
+
+    batter = state["batters"].setdefault(
+        ball.striker_id, empty_batter_stats()
+    )
+    for field, value in delta["batter"].items():
+        batter[field] += value
+    if delta["batter_dismissed"]:
+        batter["is_out"] = True
+        batter["dismissal_ball_id"] = ball.id
+
+    bowler = state["bowlers"].setdefault(
+        ball.bowler_id, empty_bowler_stats()
+    )
+    for field, value in delta["bowler"].items():
+        bowler[field] += value
+
+    state["current_striker"] = outcome["next_striker"]
+    state["current_non_striker"] = outcome["next_non_striker"]
+    state["current_bowler"] = outcome["next_bowler"]
+    state["last_ball_id"] = ball.id
+    state["last_ball_number"] = ball.ball_number
+
+    if over_checkpoints is not None and delta["aggregate"]["completed_overs"]:
+        over_checkpoints.append(
+            (state["completed_overs"], ball, pack_innings_state(state))
+        )
+    return state
+
+
+def fold_balls_into_innings_state(
+    *,
+    balls,
+    balls_per_over,
+    state=None,
+    over_checkpoints=None,
+):
+    """
+    Fold balls (ordered by ball_number, wicket already joined) into state.
+    """
+    if state is None:
+        state = empty_innings_state()
+
+    for ball in balls:
+        wicket = getattr(ball, "wicket", None)
+        fold_ball_into_innings_state(
+            state=state,
+            ball=ball,
+            balls_per_over=balls_per_over,
+            wicket_type=wicket.wicket_type if wicket else None,
+            dismissed_player_id=(
+                wicket.dismissed_player_id if wicket else None
+            ),
+            dismissed_by_id=wicket.dismissed_by_id if wicket else None,
+            over_checkpoints=over_checkpoints,
+        )
+    return state
+
+
+# Positional layouts used by pack/unpack; append only, never reorder.
+PACKED_TOTAL_FIELDS = (
+    "runs",
+    "extras",
+    "wickets",
+    "legal_balls",
+    "completed_overs",
+    "last_ball_number",
+)
+PACKED_PARTICIPANT_FIELDS = (
+    "current_striker",
+    "current_non_striker",
+    "current_bowler",
+    "last_ball_id",
+)
+PACKED_BATTER_FIELDS = tuple(empty_batter_stats())
+PACKED_BOWLER_FIELDS = tuple(empty_bowler_stats())
+
+
+def _pack_id(value):
+    return str(value) if value is not None else None
+
+
+def _unpack_id(value):
+    return uuid.UUID(value) if value is not None else None
+
+
+def pack_innings_state(state):
+    """
+    Compact, JSON-safe form of an innings state: fixed-order vectors
+    instead of repeated field names.
+    """
+    return {
+        "totals": [state[field] for field in PACKED_TOTAL_FIELDS],
+        "participants": [
+            _pack_id(state[field]) for field in PACKED_PARTICIPANT_FIELDS
+        ],
+        "batters": {
+            str(player_id): [
+                int(stats["is_out"]) if field == "is_out"
+                else _pack_id(stats[field]) if field == "dismissal_ball_id"
+                else stats[field]
+                for field in PACKED_BATTER_FIELDS
+            ]
+            for player_id, stats in state["batters"].items()
+        },
+        "bowlers": {
+            str(player_id): [stats[field] for field in PACKED_BOWLER_FIELDS]
+            for player_id, stats in state["bowlers"].items()
+        },
+    }
+
+
+def unpack_innings_state(packed):
+    state = empty_innings_state()
+    state.update(zip(PACKED_TOTAL_FIELDS, packed["totals"]))
+    state.update(
+        zip(
+            PACKED_PARTICIPANT_FIELDS,
+            map(_unpack_id, packed["participants"]),
+        )
+    )
+
+    for player_id, values in packed["batters"].items():
+        stats = dict(zip(PACKED_BATTER_FIELDS, values))
+        stats["is_out"] = bool(stats["is_out"])
+        stats["dismissal_ball_id"] = _unpack_id(stats["dismissal_ball_id"])
+        state["batters"][uuid.UUID(player_id)] = stats
+
+    for player_id, values in packed["bowlers"].items():
+        state["bowlers"][uuid.UUID(player_id)] = dict(
+            zip(PACKED_BOWLER_FIELDS, values)
+        )
+    return state
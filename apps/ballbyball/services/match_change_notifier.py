@@ -0,0 +1,89 @@
+"""
+SERVICE: Match Change Notifier
+
+RESPONSIBILITY:
+- Let async requests wait for a match's next committed change without
+  holding a thread
+- Keep ONE channel-layer subscription per match per process, however
+  many requests wait on it, and wake all of them from each broadcast
+
+MUST DO:
+- Be subscribed before the caller checks for changes, so a change
+  committed in between still wakes it
+- Drop the subscription when the last waiter leaves
+
+MUST NEVER DO:
+- Query the database
+"""
+import asyncio
+
+from channels.layers import get_channel_layer
+
+from ballbyball.services.broadcast_match_changes import match_changes_group
+
+
+class MatchChangeListener:
+    """
+    The subscription of one match: a channel in its group, read by one
+    task that resolves every waiting future with the broadcast changes.
+    """
+
+    def __init__(self, match_id):
+        self.match_id = match_id
+        self.waiters = set()
+        self.subscribed = asyncio.Event()
+        self.task = None
+
+    async def run(self):
+        channel_layer = get_channel_layer()
+        group = match_changes_group(self.match_id)
+        try:
+            channel = await channel_layer.new_channel()
+            await channel_layer.group_add(group, channel)
+        finally:
+            # On failure waiters are released to their timeout
+            self.subscribed.set()
+        try:
+            while True:
+                message = await channel_layer.receive(channel)
+                if message.get("type") != "match.changes":
+                    continue
+                for waiter in self.waiters:
+                    if not waiter.done():
+                        waiter.set_result(message["changes"])
+        finally:
+            await channel_layer.group_discard(group, channel)
+
+
+class MatchChangeNotifier:
+
+    def __init__(self):
+        self.listeners = {}
+
+    async def subscribe(self, match_id):
+        """
+        A future resolved with the next broadcast list of changes.
+        Always pair with unsubscribe().
+        """
+        listener = self.listeners.get(match_id)
+        if listener is None:
+            listener = self.listeners[match_id] = MatchChangeListener(match_id)
+            listener.task = asyncio.create_task(listener.run())
+        waiter = asyncio.get_running_loop().create_future()
+        listener.waiters.add(waiter)
+        # Concurrent first waiters share the one subscribe in flight
+        await listener.subscribed.wait()
+        return waiter
+
+    def unsubscribe(self, match_id, waiter):
+        listener = self.listeners.get(match_id)
+        if listener is None:
+            return
+        listener.waiters.discard(waiter)
+        if not listener.waiters:
+            del self.listeners[match_id]
+            listener.task.cancel()
+
+
+# Per process; under ASGI every request of a worker shares its loop
+match_change_notifier = MatchChangeNotifier()
@@ -3,9 +3,12 @@ SERVICE: Persist Ball and Derived Statistics
 
 RESPONSIBILITY:
 - Create Ball record
-- Create BallWicket if applicable
+- Create BallWicket and other child rows, one bulk insert per table
+- Write the ball's feed entry projection
+- Record the ball in the match change sequence
 - Update InningsAggregate
 - Update BatterStats and BowlerStats
+- Record an over checkpoint when the ball completes an over
 
 MUST DO:
 - Run inside transaction
@@ -17,19 +20,11 @@ MUST NEVER DO:
 """
 from django.db import transaction
 from scoring.models import (
-    Ball,
     BatterStats,
     BowlerStats,
     InningsAggregate,
-    BallWicket,
-    BallAnalytics,
-    BallSpatialOutcome,
-    BallTrajectory,
-    BallReleaseData,
-    BallVideo,
-    BallFielding,
-    BallDRS,
 )
+from ballbyball.selectors.innings import innings_read_model_version
 from ballbyball.services.calculate_next_ball_sequence_numbers import (
     calculate_next_ball_sequence_numbers,
 )
@@ -39,7 +34,22 @@ from ballbyball.services.ball_outcome_engine import (
 from ballbyball.services.innings_outcome_engine import (
     detect_target_state,
 )
-import re
+from ballbyball.services.ball_statistics_delta import (
+    compute_ball_statistics_delta,
+    apply_statistics_delta,
+)
+from ballbyball.services.build_ball_records import (
+    validate_delivery,
+    build_ball,
+    build_ball_child_records,
+)
+from ballbyball.services.innings_over_checkpoints import (
+    record_over_checkpoint,
+)
+from ballbyball.services.write_ball_entry_projections import (
+    write_ball_entry_projections,
+)
+from ballbyball.services.record_match_changes import record_ball_change
 
 
 @transaction.atomic
@@ -77,233 +87,125 @@ def persist_ball_and_derived_statistics(
     video=None,
     fielding=None,
     drs=None,
-
+    context=None,
 ):
-    def to_snake(value):
-        return re.sub(r"(?<!^)([A-Z])", r"_\\1", value).lower()
-
-    def normalize_keys(payload):
-        if not payload:
-            return payload
-        return {to_snake(k): v for k, v in payload.items()}
-
-    def normalize_list(payload_list):
-        if not payload_list:
-            return payload_list
-        return [normalize_keys(item) for item in payload_list]
-    if striker == non_striker:
-        raise ValueError("Striker and non-striker cannot be same")
-
-    if bowler == striker or bowler == non_striker:
-        raise ValueError("Bowler cannot be a batter")
-
-    if is_bye and is_leg_bye:
-        raise ValueError("Ball cannot be both bye and leg-bye")
-
-    if is_wide and (is_bye or is_leg_bye):
-        raise ValueError("Wide cannot be a bye or leg-bye")
+    """
+    With a ScoringContext, the locked and updated aggregate replaces
+    context.aggregate so callers do not fetch it again, the written
+    stat rows are handed to the read-model cache, and its players are
+    reused for the entry projection.
+    """
+    validate_delivery(
+        striker_id=striker.id,
+        non_striker_id=non_striker.id,
+        bowler_id=bowler.id,
+        is_wide=is_wide,
+        is_bye=is_bye,
+        is_leg_bye=is_leg_bye,
+        wicket_type=wicket_type,
+        dismissed_player_id=dismissed_player_id,
+    )
 
-    if wicket_type and not dismissed_player_id:
-        raise ValueError("dismissed_player_id required for wicket")
+    balls_per_over = innings.match.match_type.balls_per_over
 
-    aggregate = InningsAggregate.objects.select_for_update().get(
-        innings=innings
+    aggregate = (
+        InningsAggregate.objects.select_for_update(of=("self",))
+        .select_related("last_ball")
+        .get(innings=innings)
     )
+    aggregate.innings = innings
+    base_read_model_version = innings_read_model_version(aggregate=aggregate)
 
     _, over_number, ball_in_over = (
         calculate_next_ball_sequence_numbers(
             aggregate=aggregate,
-            balls_per_over=innings.match.match_type.balls_per_over,
+            balls_per_over=balls_per_over,
         )
     )
 
     last_ball = aggregate.last_ball
     ball_number = 1 if not last_ball else last_ball.ball_number + 1
 
-    # Legality
-    is_legal_delivery = not (is_wide or is_no_ball)
-
-    # Classify completed runs
-    runs_off_bat = 0
-    bye_runs = 0
-    leg_bye_runs = 0
-
-    if completed_runs > 0:
-        # Wides can include physically completed runs, but those are extras,
-        # never runs_off_bat.
-        if is_wide:
-            pass
-        elif is_bye:
-            bye_runs = completed_runs
-        elif is_leg_bye:
-            leg_bye_runs = completed_runs
-        else:
-            runs_off_bat = completed_runs
-
-    # Extras breakdown
-    wide_runs = 0
-    no_ball_runs = 0
-    penalty_runs = 0
-
-    if is_wide:
-        wide_runs = 1 + completed_runs
-        penalty_runs += 1
-
-    if is_no_ball:
-        no_ball_runs = 1
-        penalty_runs += 1
-
-    extra_runs = wide_runs + no_ball_runs + bye_runs + leg_bye_runs
-    total_runs = runs_off_bat + extra_runs
-
-
-    ball = Ball.objects.create(
+    ball = build_ball(
         user=user,
-        match=innings.match,
         innings=innings,
         ball_number=ball_number,
         over_number=over_number,
         ball_in_over=ball_in_over,
-        is_legal_delivery=is_legal_delivery,
-        batting_team=innings.batting_team,
-        bowling_team=innings.bowling_team,
-        striker=striker,
-        non_striker=non_striker,
-        bowler=bowler,
-        striker_hand=striker_hand or "RIGHT",
-        bowler_hand=bowler_hand or "RIGHT",
-        umpire_bowler_end_id=umpire_bowler_end_id,
-        umpire_square_leg_id=umpire_square_leg_id,
-        runs_off_bat=runs_off_bat,
+        striker_id=striker.id,
+        non_striker_id=non_striker.id,
+        bowler_id=bowler.id,
         completed_runs=completed_runs,
-        extra_runs=extra_runs,
-        bye_runs=bye_runs,
-        leg_bye_runs=leg_bye_runs,
-        wide_runs=wide_runs,
-        no_ball_runs=no_ball_runs,
-        penalty_runs=penalty_runs,
+        is_wide=is_wide,
+        is_no_ball=is_no_ball,
+        is_bye=is_bye,
+        is_leg_bye=is_leg_bye,
         is_boundary=is_boundary,
         is_short_run=is_short_run,
         is_quick_running=is_quick_running,
         is_free_hit=is_free_hit,
+        striker_hand=striker_hand,
+        bowler_hand=bowler_hand,
+        umpire_bowler_end_id=umpire_bowler_end_id,
+        umpire_square_leg_id=umpire_square_leg_id,
     )
+    ball.save(force_insert=True)
 
-    if wicket_type and dismissed_player_id:
-        if wicket_type != "RUN_OUT" and dismissed_player_id != striker.id:
-            raise ValueError("Only run-out can dismiss non-striker")
-        BallWicket.objects.create(
-            ball=ball,
-            wicket_type=wicket_type,
-            dismissed_player_id=dismissed_player_id,
-            dismissed_by_id=dismissed_by_id,
-            caught_by_id=caught_by_id,
-            stumped_by_id=stumped_by_id,
-            run_out_fielder_1_id=run_out_fielder_1_id,
-            run_out_fielder_2_id=run_out_fielder_2_id,
-        )
-
-    if analytics:
-        BallAnalytics.objects.create(
-            ball=ball,
-            **normalize_keys(analytics),
-        )
-
-    if spatial:
-        BallSpatialOutcome.objects.create(
-            ball=ball,
-            **normalize_keys(spatial),
-        )
-
-    if release:
-        BallReleaseData.objects.create(
-            ball=ball,
-            **normalize_keys(release),
-        )
-
-    if video:
-        BallVideo.objects.create(
-            ball=ball,
-            **normalize_keys(video),
-        )
-
-    if fielding:
-        fielders = fielding.get("fielders", [])
-
-        if not isinstance(fielders, list):
-            raise ValueError("fielding.fielders must be a list")
-
-        for f in fielders:
-            payload = normalize_keys(f)
-
-            if "player" in payload:
-                payload["player_id"] = payload.pop("player")
-
-            BallFielding.objects.create(
-                ball=ball,
-                **payload,
-            )
-
-    """
-    if fielding:
-        fielding_payload = normalize_keys(fielding)
-        # Accept UUIDs from frontend for fielder1/fielder2
-        if "fielder1" in fielding_payload:
-            fielding_payload["fielder1_id"] = fielding_payload.pop("fielder1")
-        if "fielder2" in fielding_payload:
-            fielding_payload["fielder2_id"] = fielding_payload.pop("fielder2")
-        BallFielding.objects.create(
-            ball=ball,
-            **fielding_payload,
-        )
-    """
-    if drs:
-        drs_payload = normalize_keys(drs)
-        if "review_team_id" in drs_payload:
-            drs_payload["review_team_id"] = drs_payload["review_team_id"]
-        if "review_team" in drs_payload:
-            drs_payload["review_team_id"] = drs_payload.pop("review_team")
-        if "decision_given_by_umpire" in drs_payload:
-            drs_payload["decision_given_by_umpire_id"] = drs_payload.pop(
-                "decision_given_by_umpire"
-            )
-        if "third_umpire" in drs_payload:
-            drs_payload["third_umpire_id"] = drs_payload.pop("third_umpire")
-        BallDRS.objects.create(
-            ball=ball,
-            **drs_payload,
-        )
+    child_records = build_ball_child_records(
+        ball=ball,
+        wicket_type=wicket_type,
+        dismissed_player_id=dismissed_player_id,
+        dismissed_by_id=dismissed_by_id,
+        caught_by_id=caught_by_id,
+        stumped_by_id=stumped_by_id,
+        run_out_fielder_1_id=run_out_fielder_1_id,
+        run_out_fielder_2_id=run_out_fielder_2_id,
+        analytics=analytics,
+        spatial=spatial,
+        trajectory=trajectory,
+        release=release,
+        video=video,
+        fielding=fielding,
+        drs=drs,
+    )
+    insert_ball_child_records(records=child_records)
 
-    if trajectory:
-        for point in normalize_list(trajectory):
-            BallTrajectory.objects.create(
-                ball=ball,
-                **point,
-            )
+    players = {player.id: player for player in (striker, non_striker, bowler)}
+    if context is not None:
+        players = {**context.players, **players}
+    projections = write_ball_entry_projections(
+        innings=innings,
+        balls=[ball],
+        child_records=child_records,
+        players=players,
+    )
 
     outcome = derive_next_state(
         striker_id=striker.id,
         non_striker_id=non_striker.id,
         bowler_id=bowler.id,
         ball=ball,
-        balls_per_over=innings.match.match_type.balls_per_over,
+        balls_per_over=balls_per_over,
         dismissed_player_id=dismissed_player_id,
     )
 
-    # Aggregate update
-    aggregate.runs += total_runs
-    aggregate.extras += extra_runs
-    if wicket_type and dismissed_player_id:
-        aggregate.wickets += 1
-
-    if is_legal_delivery:
-        aggregate.legal_balls += 1
-        if ball_in_over == innings.match.match_type.balls_per_over:
-            aggregate.completed_overs += 1
+    delta = compute_ball_statistics_delta(
+        ball=ball,
+        balls_per_over=balls_per_over,
+        wicket_type=wicket_type,
+        dismissed_player_id=dismissed_player_id,
+        dismissed_by_id=dismissed_by_id,
+    )
 
+    # Aggregate update
+    apply_statistics_delta(instance=aggregate, values=delta["aggregate"])
     aggregate.current_striker_id = outcome["next_striker"]
     aggregate.current_non_striker_id = outcome["next_non_striker"]
     aggregate.current_bowler_id = outcome["next_bowler"]
     aggregate.last_ball = ball
+    aggregate.target_achieved = (
+        detect_target_state(aggregate=aggregate) == "WON"
+    )
     aggregate.save()
 
     # Batter stats
@@ -311,14 +213,8 @@ def persist_ball_and_derived_statistics(
         innings=innings,
         player=striker,
     )
-    batter.runs += runs_off_bat
-    if not is_wide:
-        batter.balls += 1
-    if runs_off_bat == 4:
-        batter.fours += 1
-    elif runs_off_bat == 6:
-        batter.sixes += 1
-    if wicket_type and dismissed_player_id == striker.id:
+    apply_statistics_delta(instance=batter, values=delta["batter"])
+    if delta["batter_dismissed"]:
         batter.is_out = True
         batter.dismissal_ball = ball
     batter.save()
@@ -328,24 +224,35 @@ def persist_ball_and_derived_statistics(
         innings=innings,
         player=bowler,
     )
-    bowler_stats.runs_conceded += runs_off_bat + wide_runs + no_ball_runs
-    # Wides count = total wide runs (penalty + runs taken)
-    if is_wide:
-        bowler_stats.wides += wide_runs
-    if is_no_ball:
-        bowler_stats.no_balls += 1
-    if is_legal_delivery:
-        bowler_stats.balls += 1
-    if wicket_type in {"BOWLED", "LBW", "CAUGHT", "STUMPED", "HIT_WICKET"}:
-        credited_to_bowler = (
-            dismissed_by_id is None or dismissed_by_id == bowler.id
-        )
-        if credited_to_bowler:
-            bowler_stats.wickets += 1
+    apply_statistics_delta(instance=bowler_stats, values=delta["bowler"])
     bowler_stats.save()
 
-    target_state = detect_target_state(aggregate=aggregate)
-    aggregate.target_achieved = target_state == "WON"
-    aggregate.save(update_fields=["target_achieved"])
+    if context is not None:
+        context.aggregate = aggregate
+        context.stat_rows_patch = {
+            "base_version": base_read_model_version,
+            "rows": [batter, bowler_stats],
+        }
+
+    if delta["aggregate"]["completed_overs"]:
+        record_over_checkpoint(innings=innings, ball=ball)
+
+    record_ball_change(
+        innings=innings,
+        balls=[ball],
+        aggregate=aggregate,
+        projections=projections,
+    )
 
     return ball
+
+
+def insert_ball_child_records(*, records):
+    """
+    Insert child rows with one bulk insert per model, keeping their order.
+    """
+    records_by_model = {}
+    for record in records:
+        records_by_model.setdefault(type(record), []).append(record)
+    for model, model_records in records_by_model.items():
+        model.objects.bulk_create(model_records)
@@ -0,0 +1,201 @@
+"""
+SERVICE: Persist Ball Batch and Derived Statistics
+
+RESPONSIBILITY:
+- Record an ordered list of deliveries for one innings
+- Lock the aggregate once and sequence every ball in memory
+- Insert balls and child rows with one bulk insert per table
+- Write the balls' feed entry projections
+- Record the batch as one change in the match change sequence
+- Write aggregate, stats and over checkpoints once, at the end
+
+MUST DO:
+- Run inside transaction (all deliveries or none)
+- Apply the same per-ball rules as the single-ball path
+
+MUST NEVER DO:
+- Decide UI actions
+- Record balls after the innings has ended
+"""
+from django.db import transaction
+from coredata.models import Player
+from scoring.models import Ball, InningsAggregate
+from ballbyball.exceptions import InvalidBallBatch
+from ballbyball.services.build_ball_records import (
+    validate_delivery,
+    build_ball,
+    build_ball_child_records,
+)
+from ballbyball.services.calculate_next_ball_sequence_numbers import (
+    calculate_next_ball_sequence_numbers,
+)
+from ballbyball.services.innings_outcome_engine import detect_innings_end
+from ballbyball.services.innings_state_engine import (
+    fold_ball_into_innings_state,
+)
+from ballbyball.services.innings_over_checkpoints import (
+    load_innings_state_as_of_ball,
+)
+from ballbyball.services.persist_ball_and_derived_statistics import (
+    insert_ball_child_records,
+)
+from ballbyball.services.rebuild_entire_innings_from_ball_history import (
+    apply_innings_state_to_aggregate,
+    write_innings_state,
+    write_over_checkpoints,
+)
+from ballbyball.services.write_ball_entry_projections import (
+    write_ball_entry_projections,
+)
+from ballbyball.services.record_match_changes import record_ball_change
+
+BALL_FIELDS = (
+    "completed_runs",
+    "is_wide",
+    "is_no_ball",
+    "is_bye",
+    "is_leg_bye",
+    "is_boundary",
+    "is_short_run",
+    "is_quick_running",
+    "is_free_hit",
+    "striker_hand",
+    "bowler_hand",
+    "umpire_bowler_end_id",
+    "umpire_square_leg_id",
+)
+
+CHILD_RECORD_FIELDS = (
+    "wicket_type",
+    "dismissed_player_id",
+    "dismissed_by_id",
+    "caught_by_id",
+    "stumped_by_id",
+    "run_out_fielder_1_id",
+    "run_out_fielder_2_id",
+    "analytics",
+    "spatial",
+    "trajectory",
+    "release",
+    "video",
+    "fielding",
+    "drs",
+)
+
+
+@transaction.atomic
+def persist_ball_batch_and_derived_statistics(*, user, innings, deliveries):
+    """
+    `deliveries` are dicts of persist_ball_and_derived_statistics keyword
+    arguments, with striker_id / non_striker_id / bowler_id instead of
+    player objects and an optional expected `ball_number`.
+    """
+    match_type = innings.match.match_type
+    balls_per_over = match_type.balls_per_over
+
+    aggregate = InningsAggregate.objects.select_for_update().get(
+        innings=innings
+    )
+    state = load_innings_state_as_of_ball(innings=innings)
+
+    players = Player.objects.in_bulk({
+        delivery[field]
+        for delivery in deliveries
+        for field in ("striker_id", "non_striker_id", "bowler_id")
+    })
+
+    balls = []
+    child_records = []
+    over_checkpoints = []
+
+    for index, delivery in enumerate(deliveries):
+        try:
+            apply_innings_state_to_aggregate(aggregate=aggregate, state=state)
+            if detect_innings_end(aggregate=aggregate, match_type=match_type):
+                raise ValueError("Innings has already ended")
+
+            for field in ("striker_id", "non_striker_id", "bowler_id"):
+                if delivery[field] not in players:
+                    raise ValueError(f"Unknown player for {field}")
+
+            ball_number = state["last_ball_number"] + 1
+            expected = delivery.get("ball_number")
+            if expected is not None and expected != ball_number:
+                raise ValueError(
+                    f"Expected ball_number {ball_number}, got {expected}"
+                )
+
+            validate_delivery(
+                striker_id=delivery["striker_id"],
+                non_striker_id=delivery["non_striker_id"],
+                bowler_id=delivery["bowler_id"],
+                is_wide=delivery["is_wide"],
+                is_bye=delivery["is_bye"],
+                is_leg_bye=delivery["is_leg_bye"],
+                wicket_type=delivery.get("wicket_type"),
+                dismissed_player_id=delivery.get("dismissed_player_id"),
+            )
+
+            _, over_number, ball_in_over = (
+                calculate_next_ball_sequence_numbers(
+                    aggregate=aggregate,
+                    balls_per_over=balls_per_over,
+                )
+            )
+            ball = build_ball(
+                user=user,
+                innings=innings,
+                ball_number=ball_number,
+                over_number=over_number,
+                ball_in_over=ball_in_over,
+                striker_id=delivery["striker_id"],
+                non_striker_id=delivery["non_striker_id"],
+                bowler_id=delivery["bowler_id"],
+                **{
+                    field: delivery[field]
+                    for field in BALL_FIELDS
+                    if delivery.get(field) is not None
+                },
+            )
+            child_records.extend(
+                build_ball_child_records(
+                    ball=ball,
+                    **{
+                        field: delivery.get(field)
+                        for field in CHILD_RECORD_FIELDS
+                    },
+                )
+            )
+        except ValueError as exc:
+            raise InvalidBallBatch(str(exc), index=index) from exc
+
+        fold_ball_into_innings_state(
+            state=state,
+            ball=ball,
+            balls_per_over=balls_per_over,
+            wicket_type=delivery.get("wicket_type"),
+            dismissed_player_id=delivery.get("dismissed_player_id"),
+            dismissed_by_id=delivery.get("dismissed_by_id"),
+            over_checkpoints=over_checkpoints,
+        )
+        balls.append(ball)
+
+    Ball.objects.bulk_create(balls)
+
+    insert_ball_child_records(records=child_records)
+    projections = write_ball_entry_projections(
+        innings=innings,
+        balls=balls,
+        child_records=child_records,
+        players=players,
+    )
+
+    write_innings_state(innings=innings, state=state, aggregate=aggregate)
+    write_over_checkpoints(innings=innings, over_checkpoints=over_checkpoints)
+    record_ball_change(
+        innings=innings,
+        balls=balls,
+        aggregate=aggregate,
+        projections=projections,
+    )
+    return balls
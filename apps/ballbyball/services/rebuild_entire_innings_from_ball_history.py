@@ -3,131 +3,165 @@ SERVICE: Rebuild Entire Innings from Ball History
 
 RESPONSIBILITY:
 - Recompute aggregate and stats from scratch
-- Process balls sequentially
+- Load balls and wickets in one query
+- Fold them in memory, then write the final rows in bulk
+- Regenerate over checkpoints from the same fold
 
 MUST DO:
 - Be idempotent
 - Be safe for audits and undo
+- Use a constant number of queries regardless of innings length
 
 MUST NEVER DO:
 - Assume partial state
 - Patch existing aggregates
+- Save per ball
 """
+from django.db import transaction
 from scoring.models import (
     Ball,
     InningsAggregate,
     BatterStats,
     BowlerStats,
-)
-from ballbyball.services.ball_outcome_engine import (
-    derive_next_state,
+    InningsOverCheckpoint,
 )
 from ballbyball.services.innings_outcome_engine import (
     detect_target_state,
 )
+from ballbyball.services.innings_state_engine import (
+    empty_batter_stats,
+    empty_bowler_stats,
+    fold_balls_into_innings_state,
+)
 
-def rebuild_entire_innings_from_ball_history(*, innings):
-    Ball.objects.filter(innings=innings).order_by("ball_number")
-
-    InningsAggregate.objects.filter(innings=innings).update(
-        runs=0,
-        wickets=0,
-        legal_balls=0,
-        completed_overs=0,
-        extras=0,
-        current_striker=None,
-        current_non_striker=None,
-        current_bowler=None,
-        last_ball=None,
-    )
+BALL_HISTORY_FIELDS = (
+    "id",
+    "ball_number",
+    "ball_in_over",
+    "is_legal_delivery",
+    "striker_id",
+    "non_striker_id",
+    "bowler_id",
+    "runs_off_bat",
+    "extra_runs",
+    "bye_runs",
+    "leg_bye_runs",
+    "wide_runs",
+    "no_ball_runs",
+    "wicket__id",
+    "wicket__wicket_type",
+    "wicket__dismissed_player_id",
+    "wicket__dismissed_by_id",
+)
+
+BATTER_STAT_FIELDS = tuple(empty_batter_stats())
+BOWLER_STAT_FIELDS = tuple(empty_bowler_stats())
 
-    BatterStats.objects.filter(innings=innings).update(
-        runs=0,
-        balls=0,
-        fours=0,
-        sixes=0,
-        is_out=False,
-        dismissal_ball=None,
+
+def load_innings_ball_history(*, innings, after_ball_number=0):
+    return (
+        Ball.objects.filter(
+            innings=innings,
+            ball_number__gt=after_ball_number,
+        )
+        .select_related("wicket")
+        .only(*BALL_HISTORY_FIELDS)
+        .order_by("ball_number")
     )
-    BowlerStats.objects.filter(innings=innings).update(
-        runs_conceded=0,
-        balls=0,
-        wickets=0,
-        wides=0,
-        no_balls=0,
+
+
+@transaction.atomic
+def rebuild_entire_innings_from_ball_history(*, innings):
+    over_checkpoints = []
+    state = fold_balls_into_innings_state(
+        balls=load_innings_ball_history(innings=innings),
+        balls_per_over=innings.match.match_type.balls_per_over,
+        over_checkpoints=over_checkpoints,
     )
+    write_innings_state(innings=innings, state=state)
+
+    InningsOverCheckpoint.objects.filter(innings=innings).exclude(
+        ball_id__in=[ball.id for _, ball, _ in over_checkpoints]
+    ).delete()
+    write_over_checkpoints(innings=innings, over_checkpoints=over_checkpoints)
+    return state
+
 
-    for ball in Ball.objects.filter(innings=innings).order_by("ball_number"):
-        wicket = getattr(ball, "wicket", None)
-        dismissed_player_id = None
-        wicket_type = None
-        if wicket:
-            dismissed_player_id = wicket.dismissed_player_id
-            wicket_type = wicket.wicket_type
-
-        outcome = derive_next_state(
-            striker_id=ball.striker_id,
-            non_striker_id=ball.non_striker_id,
-            bowler_id=ball.bowler_id,
-            ball=ball,
-            balls_per_over=innings.match.match_type.balls_per_over,
-            dismissed_player_id=dismissed_player_id,
+def write_over_checkpoints(*, innings, over_checkpoints):
+    if over_checkpoints:
+        InningsOverCheckpoint.objects.bulk_create(
+            [
+                InningsOverCheckpoint(
+                    innings=innings,
+                    over_number=over_number,
+                    ball_id=ball.id,
+                    ball_number=ball.ball_number,
+                    state=packed,
+                )
+                for over_number, ball, packed in over_checkpoints
+            ],
+            update_conflicts=True,
+            unique_fields=["innings", "over_number"],
+            update_fields=["ball", "ball_number", "state"],
         )
 
-        aggregate = InningsAggregate.objects.get(innings=innings)
-        aggregate.runs += ball.runs_off_bat + ball.extra_runs
-        aggregate.extras += ball.extra_runs
-        if wicket_type and dismissed_player_id:
-            aggregate.wickets += 1
-        if ball.is_legal_delivery:
-            aggregate.legal_balls += 1
-            if ball.ball_in_over == innings.match.match_type.balls_per_over:
-                aggregate.completed_overs += 1
-        aggregate.current_striker_id = outcome["next_striker"]
-        aggregate.current_non_striker_id = outcome["next_non_striker"]
-        aggregate.current_bowler_id = outcome["next_bowler"]
-        aggregate.last_ball = ball
-        aggregate.save()
-
-        batter, _ = BatterStats.objects.get_or_create(
-            innings=innings,
-            player_id=ball.striker_id,
+
+def apply_innings_state_to_aggregate(*, aggregate, state):
+    # Penalty runs are awarded outside ball history, so they are the
+    # starting point rather than zero.
+    aggregate.runs = aggregate.extra_penalty_runs + state["runs"]
+    aggregate.extras = aggregate.extra_penalty_runs + state["extras"]
+    aggregate.wickets = state["wickets"]
+    aggregate.legal_balls = state["legal_balls"]
+    aggregate.completed_overs = state["completed_overs"]
+    aggregate.current_striker_id = state["current_striker"]
+    aggregate.current_non_striker_id = state["current_non_striker"]
+    aggregate.current_bowler_id = state["current_bowler"]
+    aggregate.last_ball_id = state["last_ball_id"]
+    aggregate.target_achieved = (
+        detect_target_state(aggregate=aggregate) == "WON"
+    )
+    return aggregate
+
+
+def write_innings_state(*, innings, state, aggregate=None):
+    """
+    Write state to the aggregate and stats rows. Pass `aggregate` when
+    the caller already holds its row lock.
+    """
+    if aggregate is None:
+        aggregate, _ = (
+            InningsAggregate.objects.select_for_update()
+            .get_or_create(innings=innings)
         )
-        batter.runs += ball.runs_off_bat
-        if ball.is_legal_delivery:
-            batter.balls += 1
-        if ball.runs_off_bat == 4:
-            batter.fours += 1
-        elif ball.runs_off_bat == 6:
-            batter.sixes += 1
-        if wicket_type and dismissed_player_id == ball.striker_id:
-            batter.is_out = True
-            batter.dismissal_ball = ball
-        batter.save()
-
-        bowler_stats, _ = BowlerStats.objects.get_or_create(
-            innings=innings,
-            player_id=ball.bowler_id,
+    apply_innings_state_to_aggregate(aggregate=aggregate, state=state)
+    aggregate.save()
+
+    BatterStats.objects.filter(innings=innings).exclude(
+        player_id__in=state["batters"].keys()
+    ).update(**empty_batter_stats())
+    BowlerStats.objects.filter(innings=innings).exclude(
+        player_id__in=state["bowlers"].keys()
+    ).update(**empty_bowler_stats())
+
+    if state["batters"]:
+        BatterStats.objects.bulk_create(
+            [
+                BatterStats(innings=innings, player_id=player_id, **stats)
+                for player_id, stats in state["batters"].items()
+            ],
+            update_conflicts=True,
+            unique_fields=["innings", "player"],
+            update_fields=list(BATTER_STAT_FIELDS),
         )
-        bowler_stats.runs_conceded += (
-            ball.runs_off_bat + ball.wide_runs + ball.no_ball_runs
+    if state["bowlers"]:
+        BowlerStats.objects.bulk_create(
+            [
+                BowlerStats(innings=innings, player_id=player_id, **stats)
+                for player_id, stats in state["bowlers"].items()
+            ],
+            update_conflicts=True,
+            unique_fields=["innings", "player"],
+            update_fields=list(BOWLER_STAT_FIELDS),
         )
-        # Wides count = total wide runs (penalty + runs taken)
-        if ball.wide_runs:
-            bowler_stats.wides += ball.wide_runs
-        if ball.no_ball_runs:
-            bowler_stats.no_balls += 1
-        if ball.is_legal_delivery:
-            bowler_stats.balls += 1
-        if wicket_type in {"BOWLED", "LBW", "CAUGHT", "STUMPED", "HIT_WICKET"}:
-            credited_to_bowler = (
-                wicket.dismissed_by_id is None or
-                wicket.dismissed_by_id == ball.bowler_id
-            ) if wicket else True
-            if credited_to_bowler:
-                bowler_stats.wickets += 1
-        bowler_stats.save()
-
-        target_state = detect_target_state(aggregate=aggregate)
-        aggregate.target_achieved = target_state == "WON"
-        aggregate.save(update_fields=["target_achieved"])
+    return aggregate
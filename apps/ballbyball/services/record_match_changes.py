@@ -0,0 +1,115 @@
+"""
+SERVICE: Record Match Changes
+
+RESPONSIBILITY:
+- Number a match's scoring mutations with a per-match sequence
+- Store each mutation in compact form for delta sync
+- Push the changes to the match's live viewers once they commit
+
+MUST DO:
+- Run inside the transaction that made the mutation
+- Hand out sequence numbers in commit order (the cursor row stays
+  locked until commit)
+
+MUST NEVER DO:
+- Reuse or skip a sequence number
+- Store full ball entries (they are joined from projections when read)
+"""
+from functools import partial
+from django.db import transaction
+from django.db.models import F
+from ballbyball.models import MatchChange, MatchChangeCursor
+from ballbyball.services.broadcast_match_changes import (
+    broadcast_match_changes,
+)
+
+
+def summarize_score(aggregate):
+    return {
+        "runs": aggregate.runs,
+        "wickets": aggregate.wickets,
+        "legal_balls": aggregate.legal_balls,
+    }
+
+
+def allocate_change_sequence(*, match_id, count):
+    """
+    Reserve `count` sequence numbers; returns the first one.
+    """
+    cursors = MatchChangeCursor.objects.filter(match_id=match_id)
+    if not cursors.update(last_seq=F("last_seq") + count):
+        # The match's first change; a concurrent first change may have
+        # created the cursor already
+        MatchChangeCursor.objects.bulk_create(
+            [MatchChangeCursor(match_id=match_id)], ignore_conflicts=True
+        )
+        cursors.update(last_seq=F("last_seq") + count)
+    last_seq = cursors.values_list("last_seq", flat=True).get()
+    return last_seq - count + 1
+
+
+def record_match_changes(*, match_id, changes, entries=None):
+    """
+    `changes` is a list of (MatchChange.Kind, data) in the order they
+    happened; `entries` maps ball id to the feed entry just rendered,
+    so the broadcast does not read projections back.
+    """
+    if not changes:
+        return []
+    first_seq = allocate_change_sequence(
+        match_id=match_id, count=len(changes)
+    )
+    recorded = MatchChange.objects.bulk_create(
+        MatchChange(match_id=match_id, seq=first_seq + offset, kind=kind, data=data)
+        for offset, (kind, data) in enumerate(changes)
+    )
+    # A failed push must not fail a mutation that already committed
+    transaction.on_commit(
+        partial(
+            broadcast_match_changes,
+            match_id=match_id,
+            changes=recorded,
+            entries=entries or {},
+        ),
+        robust=True,
+    )
+    return recorded
+
+
+def ball_change(*, innings, balls, score):
+    return (
+        MatchChange.Kind.BALL,
+        {
+            "innings": innings.innings_number,
+            "ball_ids": [str(ball.id) for ball in balls],
+            "score": score,
+        },
+    )
+
+
+def projected_entries(projections):
+    return {
+        str(projection.ball_id): projection.entry
+        for projection in projections
+    }
+
+
+def record_ball_change(*, innings, balls, aggregate, projections):
+    record_match_changes(
+        entries=projected_entries(projections),
+        match_id=innings.match_id,
+        changes=[
+            ball_change(
+                innings=innings,
+                balls=balls,
+                score=summarize_score(aggregate),
+            )
+        ],
+    )
+
+
+def record_match_state_change(*, match):
+    record_match_changes(
+        match_id=match.id,
+        changes=[(MatchChange.Kind.MATCH, {"state": match.state})],
+    )
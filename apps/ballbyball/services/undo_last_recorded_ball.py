@@ -4,32 +4,187 @@ SERVICE: Undo Last Recorded Ball
 RESPONSIBILITY:
 - Delete the most recent ball
 - Delete all linked records
-- Trigger full rebuild
+- Reverse the ball's contribution to aggregate and player stats
+- Fall back to a rebuild from the nearest over checkpoint when derived
+  state is out of sync, and to a full rebuild for balls whose stats
+  the delta did not build
+- Record the undo in the match change sequence
 
 MUST DO:
 - Undo exactly ONE ball
+- Leave derived state identical to a full rebuild
 
 MUST NEVER DO:
 - Undo multiple balls
-- Reverse calculations
 """
 from django.db import transaction
-from scoring.models import Ball
+from scoring.models import Ball, InningsAggregate, BatterStats, BowlerStats
+from ballbyball.exceptions import DerivedStatisticsOutOfSync
+from ballbyball.services.ball_outcome_engine import derive_next_state
+from ballbyball.services.ball_statistics_delta import (
+    compute_ball_statistics_delta,
+    apply_statistics_delta,
+)
+from ballbyball.models import MatchChange
+from ballbyball.services.innings_outcome_engine import detect_target_state
+from ballbyball.services.record_match_changes import (
+    record_match_changes,
+    summarize_score,
+)
 from .rebuild_entire_innings_from_ball_history import (
     rebuild_entire_innings_from_ball_history,
 )
+from .innings_over_checkpoints import (
+    rebuild_innings_from_nearest_over_checkpoint,
+)
 
 
 @transaction.atomic
-def undo_last_recorded_ball(*, innings):
+def undo_last_recorded_ball(*, innings, full_rebuild=False):
     last_ball = (
         Ball.objects.filter(innings=innings)
+        .select_related("wicket")
         .order_by("-ball_number")
         .first()
     )
     if not last_ball:
         return None
+    # Deleting the ball clears its id
+    ball_id = last_ball.id
 
-    last_ball.delete()
-    rebuild_entire_innings_from_ball_history(innings=innings)
+    aggregate = remove_ball_and_derived_statistics(
+        innings=innings,
+        ball=last_ball,
+        full_rebuild=full_rebuild,
+    )
+    record_match_changes(
+        match_id=innings.match_id,
+        changes=[(
+            MatchChange.Kind.UNDO,
+            {
+                "innings": innings.innings_number,
+                "ball_id": str(ball_id),
+                "ball_number": last_ball.ball_number,
+                "score": summarize_score(aggregate),
+            },
+        )],
+    )
     return last_ball
+
+
+def remove_ball_and_derived_statistics(*, innings, ball, full_rebuild):
+    """
+    Delete `ball` and bring derived state back in line; returns the
+    updated aggregate.
+    """
+    # Balls from bulk sync or the scoring endpoints were folded in by
+    # the scoring engine, whose rules the delta does not reverse
+    if not full_rebuild and ball.stats_from_ball_delta:
+        try:
+            with transaction.atomic():
+                aggregate = reverse_ball_and_derived_statistics(
+                    innings=innings,
+                    ball=ball,
+                )
+                ball.delete()
+            return aggregate
+        except DerivedStatisticsOutOfSync:
+            # Deleting the ball cascades to its checkpoint, so the
+            # nearest remaining one is still valid.
+            ball.delete()
+            rebuild_innings_from_nearest_over_checkpoint(innings=innings)
+            return InningsAggregate.objects.get(innings=innings)
+
+    ball.delete()
+    rebuild_entire_innings_from_ball_history(innings=innings)
+    return InningsAggregate.objects.get(innings=innings)
+
+
+def reverse_ball_and_derived_statistics(*, innings, ball):
+    """
+    Subtract one ball's delta and restore the participants derived
+    from the ball before it. Raises DerivedStatisticsOutOfSync when the
+    stored aggregate does not end on this ball.
+    """
+    balls_per_over = innings.match.match_type.balls_per_over
+
+    aggregate = (
+        InningsAggregate.objects.select_for_update()
+        .filter(innings=innings)
+        .first()
+    )
+    if aggregate is None or aggregate.last_ball_id != ball.id:
+        raise DerivedStatisticsOutOfSync(
+            "Aggregate does not end on the ball being undone"
+        )
+
+    wicket = getattr(ball, "wicket", None)
+    delta = compute_ball_statistics_delta(
+        ball=ball,
+        balls_per_over=balls_per_over,
+        wicket_type=wicket.wicket_type if wicket else None,
+        dismissed_player_id=wicket.dismissed_player_id if wicket else None,
+        dismissed_by_id=wicket.dismissed_by_id if wicket else None,
+    )
+
+    try:
+        batter = BatterStats.objects.select_for_update().get(
+            innings=innings,
+            player_id=ball.striker_id,
+        )
+        bowler_stats = BowlerStats.objects.select_for_update().get(
+            innings=innings,
+            player_id=ball.bowler_id,
+        )
+    except (BatterStats.DoesNotExist, BowlerStats.DoesNotExist):
+        raise DerivedStatisticsOutOfSync("Player stats row missing")
+
+    apply_statistics_delta(
+        instance=aggregate, values=delta["aggregate"], sign=-1
+    )
+    apply_statistics_delta(instance=batter, values=delta["batter"], sign=-1)
+    apply_statistics_delta(
+        instance=bowler_stats, values=delta["bowler"], sign=-1
+    )
+    if delta["batter_dismissed"]:
+        batter.is_out = False
+        batter.dismissal_ball = None
+
+    previous_ball = (
+        Ball.objects.filter(
+            innings=innings,
+            ball_number__lt=ball.ball_number,
+        )
+        .select_related("wicket")
+        .order_by("-ball_number")
+        .first()
+    )
+    if previous_ball:
+        previous_wicket = getattr(previous_ball, "wicket", None)
+        outcome = derive_next_state(
+            striker_id=previous_ball.striker_id,
+            non_striker_id=previous_ball.non_striker_id,
+            bowler_id=previous_ball.bowler_id,
+            ball=previous_ball,
+            balls_per_over=balls_per_over,
+            dismissed_player_id=(
+                previous_wicket.dismissed_player_id
+                if previous_wicket else None
+            ),
+        )
+        aggregate.current_striker_id = outcome["next_striker"]
+        aggregate.current_non_striker_id = outcome["next_non_striker"]
+        aggregate.current_bowler_id = outcome["next_bowler"]
+    else:
+        aggregate.current_striker_id = None
+        aggregate.current_non_striker_id = None
+        aggregate.current_bowler_id = None
+
+    aggregate.last_ball = previous_ball
+    aggregate.target_achieved = (
+        detect_target_state(aggregate=aggregate) == "WON"
+    )
+    aggregate.save()
+    batter.save()
+    bowler_stats.save()
+    return aggregate
@@ -21,7 +21,6 @@ def validate_match_and_scorer_ownership(*, user, match):
     """
     Validate that the given user is allowed to score this match.
     """
-    print(user.id)
     # Example rule: match is owned by organisation
     if ((match.owner_id != user.organization_id and match.owner_type =="ORG") ):
         
@@ -0,0 +1,176 @@
+"""
+SERVICE: Write Ball Entry Projections
+
+RESPONSIBILITY:
+- Render the full ball-feed entry of just-recorded balls
+- Insert one BallEntryProjection per ball, in one bulk insert
+
+MUST DO:
+- Run inside the transaction that recorded the balls
+- Render from the in-memory rows that were inserted, loading only the
+  players, teams and umpires the caller does not already hold
+- Produce exactly what build_ball_entry renders from the database
+
+MUST NEVER DO:
+- Re-read the balls or their child rows
+- Update an existing projection (balls are immutable once recorded)
+"""
+from coredata.models import Player, Team, Umpire
+from matches.models import Innings
+from scoring.models import (
+    Ball,
+    BallWicket,
+    BallFielding,
+    BallTrajectory,
+    BallDRS,
+)
+from ballbyball.models import BallEntryProjection
+from ballbyball.services.build_ball_entry import build_ball_entry
+
+# Reverse one-to-one accessors on Ball that a ball may have no row for
+ONE_TO_ONE_ACCESSORS = (
+    "wicket",
+    "analytics",
+    "spatial_outcome",
+    "release_data",
+    "video",
+    "drs",
+    "packed_trajectory",
+)
+
+# Foreign keys the entry serializes, per referenced model
+REFERENCE_FIELDS = (
+    (Player, {
+        Ball: ("striker", "non_striker", "bowler"),
+        BallWicket: (
+            "dismissed_player",
+            "dismissed_by",
+            "caught_by",
+            "stumped_by",
+            "run_out_fielder_1",
+            "run_out_fielder_2",
+        ),
+        BallFielding: ("player", "fielder2"),
+    }),
+    (Team, {
+        Ball: ("batting_team", "bowling_team"),
+        BallDRS: ("review_team",),
+    }),
+    (Umpire, {
+        Ball: ("umpire_bowler_end", "umpire_square_leg"),
+        BallDRS: ("decision_given_by_umpire", "third_umpire"),
+    }),
+)
+
+
+def coerce_to_stored_values(instance):
+    """
+    Payload values as the database hands them back ("0.5" -> 0.5), so
+    the rendered entry matches a render from stored rows.
+    """
+    for field in instance._meta.concrete_fields:
+        if not field.is_relation:
+            setattr(
+                instance,
+                field.attname,
+                field.to_python(getattr(instance, field.attname)),
+            )
+
+
+def prime_references(*, instances, known):
+    """
+    Attach referenced objects to each row's foreign keys; `known` maps
+    a model to objects already loaded by id, the rest load in one query
+    per model.
+    """
+    for model, fields_by_model in REFERENCE_FIELDS:
+        references = [
+            (instance, field)
+            for instance in instances
+            for field in fields_by_model.get(type(instance), ())
+        ]
+        loaded = dict(known.get(model, {}))
+        missing = {
+            getattr(instance, f"{field}_id")
+            for instance, field in references
+        } - set(loaded) - {None}
+        if missing:
+            loaded.update(model.objects.in_bulk(missing))
+
+        for instance, field in references:
+            reference_id = getattr(instance, f"{field}_id")
+            if reference_id is not None:
+                setattr(instance, field, loaded[reference_id])
+
+
+def innings_teams_are_cached(innings):
+    return all(
+        Innings._meta.get_field(field).is_cached(innings)
+        for field in ("batting_team", "bowling_team")
+    )
+
+
+def build_ball_entry_projection(*, ball, innings_number, entry):
+    return BallEntryProjection(
+        ball=ball,
+        match_id=ball.match_id,
+        innings_id=ball.innings_id,
+        innings_number=innings_number,
+        ball_number=ball.ball_number,
+        entry=entry,
+    )
+
+
+def write_ball_entry_projections(
+    *,
+    innings,
+    balls,
+    child_records,
+    players=None,
+):
+    """
+    `balls` and `child_records` are the rows just inserted for
+    `innings`; `players` optionally maps id -> Player already loaded.
+    """
+    fieldings = {ball.id: [] for ball in balls}
+    trajectory_points = {ball.id: [] for ball in balls}
+    for record in child_records:
+        coerce_to_stored_values(record)
+        if isinstance(record, BallFielding):
+            fieldings[record.ball_id].append(record)
+        elif isinstance(record, BallTrajectory):
+            trajectory_points[record.ball_id].append(record)
+
+    for ball in balls:
+        coerce_to_stored_values(ball)
+        # Child rows were built with ball=, which caches them on the
+        # ball; anything still uncached has no row
+        for accessor in ONE_TO_ONE_ACCESSORS:
+            related = getattr(Ball, accessor).related
+            if not related.is_cached(ball):
+                related.set_cached_value(ball, None)
+
+    known = {Player: players or {}}
+    if innings_teams_are_cached(innings):
+        known[Team] = {
+            innings.batting_team_id: innings.batting_team,
+            innings.bowling_team_id: innings.bowling_team,
+        }
+    prime_references(instances=[*balls, *child_records], known=known)
+
+    return BallEntryProjection.objects.bulk_create(
+        build_ball_entry_projection(
+            ball=ball,
+            innings_number=innings.innings_number,
+            entry=build_ball_entry(
+                ball=ball,
+                innings_number=innings.innings_number,
+                fieldings=fieldings[ball.id],
+                trajectory_points=sorted(
+                    trajectory_points[ball.id],
+                    key=lambda point: point.sequence_index,
+                ),
+            ),
+        )
+        for ball in balls
+    )
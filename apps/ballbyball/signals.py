@@ -0,0 +1,99 @@
+"""
+SIGNALS: Read-Model Cache Invalidation
+
+RESPONSIBILITY:
+- Bump a match's read-model version when it is edited, its PlayingXI
+  or umpires change, or a player, umpire, team, competition or series
+  it shows is edited
+
+MUST NEVER DO:
+- Touch scoring data
+"""
+from django.db.models import Q
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from competitions.models import Competition, Series
+from coredata.models import Player, Team, Umpire
+from matches.models import Match, PlayingXI
+from ballbyball.selectors.innings import (
+    bump_match_version,
+    bump_match_versions,
+)
+
+
+@receiver(post_save, sender=PlayingXI)
+@receiver(post_delete, sender=PlayingXI)
+def playing_xi_changed(sender, instance, **kwargs):
+    bump_match_version(match_id=instance.match_id)
+
+
+@receiver(post_save, sender=Match)
+def match_changed(sender, instance, created, update_fields, **kwargs):
+    # Versions carry the match state themselves; state-only saves come
+    # on every innings transition
+    if created or (update_fields and set(update_fields) <= {"state"}):
+        return
+    bump_match_version(match_id=instance.pk)
+
+
+@receiver(m2m_changed, sender=Match.umpires.through)
+def match_umpires_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            bump_match_version(match_id=instance.pk)
+        return
+
+    # Changed from the umpire side: pk_set holds match ids, except on
+    # clear, where the matches must be read before the rows go.
+    if action in ("post_add", "post_remove"):
+        match_ids = pk_set
+    elif action == "pre_clear":
+        match_ids = sender.objects.filter(
+            umpire_id=instance.pk
+        ).values_list("match_id", flat=True)
+    else:
+        return
+    bump_match_versions(match_ids=match_ids)
+
+
+@receiver(post_save, sender=Player)
+def player_changed(sender, instance, created, **kwargs):
+    if created:
+        return
+    match_ids = PlayingXI.objects.filter(
+        player_id=instance.pk
+    ).values_list("match_id", flat=True).distinct()
+    bump_match_versions(match_ids=match_ids)
+
+
+@receiver(post_save, sender=Umpire)
+def umpire_changed(sender, instance, created, **kwargs):
+    if created:
+        return
+    match_ids = Match.umpires.through.objects.filter(
+        umpire_id=instance.pk
+    ).values_list("match_id", flat=True).distinct()
+    bump_match_versions(match_ids=match_ids)
+
+
+@receiver(post_save, sender=Team)
+def team_changed(sender, instance, created, **kwargs):
+    if created:
+        return
+    match_ids = Match.objects.filter(
+        Q(team1_id=instance.pk) | Q(team2_id=instance.pk)
+    ).values_list("id", flat=True)
+    bump_match_versions(match_ids=match_ids)
+
+
+@receiver(post_save, sender=Competition)
+@receiver(post_save, sender=Series)
+def match_title_source_changed(sender, instance, created, **kwargs):
+    # The session's match title shows the competition or series name
+    if created:
+        return
+    lookup = "competition_id" if sender is Competition else "series_id"
+    match_ids = Match.objects.filter(
+        **{lookup: instance.pk}
+    ).values_list("id", flat=True)
+    bump_match_versions(match_ids=match_ids)
@@ -0,0 +1,255 @@
+import json
+from urllib.parse import urlencode
+from asgiref.sync import async_to_sync, sync_to_async
+from asgiref.testing import ApplicationCommunicator
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
+from django.contrib.auth.models import AnonymousUser
+from django.db import transaction
+from django.test import TransactionTestCase
+from accounts.models import User
+from coredata.models import Nationality, Team
+from matches.models import Match, MatchType
+from ballbyball.models import MatchChange
+from ballbyball.routing import websocket_urlpatterns
+from ballbyball.services.broadcast_match_changes import match_changes_group
+from ballbyball.services.match_change_notifier import match_change_notifier
+from ballbyball.services.record_match_changes import record_match_changes
+from backend.asgi import application
+from ballbyball.tests.test_views import BallByBallViewsTestBase
+
+
+class MatchChangesBroadcastTest(BallByBallViewsTestBase):
+    def record(self, **kwargs):
+        return self.client.post(
+            "/api/ballbyball/record-single-ball-delivery/",
+            {"match_id": str(self.match.id), **self.delivery(**kwargs)},
+            format="json",
+        )
+
+    def test_committed_ball_is_pushed_once_without_reading_back(self):
+        channel_layer = get_channel_layer()
+        channel = async_to_sync(channel_layer.new_channel)()
+        async_to_sync(channel_layer.group_add)(
+            match_changes_group(self.match.id), channel
+        )
+        # The test transaction never commits, so this one is not pushed
+        self.record(completed_runs=1)
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertNumQueries(16):
+                self.record(completed_runs=4)
+
+        self.assertEqual(len(callbacks), 1)
+        event = async_to_sync(channel_layer.receive)(channel)
+        self.assertEqual(event["type"], "match.changes")
+        [change] = event["changes"]
+        self.assertEqual(change["kind"], "BALL")
+        self.assertEqual(change["score"]["runs"], 5)
+        self.assertEqual(change["entries"][0]["scoring"]["runs_off_bat"], 4)
+        self.assertIn("participants", change["entries"][0])
+
+    def test_rolled_back_mutation_is_not_pushed(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            res = self.client.post(
+                "/api/ballbyball/record-ball-delivery-batch/",
+                {
+                    "match_id": str(self.match.id),
+                    "deliveries": [
+                        self.delivery(completed_runs=1),
+                        self.delivery(bowler=str(self.striker.id)),
+                    ],
+                },
+                format="json",
+            )
+
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(callbacks, [])
+
+
+class MatchChangesConsumerTest(TransactionTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="bbb_ws", password="password")
+        nat = Nationality.objects.create(name="WSLand", code="WSL")
+        team1 = Team.objects.create(name="WS 1", team_type="LEAGUE", nationality=nat)
+        team2 = Team.objects.create(name="WS 2", team_type="LEAGUE", nationality=nat)
+        self.match = Match.objects.create(
+            match_type=MatchType.objects.create(name="T20", code="T20", max_overs=20),
+            team1=team1, team2=team2,
+            state="IN_PROGRESS", match_mode="ONLINE",
+            owner_type="USER", owner_id=self.user.id,
+        )
+        record_match_changes(
+            match_id=self.match.id,
+            changes=[
+                (MatchChange.Kind.DLS, {"innings": 1, "revised_target_runs": 150}),
+                (MatchChange.Kind.MATCH, {"state": "IN_PROGRESS"}),
+            ],
+        )
+
+    # channels.testing.WebsocketCommunicator imports daphne, which only
+    # the ASGI deployment installs; drive the ASGI messages directly
+    def communicator(self, query=None, user=None):
+        return ApplicationCommunicator(URLRouter(websocket_urlpatterns), {
+            "type": "websocket",
+            "path": f"/ws/ballbyball/matches/{self.match.id}/changes/",
+            "query_string": urlencode(query or {}).encode(),
+            "headers": [],
+            "subprotocols": [],
+            "user": user or self.user,
+        })
+
+    async def connect(self, communicator, timeout=3):
+        await communicator.send_input({"type": "websocket.connect"})
+        message = await communicator.receive_output(timeout)
+        return message["type"] == "websocket.accept", message.get("code")
+
+    async def receive_json(self, communicator, timeout=3):
+        message = await communicator.receive_output(timeout)
+        self.assertEqual(message["type"], "websocket.send")
+        return json.loads(message["text"])
+
+    async def disconnect(self, communicator, timeout=3):
+        await communicator.send_input({"type": "websocket.disconnect", "code": 1000})
+        await communicator.wait(timeout)
+
+    def test_catch_up_then_live_changes_trimmed_to_fields(self):
+        async def scenario():
+            communicator = self.communicator({"since": 1, "fields": "scoring"})
+            connected, _ = await self.connect(communicator)
+            self.assertTrue(connected)
+
+            missed = await self.receive_json(communicator)
+            self.assertEqual([c["seq"] for c in missed["changes"]], [2])
+
+            await get_channel_layer().group_send(
+                match_changes_group(self.match.id),
+                {
+                    "type": "match.changes",
+                    "changes": [{
+                        "seq": 3,
+                        "kind": "BALL",
+                        "entries": [{"id": "x", "scoring": {}, "wicket": None}],
+                    }],
+                },
+            )
+            live = await self.receive_json(communicator)
+            self.assertEqual(live["changes"][0]["entries"], [{"id": "x", "scoring": {}}])
+            await self.disconnect(communicator)
+
+        async_to_sync(scenario)()
+
+    def test_anonymous_viewer_is_rejected(self):
+        async def scenario():
+            communicator = self.communicator(user=AnonymousUser())
+            connected, code = await self.connect(communicator)
+            self.assertFalse(connected)
+            self.assertEqual(code, 4401)
+
+        async_to_sync(scenario)()
+
+
+class MatchChangesLongPollTest(TransactionTestCase):
+    url = "/api/ballbyball/wait-for-match-changes/"
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="bbb_poll", password="password")
+        nat = Nationality.objects.create(name="PollLand", code="PLL")
+        team1 = Team.objects.create(name="Poll 1", team_type="LEAGUE", nationality=nat)
+        team2 = Team.objects.create(name="Poll 2", team_type="LEAGUE", nationality=nat)
+        self.match = Match.objects.create(
+            match_type=MatchType.objects.create(name="T20", code="T20", max_overs=20),
+            team1=team1, team2=team2,
+            state="IN_PROGRESS", match_mode="ONLINE",
+            owner_type="USER", owner_id=self.user.id,
+        )
+        self.record_dls(150)
+        self.client.force_login(self.user)
+        self.cookie = self.client.cookies.output(header="", sep=";").strip()
+
+    def record_dls(self, target):
+        with transaction.atomic():
+            record_match_changes(
+                match_id=self.match.id,
+                changes=[(MatchChange.Kind.DLS, {"innings": 1, "revised_target_runs": target})],
+            )
+
+    async def start(self, query, cookie=True):
+        communicator = ApplicationCommunicator(application, {
+            "type": "http",
+            "method": "GET",
+            "path": self.url,
+            "query_string": urlencode(query).encode(),
+            "headers": [(b"cookie", self.cookie.encode())] if cookie else [],
+        })
+        await communicator.send_input({"type": "http.request", "body": b""})
+        return communicator
+
+    async def response(self, communicator, timeout=3):
+        start = await communicator.receive_output(timeout)
+        body = await communicator.receive_output(timeout)
+        await communicator.wait()
+        return start["status"], json.loads(body["body"])
+
+    def test_returns_at_once_when_changes_are_waiting(self):
+        async def scenario():
+            communicator = await self.start({"match_id": self.match.id, "since": 0})
+            return await self.response(communicator)
+
+        status, body = async_to_sync(scenario)()
+
+        self.assertEqual(status, 200)
+        self.assertEqual([c["seq"] for c in body["changes"]], [1])
+        self.assertEqual(body["last_seq"], 1)
+
+    def test_waiters_are_woken_by_the_next_commit(self):
+        async def scenario():
+            waiting = [
+                await self.start({"match_id": self.match.id, "since": 1})
+                for _ in range(3)
+            ]
+            # Nothing yet: every request is held open
+            for communicator in waiting:
+                self.assertTrue(await communicator.receive_nothing(0.2))
+            self.assertEqual(len(match_change_notifier.listeners), 1)
+
+            await sync_to_async(self.record_dls)(140)
+            return [await self.response(c) for c in waiting]
+
+        responses = async_to_sync(scenario)()
+
+        for status, body in responses:
+            self.assertEqual(status, 200)
+            self.assertEqual(
+                [(c["seq"], c["revised_target_runs"]) for c in body["changes"]],
+                [(2, 140)],
+            )
+        self.assertEqual(match_change_notifier.listeners, {})
+
+    def test_timeout_returns_no_changes(self):
+        async def scenario():
+            communicator = await self.start(
+                {"match_id": self.match.id, "since": 1, "timeout": 0.2}
+            )
+            return await self.response(communicator)
+
+        status, body = async_to_sync(scenario)()
+
+        self.assertEqual(status, 200)
+        self.assertEqual(body["changes"], [])
+        self.assertEqual(body["last_seq"], 1)
+
+    def test_rejects_anonymous_and_bad_parameters(self):
+        async def scenario():
+            results = []
+            for query, cookie in (
+                ({"match_id": self.match.id, "since": 0}, False),
+                ({"match_id": self.match.id}, True),
+                ({"match_id": self.match.id, "since": 0, "timeout": 600}, True),
+                ({"match_id": "not-a-uuid", "since": 0}, True),
+            ):
+                communicator = await self.start(query, cookie=cookie)
+                results.append((await self.response(communicator))[0])
+            return results
+
+        self.assertEqual(async_to_sync(scenario)(), [401, 400, 400, 404])
@@ -0,0 +1,733 @@
+"""
+Query-count and wall-time budgets for the ball-by-ball, scoring and
+offline-context endpoints, measured against a full T20 (240 balls) and a
+long Test innings (1000+ balls) with every per-ball child record.
+
+Each run writes a JSON report to $QUERY_BUDGET_REPORT (default: the
+system temp dir) so two runs can be diffed.
+"""
+import json
+import os
+import tempfile
+import time
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from competitions.models import Tournament, Competition
+from coredata.models import Nationality, Team, Player, Umpire
+from matches.models import Match, MatchType, Innings, PlayingXI, Toss
+from scoring.models import InningsAggregate
+from ballbyball.models import MatchChangeCursor
+from ballbyball.selectors.ball_entries import encode_cursor
+from ballbyball.serializers.ball_delivery_batch_input_payload import (
+    MAX_DELIVERIES_PER_BATCH,
+)
+from ballbyball.services.persist_ball_batch_and_derived_statistics import (
+    persist_ball_batch_and_derived_statistics,
+)
+
+REPORT = {}
+DEFAULT_MAX_SECONDS = 2.0
+
+
+def tearDownModule():
+    path = os.environ.get("QUERY_BUDGET_REPORT") or os.path.join(
+        tempfile.gettempdir(), "ballbyball_query_budgets.json"
+    )
+    with open(path, "w") as report:
+        json.dump(REPORT, report, indent=2, sort_keys=True)
+
+
+def synthetic_deliveries(
+    *,
+    count,
+    batters,
+    bowlers,
+    fielders,
+    umpires,
+    review_team,
+    balls_per_over,
+    runs_pattern,
+    wickets,
+    wide_every=None,
+):
+    """
+    Batch-service deliveries with rotating strike, a new bowler every
+    over and every child record populated.
+    """
+    striker, non_striker = batters[0], batters[1]
+    next_batter = 2
+    wicket_every = count // (wickets + 1)
+    legal_balls = 0
+    deliveries = []
+
+    for index in range(count):
+        bowler = bowlers[(legal_balls // balls_per_over) % len(bowlers)]
+        is_wide = bool(wide_every) and index % wide_every == wide_every - 1
+        is_wicket = (
+            not is_wide and
+            next_batter < len(batters) and
+            (index + 1) % wicket_every == 0
+        )
+        runs = 0 if is_wide or is_wicket else runs_pattern[index % len(runs_pattern)]
+        fielder = fielders[index % len(fielders)]
+
+        delivery = {
+            "striker_id": striker.id,
+            "non_striker_id": non_striker.id,
+            "bowler_id": bowler.id,
+            "completed_runs": runs,
+            "is_wide": is_wide,
+            "is_no_ball": False,
+            "is_bye": False,
+            "is_leg_bye": False,
+            "is_boundary": runs in (4, 6),
+            "umpire_bowler_end_id": umpires[0].id,
+            "umpire_square_leg_id": umpires[1].id,
+            "analytics": {
+                "deliveryType": "GOOD_LENGTH",
+                "footMovement": "FORWARD",
+                "stroke": "DRIVE",
+            },
+            "spatial": {
+                "wagonWheelX": (index % 100) / 100,
+                "wagonWheelY": (index % 50) / 50,
+                "pitchZone": "GOOD",
+            },
+            "release": {
+                "bowlerReleaseX": 0.4,
+                "bowlerReleaseY": 2.1,
+                "ballType": "PACE",
+            },
+            "video": {
+                "videoSourceId": "cam-1",
+                "videoStartMs": index * 30000,
+                "videoEndMs": index * 30000 + 8000,
+            },
+            "fielding": {
+                "fielders": [
+                    {"player": fielder.id, "action": "STOP", "runsSaved": 1},
+                ],
+            },
+            "drs": {
+                "isAppealed": index % 7 == 0,
+                "reviewTeam": review_team.id,
+                "onFieldDecision": "NOT_OUT",
+                "finalDecision": "NOT_OUT",
+                "decisionGivenByUmpire": umpires[0].id,
+            },
+            "trajectory": [
+                {"sequenceIndex": point, "x": point * 0.1, "y": 1.0, "z": 0.2, "timeMs": point * 40}
+                for point in range(8)
+            ],
+        }
+        if is_wicket:
+            delivery.update(
+                wicket_type="BOWLED",
+                dismissed_player_id=striker.id,
+            )
+        deliveries.append(delivery)
+
+        if is_wicket:
+            striker = batters[next_batter]
+            next_batter += 1
+        elif runs % 2:
+            striker, non_striker = non_striker, striker
+
+        if not is_wide:
+            legal_balls += 1
+            if legal_balls % balls_per_over == 0:
+                striker, non_striker = non_striker, striker
+
+    return deliveries
+
+
+class QueryBudgetFixtureMixin:
+    """
+    Subclasses build the match in setUpTestData and map every endpoint
+    name to its query budget. Budgets are the measured counts: lower them
+    when a change saves queries, never raise them to make a test pass.
+    """
+
+    fixture_name = None
+    match_type_kwargs = None
+    query_budgets = {}
+
+    @classmethod
+    def create_match(cls):
+        cls.user = User.objects.create_user(
+            username=f"budget_{cls.fixture_name}", password="password"
+        )
+        cls.nat = Nationality.objects.create(
+            name=f"Budget {cls.fixture_name}", code=cls.fixture_name[:3].upper()
+        )
+        cls.team1 = Team.objects.create(name="Budget 1", team_type="LEAGUE", nationality=cls.nat)
+        cls.team2 = Team.objects.create(name="Budget 2", team_type="LEAGUE", nationality=cls.nat)
+        tourney = Tournament.objects.create(
+            name="Budget T", tournament_type="LEAGUE", owner_type="USER", owner_id=cls.user.id
+        )
+        comp = Competition.objects.create(
+            name="Budget C", tournament=tourney, owner_type="USER", owner_id=cls.user.id
+        )
+        cls.mtype = MatchType.objects.create(**cls.match_type_kwargs)
+        cls.match = Match.objects.create(
+            competition=comp, match_type=cls.mtype,
+            team1=cls.team1, team2=cls.team2,
+            state="IN_PROGRESS", match_mode="ONLINE", is_public=True,
+            owner_type="USER", owner_id=cls.user.id,
+        )
+        Toss.objects.create(match=cls.match, won_by=cls.team1, decision="BAT")
+        cls.umpires = [
+            Umpire.objects.create(name=f"Budget Ump {i}", nationality=cls.nat)
+            for i in range(2)
+        ]
+        cls.match.umpires.add(*cls.umpires)
+
+        cls.squads = {}
+        for team in (cls.team1, cls.team2):
+            players = [
+                Player.objects.create(
+                    first_name=f"{team.name} P{i}", last_name="B",
+                    nationality=cls.nat, gender="MALE",
+                )
+                for i in range(11)
+            ]
+            PlayingXI.objects.bulk_create(
+                PlayingXI(match=cls.match, team=team, player=player, batting_position=i + 1)
+                for i, player in enumerate(players)
+            )
+            cls.squads[team.id] = players
+
+    @classmethod
+    def bowl_innings(cls, *, innings_number, batting_team, bowling_team, count, **kwargs):
+        innings = Innings.objects.create(
+            match=cls.match, innings_number=innings_number,
+            batting_team=batting_team, bowling_team=bowling_team,
+            state=Innings.State.ACTIVE,
+        )
+        InningsAggregate.objects.create(
+            innings=innings,
+            is_chasing=kwargs.pop("is_chasing", False),
+            target_runs=kwargs.pop("target_runs", None),
+        )
+        batters = cls.squads[batting_team.id]
+        fielders = cls.squads[bowling_team.id]
+        deliveries = synthetic_deliveries(
+            count=count,
+            batters=batters,
+            bowlers=fielders[-5:],
+            fielders=fielders,
+            umpires=cls.umpires,
+            review_team=bowling_team,
+            balls_per_over=cls.mtype.balls_per_over,
+            **kwargs,
+        )
+        for start in range(0, count, MAX_DELIVERIES_PER_BATCH):
+            persist_ball_batch_and_derived_statistics(
+                user=cls.user,
+                innings=innings,
+                deliveries=deliveries[start:start + MAX_DELIVERIES_PER_BATCH],
+            )
+        cls.last_change_seq = MatchChangeCursor.objects.get(match=cls.match).last_seq
+        return innings
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+        self.aggregate = InningsAggregate.objects.get(innings=self.innings)
+
+    def measure(
+        self, name, method, url, data=None, expected_status=200, headers=None
+    ):
+        budget_queries = self.query_budgets[name]
+        budget_seconds = DEFAULT_MAX_SECONDS
+        call = getattr(self.client, method)
+        kwargs = {"format": "json"} if method == "post" else {}
+        if headers:
+            kwargs["headers"] = headers
+
+        with CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            res = call(url, data or {}, **kwargs)
+            elapsed = time.perf_counter() - started
+
+        REPORT.setdefault(self.fixture_name, {})[name] = {
+            "status": res.status_code,
+            "queries": len(ctx.captured_queries),
+            "max_queries": budget_queries,
+            "seconds": round(elapsed, 4),
+            "max_seconds": budget_seconds,
+        }
+        self.assertEqual(res.status_code, expected_status, getattr(res, "data", None))
+        self.assertLessEqual(
+            len(ctx.captured_queries), budget_queries,
+            f"{name}: " + "\n".join(q["sql"] for q in ctx.captured_queries),
+        )
+        self.assertLessEqual(elapsed, budget_seconds, name)
+        return res
+
+    def delivery_payload(self, **kwargs):
+        payload = {
+            "striker": str(self.aggregate.current_striker_id),
+            "non_striker": str(self.aggregate.current_non_striker_id),
+            "bowler": str(self.squads[self.innings.bowling_team_id][0].id),
+            "completed_runs": 1,
+        }
+        payload.update(kwargs)
+        return payload
+
+    # ballbyball/urls.py
+
+    def test_verify_match_ready(self):
+        self.measure(
+            "verify-match-ready",
+            "post",
+            "/api/ballbyball/verify-match-is-ready-for-ball-by-ball-scoring/",
+            {"match_id": str(self.match.id)},
+        )
+
+    def test_initialise_session(self):
+        self.measure(
+            "initialise-session",
+            "post",
+            "/api/ballbyball/initialise-ball-by-ball-session/",
+            {"match_id": str(self.match.id)},
+        )
+
+    def test_session_state(self):
+        self.measure(
+            "session-state",
+            "get",
+            "/api/ballbyball/initialise-ball-by-ball-session/",
+            {"match_id": str(self.match.id)},
+        )
+
+    def test_session_state_not_modified(self):
+        url = "/api/ballbyball/initialise-ball-by-ball-session/"
+        etag = self.client.get(url, {"match_id": str(self.match.id)})["ETag"]
+        self.measure(
+            "session-state-not-modified",
+            "get",
+            url,
+            {"match_id": str(self.match.id)},
+            expected_status=304,
+            headers={"If-None-Match": etag},
+        )
+
+    def test_record_single_ball(self):
+        self.measure(
+            "record-single-ball",
+            "post",
+            "/api/ballbyball/record-single-ball-delivery/",
+            {"match_id": str(self.match.id), **self.delivery_payload()},
+        )
+
+    def test_record_ball_batch(self):
+        # Dot balls keep the strike, so one payload repeats
+        deliveries = [self.delivery_payload(completed_runs=0) for _ in range(6)]
+        self.measure(
+            "record-ball-batch",
+            "post",
+            "/api/ballbyball/record-ball-delivery-batch/",
+            {"match_id": str(self.match.id), "deliveries": deliveries},
+        )
+
+    def test_undo_last_ball(self):
+        self.measure(
+            "undo-last-ball",
+            "post",
+            "/api/ballbyball/undo-most-recent-ball-delivery/",
+            {"match_id": str(self.match.id)},
+        )
+
+    def test_undo_last_ball_full_rebuild(self):
+        self.measure(
+            "undo-last-ball-full-rebuild",
+            "post",
+            "/api/ballbyball/undo-most-recent-ball-delivery/",
+            {"match_id": str(self.match.id), "full_rebuild": True},
+        )
+
+    def test_end_active_innings(self):
+        self.measure(
+            "end-active-innings",
+            "post",
+            "/api/ballbyball/end-active-innings/",
+            {"match_id": str(self.match.id)},
+        )
+
+    def test_start_next_innings(self):
+        self.measure(
+            "start-next-innings",
+            "post",
+            "/api/ballbyball/start-next-innings/",
+            {"match_id": str(self.match.id)},
+            expected_status=self.start_next_innings_status,
+        )
+
+    def test_end_match(self):
+        self.measure(
+            "end-match",
+            "post",
+            "/api/ballbyball/end-match/",
+            {"match_id": str(self.match.id)},
+        )
+
+    def test_apply_dls(self):
+        self.measure(
+            "apply-dls",
+            "post",
+            "/api/ballbyball/apply-dls/",
+            {
+                "match_id": str(self.match.id),
+                "innings_id": self.innings.id,
+                "revised_target_runs": 150,
+            },
+        )
+
+    def test_apply_penalty(self):
+        self.measure(
+            "apply-penalty",
+            "post",
+            "/api/ballbyball/apply-penalty/",
+            {
+                "match_id": str(self.match.id),
+                "innings_id": self.innings.id,
+                "runs": 5,
+                "awarded_to": "BATTING",
+            },
+        )
+
+    def test_declare_innings(self):
+        self.measure(
+            "declare-innings",
+            "post",
+            "/api/ballbyball/declare-innings/",
+            {"match_id": str(self.match.id)},
+            expected_status=200 if self.mtype.is_test else 400,
+        )
+
+    def test_match_ball_entries(self):
+        res = self.measure(
+            "match-ball-entries",
+            "get",
+            "/api/ballbyball/match-ball-entries/",
+            {"match_id": str(self.match.id)},
+        )
+        self.assertEqual(res.data["entry_count"], 10)
+        self.assertIsNotNone(res.data["entries"][0]["fielding"]["fielder1"])
+
+    def test_match_ball_entries_not_modified(self):
+        url = "/api/ballbyball/match-ball-entries/"
+        etag = self.client.get(url, {"match_id": str(self.match.id)})["ETag"]
+        self.measure(
+            "match-ball-entries-not-modified",
+            "get",
+            url,
+            {"match_id": str(self.match.id)},
+            expected_status=304,
+            headers={"If-None-Match": etag},
+        )
+
+    def test_match_ball_entries_last_over(self):
+        res = self.measure(
+            "match-ball-entries-last-over",
+            "get",
+            "/api/ballbyball/match-ball-entries/",
+            {"match_id": str(self.match.id), "fields": "scoring", "limit": 6},
+        )
+        self.assertEqual(res.data["entry_count"], 6)
+
+    def test_match_ball_entries_oldest_page(self):
+        # Keyset paging costs the same at the start of the match as at
+        # the end
+        self.measure(
+            "match-ball-entries-oldest-page",
+            "get",
+            "/api/ballbyball/match-ball-entries/",
+            {
+                "match_id": str(self.match.id),
+                "limit": 120,
+                "before": encode_cursor(innings_number=1, ball_number=121),
+            },
+        )
+
+    def test_match_changes(self):
+        # A reconnecting client: everything since the last ball batch
+        res = self.measure(
+            "match-changes",
+            "get",
+            "/api/ballbyball/match-changes/",
+            {
+                "match_id": str(self.match.id),
+                "since": self.last_change_seq - 1,
+                "fields": "scoring",
+            },
+        )
+        self.assertEqual(res.data["last_seq"], self.last_change_seq)
+        change = res.data["changes"][0]
+        self.assertEqual(change["kind"], "BALL")
+        self.assertEqual(len(change["entries"]), len(change["ball_ids"]))
+
+    def test_public_scoreboard(self):
+        res = self.measure(
+            "public-scoreboard",
+            "get",
+            "/api/ballbyball/public-match-scoreboard/",
+            {"match_id": str(self.match.id)},
+        )
+        self.assertEqual(
+            res.data["current"]["innings_number"], self.innings.innings_number
+        )
+
+    def test_public_scoreboard_not_modified(self):
+        url = "/api/ballbyball/public-match-scoreboard/"
+        etag = self.client.get(url, {"match_id": str(self.match.id)})["ETag"]
+        self.measure(
+            "public-scoreboard-not-modified",
+            "get",
+            url,
+            {"match_id": str(self.match.id)},
+            expected_status=304,
+            headers={"If-None-Match": etag},
+        )
+
+    def test_public_scorecard(self):
+        res = self.measure(
+            "public-scorecard",
+            "get",
+            "/api/ballbyball/public-match-scorecard/",
+            {"match_id": str(self.match.id)},
+        )
+        self.assertTrue(res.data["innings"][-1]["batting"])
+
+    # scoring/urls.py
+
+    def test_scoring_start_session(self):
+        self.measure(
+            "scoring-start-session",
+            "post",
+            f"/api/scoring/matches/{self.match.id}/session/",
+        )
+
+    def test_scoring_setup_innings(self):
+        innings = Innings.objects.create(
+            match=self.match, innings_number=self.innings.innings_number + 1,
+            batting_team=self.innings.bowling_team,
+            bowling_team=self.innings.batting_team,
+            state=Innings.State.OPEN,
+        )
+        batters = self.squads[innings.batting_team_id]
+        self.measure(
+            "scoring-setup-innings",
+            "post",
+            f"/api/scoring/innings/{innings.id}/setup/",
+            {
+                "striker": str(batters[0].id),
+                "non_striker": str(batters[1].id),
+                "bowler": str(self.squads[innings.bowling_team_id][0].id),
+            },
+        )
+
+    def test_scoring_submit_ball(self):
+        self.measure(
+            "scoring-submit-ball",
+            "post",
+            "/api/scoring/balls/submit/",
+            {
+                "innings": self.innings.id,
+                "ball_number": self.aggregate.last_ball.ball_number + 1,
+                "over_number": self.aggregate.completed_overs + 1,
+                "ball_in_over": 1,
+                "striker": str(self.aggregate.current_striker_id),
+                "non_striker": str(self.aggregate.current_non_striker_id),
+                "bowler": str(self.aggregate.current_bowler_id),
+                "runs": {"runs_off_bat": 1},
+            },
+            expected_status=201,
+        )
+
+    def test_scoring_end_innings(self):
+        self.measure(
+            "scoring-end-innings",
+            "post",
+            f"/api/scoring/innings/{self.innings.id}/end/",
+        )
+
+    def test_scoring_next_innings(self):
+        self.innings.state = Innings.State.COMPLETED
+        self.innings.save(update_fields=["state"])
+        self.measure(
+            "scoring-next-innings",
+            "post",
+            f"/api/scoring/matches/{self.match.id}/next-innings/",
+            expected_status=self.scoring_next_innings_status,
+        )
+
+    def test_scoring_end_match(self):
+        self.measure(
+            "scoring-end-match",
+            "post",
+            f"/api/scoring/matches/{self.match.id}/end/",
+        )
+
+    def test_scoring_apply_dls(self):
+        self.measure(
+            "scoring-apply-dls",
+            "post",
+            f"/api/scoring/innings/{self.innings.id}/dls/",
+            {"revised_target": 150, "revised_overs": 40},
+        )
+
+    # sync/urls.py
+
+    def test_offline_match_context(self):
+        self.measure(
+            "offline-match-context",
+            "get",
+            f"/api/sync/matches/{self.match.id}/context/",
+        )
+
+    def test_offline_bulk_sync(self):
+        aggregate = self.aggregate
+        bowlers = self.squads[self.innings.bowling_team_id]
+        striker, non_striker = aggregate.current_striker_id, aggregate.current_non_striker_id
+        bowler = aggregate.current_bowler_id or bowlers[0].id
+        balls = []
+        for index in range(6):
+            legal_balls = aggregate.legal_balls + index
+            balls.append({
+                "innings": str(self.innings.id),
+                "ball_number": aggregate.last_ball.ball_number + index + 1,
+                "over_number": legal_balls // 6 + 1,
+                "ball_in_over": legal_balls % 6 + 1,
+                "striker": str(striker),
+                "non_striker": str(non_striker),
+                "bowler": str(bowler),
+                "runs": {"runs_off_bat": 0},
+                "analytics": {"stroke": "DEFENCE"},
+            })
+            if legal_balls % 6 == 5:
+                striker, non_striker = non_striker, striker
+                bowler = bowlers[1].id if bowler == bowlers[0].id else bowlers[0].id
+        res = self.measure(
+            "offline-bulk-sync",
+            "post",
+            "/api/sync/commit/",
+            {"match_id": str(self.match.id), "balls": balls},
+        )
+        self.assertEqual(res.data["processed_balls"], 6)
+
+
+class T20QueryBudgetTest(QueryBudgetFixtureMixin, APITestCase):
+    fixture_name = "t20"
+    match_type_kwargs = {
+        "name": "T20", "code": "T20", "balls_per_over": 6, "max_overs": 20,
+    }
+    start_next_innings_status = 409
+    scoring_next_innings_status = 400
+    query_budgets = {
+        "apply-dls": 9,
+        "apply-penalty": 11,
+        "declare-innings": 5,
+        "end-active-innings": 11,
+        "end-match": 8,
+        "initialise-session": 10,
+        "match-ball-entries": 3,
+        "match-ball-entries-last-over": 3,
+        "match-ball-entries-not-modified": 1,
+        "match-ball-entries-oldest-page": 3,
+        "match-changes": 3,
+        "offline-bulk-sync": 22,
+        "offline-match-context": 5,
+        "public-scoreboard": 4,
+        "public-scoreboard-not-modified": 2,
+        "public-scorecard": 4,
+        "record-ball-batch": 31,
+        "record-single-ball": 23,
+        "scoring-apply-dls": 3,
+        "scoring-end-innings": 4,
+        "scoring-end-match": 2,
+        "scoring-next-innings": 7,
+        "scoring-setup-innings": 15,
+        "scoring-start-session": 7,
+        "scoring-submit-ball": 30,
+        "session-state": 10,
+        "session-state-not-modified": 2,
+        "start-next-innings": 12,
+        "undo-last-ball": 37,
+        "undo-last-ball-full-rebuild": 40,
+        "verify-match-ready": 9,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_match()
+        first = cls.bowl_innings(
+            innings_number=1, batting_team=cls.team1, bowling_team=cls.team2,
+            count=120, runs_pattern=(1, 4, 0, 2, 6, 1), wickets=6,
+        )
+        first.state = Innings.State.COMPLETED
+        first.save(update_fields=["state"])
+        # 114 legal balls and 6 wides: one over left in the chase
+        cls.innings = cls.bowl_innings(
+            innings_number=2, batting_team=cls.team2, bowling_team=cls.team1,
+            count=120, runs_pattern=(0, 1, 0, 2, 0, 0), wickets=4,
+            wide_every=20, is_chasing=True,
+            target_runs=InningsAggregate.objects.get(innings=first).runs + 1,
+        )
+
+
+class TestInningsQueryBudgetTest(QueryBudgetFixtureMixin, APITestCase):
+    fixture_name = "test"
+    match_type_kwargs = {
+        "name": "Test", "code": "TEST", "balls_per_over": 6, "max_innings": 4,
+    }
+    start_next_innings_status = 200
+    scoring_next_innings_status = 201
+    query_budgets = {
+        "apply-dls": 9,
+        "apply-penalty": 11,
+        "declare-innings": 9,
+        "end-active-innings": 10,
+        "end-match": 8,
+        "initialise-session": 10,
+        "match-ball-entries": 3,
+        "match-ball-entries-last-over": 3,
+        "match-ball-entries-not-modified": 1,
+        "match-ball-entries-oldest-page": 3,
+        "match-changes": 3,
+        "offline-bulk-sync": 23,
+        "offline-match-context": 5,
+        "public-scoreboard": 4,
+        "public-scoreboard-not-modified": 2,
+        "public-scorecard": 4,
+        "record-ball-batch": 25,
+        "record-single-ball": 23,
+        "scoring-apply-dls": 3,
+        "scoring-end-innings": 4,
+        "scoring-end-match": 2,
+        "scoring-next-innings": 12,
+        "scoring-setup-innings": 15,
+        "scoring-start-session": 7,
+        "scoring-submit-ball": 30,
+        "session-state": 10,
+        "session-state-not-modified": 2,
+        "start-next-innings": 33,
+        "undo-last-ball": 37,
+        "undo-last-ball-full-rebuild": 41,
+        "verify-match-ready": 9,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_match()
+        cls.innings = cls.bowl_innings(
+            innings_number=1, batting_team=cls.team1, bowling_team=cls.team2,
+            count=1020, runs_pattern=(0, 1, 0, 4, 0, 2, 0, 0, 1, 0), wickets=9,
+            wide_every=50,
+        )
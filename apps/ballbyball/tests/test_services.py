@@ -0,0 +1,769 @@
+import json
+import random
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from accounts.models import User
+from competitions.models import Tournament, Competition
+from coredata.models import Nationality, Team, Player, Umpire
+from matches.models import Match, MatchType, Innings
+from scoring.models import (
+    Ball,
+    InningsAggregate,
+    BatterStats,
+    BowlerStats,
+    InningsOverCheckpoint,
+)
+from ballbyball.services.persist_ball_and_derived_statistics import (
+    persist_ball_and_derived_statistics,
+)
+from ballbyball.services.rebuild_entire_innings_from_ball_history import (
+    rebuild_entire_innings_from_ball_history,
+)
+from ballbyball.services.undo_last_recorded_ball import (
+    undo_last_recorded_ball,
+)
+from ballbyball.services.innings_state_engine import (
+    fold_balls_into_innings_state,
+    pack_innings_state,
+    unpack_innings_state,
+)
+from ballbyball.services.innings_over_checkpoints import (
+    load_innings_state_as_of_ball,
+)
+from ballbyball.services.rebuild_entire_innings_from_ball_history import (
+    load_innings_ball_history,
+)
+from ballbyball.services.persist_ball_batch_and_derived_statistics import (
+    persist_ball_batch_and_derived_statistics,
+)
+from ballbyball.exceptions import InvalidBallBatch
+from ballbyball.services.determine_post_ball_outcome import (
+    determine_post_ball_outcome,
+)
+from ballbyball.services.generate_synthetic_innings import (
+    generate_synthetic_innings,
+)
+from ballbyball.models import BallEntryProjection, MatchChangeCursor
+from ballbyball.selectors.ball_entries import ball_entry_queryset
+from ballbyball.services.build_ball_entry import (
+    SECTION_BUILDERS,
+    build_ball_entry,
+)
+
+
+def snapshot_derived_state(innings):
+    aggregate = InningsAggregate.objects.get(innings=innings)
+    return {
+        "aggregate": {
+            "runs": aggregate.runs,
+            "wickets": aggregate.wickets,
+            "legal_balls": aggregate.legal_balls,
+            "completed_overs": aggregate.completed_overs,
+            "extras": aggregate.extras,
+            "current_striker": aggregate.current_striker_id,
+            "current_non_striker": aggregate.current_non_striker_id,
+            "current_bowler": aggregate.current_bowler_id,
+            "last_ball": aggregate.last_ball_id,
+            "target_achieved": aggregate.target_achieved,
+        },
+        "batters": sorted(
+            BatterStats.objects.filter(innings=innings).values_list(
+                "player_id", "runs", "balls", "fours", "sixes",
+                "is_out", "dismissal_ball_id",
+            ),
+            key=str,
+        ),
+        "bowlers": sorted(
+            BowlerStats.objects.filter(innings=innings).values_list(
+                "player_id", "runs_conceded", "balls", "wickets",
+                "wides", "no_balls",
+            ),
+            key=str,
+        ),
+    }
+
+
+class BallByBallServicesTestBase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="bbb_scorer", password="password")
+        self.nat = Nationality.objects.create(name="BBBLand", code="BBL")
+        self.team1 = Team.objects.create(name="BBB 1", team_type="LEAGUE", nationality=self.nat)
+        self.team2 = Team.objects.create(name="BBB 2", team_type="LEAGUE", nationality=self.nat)
+        self.tourney = Tournament.objects.create(name="BBB T", tournament_type="LEAGUE")
+        self.comp = Competition.objects.create(name="BBB C", tournament=self.tourney)
+        self.mtype = MatchType.objects.create(name="T20", code="T20", balls_per_over=6, max_overs=20)
+        self.match = Match.objects.create(
+            competition=self.comp, match_type=self.mtype,
+            team1=self.team1, team2=self.team2,
+            state="IN_PROGRESS", match_mode="ONLINE",
+        )
+        self.innings = Innings.objects.create(
+            match=self.match, innings_number=1,
+            batting_team=self.team1, bowling_team=self.team2,
+            state=Innings.State.ACTIVE,
+        )
+        InningsAggregate.objects.create(innings=self.innings)
+
+        self.batters = [
+            Player.objects.create(first_name=f"Bat{i}", last_name="B", nationality=self.nat, gender="MALE")
+            for i in range(4)
+        ]
+        self.bowler1 = Player.objects.create(first_name="Bowl1", last_name="B", nationality=self.nat, gender="MALE")
+        self.bowler2 = Player.objects.create(first_name="Bowl2", last_name="B", nationality=self.nat, gender="MALE")
+
+    def bowl(self, striker, non_striker, bowler, **kwargs):
+        params = {
+            "completed_runs": 0,
+            "is_wide": False,
+            "is_no_ball": False,
+            "is_bye": False,
+            "is_leg_bye": False,
+        }
+        params.update(kwargs)
+        return persist_ball_and_derived_statistics(
+            user=self.user,
+            innings=self.innings,
+            striker=striker,
+            non_striker=non_striker,
+            bowler=bowler,
+            **params,
+        )
+
+    def bowl_sample_overs(self):
+        a, b, c, _ = self.batters
+        self.bowl(a, b, self.bowler1, completed_runs=4, is_boundary=True)
+        self.bowl(a, b, self.bowler1, completed_runs=1)
+        self.bowl(b, a, self.bowler1, is_wide=True, completed_runs=1)
+        self.bowl(b, a, self.bowler1, is_no_ball=True, completed_runs=6)
+        self.bowl(b, a, self.bowler1, is_leg_bye=True, completed_runs=2)
+        self.bowl(
+            b, a, self.bowler1,
+            wicket_type="BOWLED", dismissed_player_id=b.id,
+        )
+        self.bowl(c, a, self.bowler1, completed_runs=2)
+        self.bowl(c, a, self.bowler1, completed_runs=3)
+        self.bowl(c, a, self.bowler2, is_bye=True, completed_runs=1)
+        self.bowl(
+            a, c, self.bowler2,
+            wicket_type="RUN_OUT", dismissed_player_id=c.id,
+            completed_runs=1,
+        )
+
+
+class IncrementalUndoTest(BallByBallServicesTestBase):
+    def test_incremental_undo_matches_full_rebuild(self):
+        self.bowl_sample_overs()
+
+        while Ball.objects.filter(innings=self.innings).exists():
+            undo_last_recorded_ball(innings=self.innings)
+            incremental = snapshot_derived_state(self.innings)
+
+            rebuild_entire_innings_from_ball_history(innings=self.innings)
+            self.assertEqual(incremental, snapshot_derived_state(self.innings))
+
+        aggregate = InningsAggregate.objects.get(innings=self.innings)
+        self.assertEqual(aggregate.runs, 0)
+        self.assertIsNone(aggregate.last_ball)
+
+    def test_incremental_undo_restores_participants_from_previous_ball(self):
+        a, b, c, _ = self.batters
+        self.bowl(a, b, self.bowler1, completed_runs=1)
+        self.bowl(b, a, self.bowler1, wicket_type="CAUGHT", dismissed_player_id=b.id)
+        self.bowl(c, a, self.bowler1, completed_runs=4)
+
+        undo_last_recorded_ball(innings=self.innings)
+
+        aggregate = InningsAggregate.objects.get(innings=self.innings)
+        self.assertIsNone(aggregate.current_striker_id)
+        self.assertEqual(aggregate.current_non_striker_id, a.id)
+        self.assertEqual(aggregate.current_bowler_id, self.bowler1.id)
+        self.assertEqual(aggregate.runs, 1)
+        self.assertEqual(aggregate.wickets, 1)
+
+    def test_incremental_undo_keeps_penalty_runs(self):
+        a, b, _, _ = self.batters
+        InningsAggregate.objects.filter(innings=self.innings).update(
+            runs=5, extras=5, extra_penalty_runs=5,
+        )
+        self.bowl(a, b, self.bowler1, completed_runs=2)
+
+        undo_last_recorded_ball(innings=self.innings)
+
+        aggregate = InningsAggregate.objects.get(innings=self.innings)
+        self.assertEqual(aggregate.runs, 5)
+        self.assertEqual(aggregate.extras, 5)
+
+    def test_out_of_sync_aggregate_falls_back_to_full_rebuild(self):
+        a, b, _, _ = self.batters
+        self.bowl(a, b, self.bowler1, completed_runs=1)
+        self.bowl(b, a, self.bowler1, completed_runs=2)
+        InningsAggregate.objects.filter(innings=self.innings).update(runs=0)
+
+        undo_last_recorded_ball(innings=self.innings)
+
+        aggregate = InningsAggregate.objects.get(innings=self.innings)
+        self.assertEqual(aggregate.runs, 1)
+        self.assertEqual(aggregate.legal_balls, 1)
+
+
+    def test_balls_folded_by_the_scoring_engine_are_undone_by_rebuild(self):
+        from scoring.engine.rebuild_engine import rebuild_innings_state
+        self.bowl_sample_overs()
+        # Byes, run-outs and no-balls count differently under its rules
+        rebuild_innings_state(self.innings)
+
+        undo_last_recorded_ball(innings=self.innings)
+        undone = snapshot_derived_state(self.innings)
+
+        rebuild_entire_innings_from_ball_history(innings=self.innings)
+        self.assertEqual(undone, snapshot_derived_state(self.innings))
+
+
+class InMemoryRebuildTest(BallByBallServicesTestBase):
+    def count_rebuild_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            rebuild_entire_innings_from_ball_history(innings=self.innings)
+        return len(ctx.captured_queries)
+
+    def test_rebuild_is_idempotent(self):
+        self.bowl_sample_overs()
+        recorded = snapshot_derived_state(self.innings)
+
+        rebuild_entire_innings_from_ball_history(innings=self.innings)
+        self.assertEqual(recorded, snapshot_derived_state(self.innings))
+
+    def test_rebuild_query_count_does_not_grow_with_innings(self):
+        self.bowl_sample_overs()
+        short_innings = self.count_rebuild_queries()
+
+        for _ in range(3):
+            self.bowl_sample_overs()
+        self.assertEqual(short_innings, self.count_rebuild_queries())
+
+    def test_rebuild_resets_stats_of_players_without_balls(self):
+        a, b, _, _ = self.batters
+        self.bowl(a, b, self.bowler2, completed_runs=4)
+        Ball.objects.filter(innings=self.innings).delete()
+
+        rebuild_entire_innings_from_ball_history(innings=self.innings)
+
+        self.assertEqual(
+            BatterStats.objects.get(innings=self.innings, player=a).runs, 0
+        )
+        self.assertEqual(
+            BowlerStats.objects.get(innings=self.innings, player=self.bowler2).runs_conceded,
+            0,
+        )
+
+
+class OverCheckpointTest(BallByBallServicesTestBase):
+    def state_from_scratch(self, ball_number):
+        return fold_balls_into_innings_state(
+            balls=load_innings_ball_history(innings=self.innings).filter(
+                ball_number__lte=ball_number
+            ),
+            balls_per_over=6,
+        )
+
+    def test_checkpoint_recorded_when_over_completes(self):
+        self.bowl_sample_overs()
+
+        checkpoint = InningsOverCheckpoint.objects.get(innings=self.innings)
+        self.assertEqual(checkpoint.over_number, 1)
+        # Two extras in the first over push its last legal ball to ball 8
+        self.assertEqual(checkpoint.ball_number, 8)
+        self.assertEqual(
+            unpack_innings_state(checkpoint.state),
+            self.state_from_scratch(8),
+        )
+
+    def test_pack_round_trip(self):
+        self.bowl_sample_overs()
+        state = self.state_from_scratch(10)
+
+        self.assertEqual(unpack_innings_state(pack_innings_state(state)), state)
+
+    def test_state_as_of_any_ball_matches_replay_from_scratch(self):
+        for _ in range(3):
+            self.bowl_sample_overs()
+        self.assertEqual(
+            InningsOverCheckpoint.objects.filter(innings=self.innings).count(),
+            4,
+        )
+
+        for ball_number in range(1, 31):
+            self.assertEqual(
+                load_innings_state_as_of_ball(
+                    innings=self.innings, ball_number=ball_number
+                ),
+                self.state_from_scratch(ball_number),
+            )
+
+    def test_undo_of_over_ending_ball_drops_checkpoint(self):
+        a, b, _, _ = self.batters
+        for _ in range(6):
+            self.bowl(a, b, self.bowler1, completed_runs=2)
+        self.assertTrue(
+            InningsOverCheckpoint.objects.filter(innings=self.innings).exists()
+        )
+
+        undo_last_recorded_ball(innings=self.innings)
+
+        self.assertFalse(
+            InningsOverCheckpoint.objects.filter(innings=self.innings).exists()
+        )
+
+    def test_out_of_sync_undo_rebuilds_from_checkpoint(self):
+        for _ in range(2):
+            self.bowl_sample_overs()
+        undo_last_recorded_ball(innings=self.innings)
+        expected = snapshot_derived_state(self.innings)
+
+        self.bowl(*self.batters[:2], self.bowler2, completed_runs=1)
+        InningsAggregate.objects.filter(innings=self.innings).update(runs=0)
+        undo_last_recorded_ball(innings=self.innings)
+
+        self.assertEqual(expected, snapshot_derived_state(self.innings))
+
+    def test_full_rebuild_regenerates_checkpoints(self):
+        for _ in range(2):
+            self.bowl_sample_overs()
+        recorded = list(
+            InningsOverCheckpoint.objects.filter(innings=self.innings)
+            .order_by("over_number")
+            .values_list("over_number", "ball_id", "state")
+        )
+        InningsOverCheckpoint.objects.filter(innings=self.innings).delete()
+
+        rebuild_entire_innings_from_ball_history(innings=self.innings)
+
+        self.assertEqual(
+            recorded,
+            list(
+                InningsOverCheckpoint.objects.filter(innings=self.innings)
+                .order_by("over_number")
+                .values_list("over_number", "ball_id", "state")
+            ),
+        )
+
+
+class BallBatchPersistenceTest(BallByBallServicesTestBase):
+    def delivery(self, striker, non_striker, bowler, **kwargs):
+        delivery = {
+            "striker_id": striker.id,
+            "non_striker_id": non_striker.id,
+            "bowler_id": bowler.id,
+            "completed_runs": 0,
+            "is_wide": False,
+            "is_no_ball": False,
+            "is_bye": False,
+            "is_leg_bye": False,
+        }
+        delivery.update(kwargs)
+        return delivery
+
+    def sample_deliveries(self):
+        a, b, c, _ = self.batters
+        return [
+            self.delivery(
+                a, b, self.bowler1, completed_runs=4, is_boundary=True,
+                trajectory=[
+                    {"sequenceIndex": i, "x": 0, "y": 0, "z": 0, "timeMs": i}
+                    for i in range(3)
+                ],
+            ),
+            self.delivery(a, b, self.bowler1, completed_runs=1),
+            self.delivery(b, a, self.bowler1, is_wide=True, completed_runs=1),
+            self.delivery(b, a, self.bowler1, is_no_ball=True, completed_runs=6),
+            self.delivery(b, a, self.bowler1, is_leg_bye=True, completed_runs=2),
+            self.delivery(
+                b, a, self.bowler1,
+                wicket_type="BOWLED", dismissed_player_id=b.id,
+            ),
+            self.delivery(c, a, self.bowler1, completed_runs=2),
+            self.delivery(c, a, self.bowler1, completed_runs=3),
+            self.delivery(c, a, self.bowler2, is_bye=True, completed_runs=1),
+            self.delivery(
+                a, c, self.bowler2,
+                wicket_type="RUN_OUT", dismissed_player_id=c.id,
+                completed_runs=1,
+            ),
+        ]
+
+    def persist_batch(self, deliveries):
+        return persist_ball_batch_and_derived_statistics(
+            user=self.user,
+            innings=self.innings,
+            deliveries=deliveries,
+        )
+
+    def test_batch_matches_single_ball_path(self):
+        self.bowl_sample_overs()
+        single = snapshot_derived_state(self.innings)
+        single_checkpoints = list(
+            InningsOverCheckpoint.objects.values_list("over_number", "ball_number")
+        )
+        Ball.objects.filter(innings=self.innings).delete()
+        rebuild_entire_innings_from_ball_history(innings=self.innings)
+
+        balls = self.persist_batch(self.sample_deliveries())
+
+        batch = snapshot_derived_state(self.innings)
+        # Ball ids differ between the two runs
+        for snapshot in (single, batch):
+            snapshot["aggregate"].pop("last_ball")
+            snapshot["batters"] = [row[:-1] for row in snapshot["batters"]]
+        self.assertEqual(single, batch)
+        self.assertEqual(
+            list(Ball.objects.filter(innings=self.innings).values_list(
+                "ball_number", flat=True
+            )),
+            list(range(1, 11)),
+        )
+        self.assertEqual(balls[0].trajectory_points.count(), 3)
+        self.assertTrue(hasattr(balls[5], "wicket"))
+        self.assertEqual(
+            single_checkpoints,
+            list(InningsOverCheckpoint.objects.values_list(
+                "over_number", "ball_number"
+            )),
+        )
+
+    def test_batch_query_count_does_not_grow_with_batch_size(self):
+        a, b, _, _ = self.batters
+        # Created by the match's first change, so neither batch pays for it
+        MatchChangeCursor.objects.create(match=self.match)
+        with CaptureQueriesContext(connection) as short_batch:
+            self.persist_batch(
+                [self.delivery(a, b, self.bowler1, completed_runs=2)]
+            )
+        # Stays within the first over so neither batch writes a checkpoint
+        with CaptureQueriesContext(connection) as long_batch:
+            self.persist_batch(
+                [self.delivery(a, b, self.bowler1, completed_runs=2)] * 4
+            )
+        self.assertEqual(
+            len(short_batch.captured_queries),
+            len(long_batch.captured_queries),
+        )
+
+    def test_batch_is_rejected_as_a_whole(self):
+        a, b, _, _ = self.batters
+        deliveries = [
+            self.delivery(a, b, self.bowler1, completed_runs=1),
+            self.delivery(a, a, self.bowler1),
+        ]
+
+        with self.assertRaises(InvalidBallBatch) as ctx:
+            self.persist_batch(deliveries)
+
+        self.assertEqual(ctx.exception.index, 1)
+        self.assertFalse(Ball.objects.filter(innings=self.innings).exists())
+
+    def test_batch_checks_expected_ball_number(self):
+        a, b, _, _ = self.batters
+        self.bowl(a, b, self.bowler1, completed_runs=1)
+
+        with self.assertRaises(InvalidBallBatch):
+            self.persist_batch(
+                [self.delivery(b, a, self.bowler1, ball_number=1)]
+            )
+        self.persist_batch([self.delivery(b, a, self.bowler1, ball_number=2)])
+
+        self.assertEqual(Ball.objects.filter(innings=self.innings).count(), 2)
+
+    def test_batch_stops_at_innings_end(self):
+        a, b, _, _ = self.batters
+        self.mtype.max_overs = 1
+        self.mtype.save()
+
+        with self.assertRaises(InvalidBallBatch) as ctx:
+            self.persist_batch(
+                [self.delivery(a, b, self.bowler1)] * 7
+            )
+        self.assertEqual(ctx.exception.index, 6)
+
+
+class ChildRecordBulkInsertTest(BallByBallServicesTestBase):
+    def bowl_tracked(self, points):
+        a, b, _, _ = self.batters
+        with CaptureQueriesContext(connection) as ctx:
+            ball = self.bowl(
+                a, b, self.bowler1,
+                completed_runs=1,
+                trajectory=[
+                    {"sequenceIndex": i, "x": 0.5, "y": 1.0, "z": 0.1, "timeMs": i * 10}
+                    for i in range(points)
+                ],
+                fielding={"fielders": [{"player": self.bowler2.id}] * 2},
+            )
+        return ball, len(ctx.captured_queries)
+
+    def test_child_rows_cost_one_insert_per_table(self):
+        # Creates the stats rows so both measured balls take the same path
+        self.bowl(*self.batters[:2], self.bowler1)
+        _, short_track = self.bowl_tracked(3)
+        ball, long_track = self.bowl_tracked(60)
+
+        self.assertEqual(short_track, long_track)
+        self.assertEqual(ball.trajectory_points.count(), 60)
+        self.assertEqual(
+            list(ball.trajectory_points.order_by("sequence_index").values_list(
+                "sequence_index", flat=True
+            )),
+            list(range(60)),
+        )
+        self.assertEqual(ball.fieldings.count(), 2)
+
+
+class BallEntryProjectionTest(BallByBallServicesTestBase):
+    def setUp(self):
+        super().setUp()
+        self.umpire = Umpire.objects.create(name="Ump", nationality=self.nat)
+
+    def full_delivery(self):
+        a, b, _, _ = self.batters
+        return {
+            "completed_runs": 0,
+            "is_wide": False,
+            "is_no_ball": False,
+            "is_bye": False,
+            "is_leg_bye": False,
+            "umpire_bowler_end_id": self.umpire.id,
+            "wicket_type": "CAUGHT",
+            "dismissed_player_id": a.id,
+            "dismissed_by_id": self.bowler1.id,
+            "caught_by_id": self.bowler2.id,
+            "analytics": {"deliveryType": "YORKER"},
+            # Strings, as loosely typed clients send them
+            "spatial": {"wagonWheelX": "0.25", "pitchZone": "FULL"},
+            "release": {"bowlerReleaseX": 0.1, "ballType": "NEW"},
+            "video": {"videoSourceId": "cam", "videoStartMs": 5, "videoEndMs": 9},
+            "fielding": {"fielders": [{"player": self.bowler2.id}]},
+            "drs": {
+                "isAppealed": True,
+                "reviewTeam": self.team1.id,
+                "decisionGivenByUmpire": self.umpire.id,
+            },
+            "trajectory": [
+                {"sequenceIndex": i, "x": 0.5, "y": 1, "z": 0, "timeMs": i}
+                for i in (2, 0, 1)
+            ],
+        }
+
+    def live_entry(self, ball):
+        ball = ball_entry_queryset(fields=SECTION_BUILDERS).get(id=ball.id)
+        entry = build_ball_entry(ball=ball, innings_number=ball.innings_number)
+        return json.loads(json.dumps(entry))
+
+    def test_single_ball_projection_matches_live_render(self):
+        a, b, _, _ = self.batters
+        ball = self.bowl(a, b, self.bowler1, **self.full_delivery())
+
+        projection = BallEntryProjection.objects.get(ball=ball)
+
+        self.assertEqual(projection.entry, self.live_entry(ball))
+        self.assertEqual(projection.entry["spatial"]["wagon_wheel_x"], 0.25)
+        self.assertEqual(projection.innings_number, 1)
+
+    def test_batch_projections_match_live_render(self):
+        a, b, _, _ = self.batters
+        balls = persist_ball_batch_and_derived_statistics(
+            user=self.user,
+            innings=self.innings,
+            deliveries=[
+                {
+                    "striker_id": a.id,
+                    "non_striker_id": b.id,
+                    "bowler_id": self.bowler1.id,
+                    "completed_runs": 1,
+                    "is_wide": False,
+                    "is_no_ball": False,
+                    "is_bye": False,
+                    "is_leg_bye": False,
+                },
+                {
+                    **self.full_delivery(),
+                    "striker_id": b.id,
+                    "non_striker_id": a.id,
+                    "bowler_id": self.bowler1.id,
+                    "dismissed_player_id": b.id,
+                },
+            ],
+        )
+
+        for ball in balls:
+            self.assertEqual(
+                BallEntryProjection.objects.get(ball=ball).entry,
+                self.live_entry(ball),
+            )
+
+    def test_packed_trajectory_storage(self):
+        a, b, _, _ = self.batters
+        with self.settings(BALL_TRAJECTORY_STORAGE="packed"):
+            ball = self.bowl(a, b, self.bowler1, **self.full_delivery())
+
+        self.assertFalse(ball.trajectory_points.exists())
+        self.assertEqual(ball.packed_trajectory.point_count, 3)
+        entry = BallEntryProjection.objects.get(ball=ball).entry
+        self.assertEqual(entry, self.live_entry(ball))
+        self.assertEqual(
+            [point["sequence_index"] for point in entry["trajectory"]],
+            [0, 1, 2],
+        )
+
+    def test_packed_trajectory_accepts_string_values(self):
+        a, b, _, _ = self.batters
+        trajectory = [
+            {"sequenceIndex": "1", "x": "0.1", "y": "0", "z": None, "timeMs": "40"},
+            {"sequenceIndex": "0", "x": "0", "y": "0.1", "z": "1.5", "timeMs": None},
+        ]
+        with self.settings(BALL_TRAJECTORY_STORAGE="packed"):
+            ball = self.bowl(
+                a, b, self.bowler1, **{**self.full_delivery(), "trajectory": trajectory}
+            )
+
+        expected = [
+            {"sequence_index": 0, "x": 0.0, "y": 0.1, "z": 1.5, "time_ms": None},
+            {"sequence_index": 1, "x": 0.1, "y": 0.0, "z": None, "time_ms": 40},
+        ]
+        ball.refresh_from_db()
+        self.assertEqual(ball.packed_trajectory.as_points(), expected)
+        entry = BallEntryProjection.objects.get(ball=ball).entry
+        self.assertEqual(entry["trajectory"], expected)
+        self.assertEqual(entry, self.live_entry(ball))
+
+    def test_undo_deletes_projection(self):
+        a, b, _, _ = self.batters
+        self.bowl(a, b, self.bowler1, completed_runs=1)
+        last = self.bowl(b, a, self.bowler1, completed_runs=1)
+
+        undo_last_recorded_ball(innings=self.innings)
+
+        self.assertEqual(
+            list(BallEntryProjection.objects.values_list("ball_number", flat=True)),
+            [1],
+        )
+        self.assertFalse(BallEntryProjection.objects.filter(ball_id=last.id).exists())
+
+    def test_backfill_command_projects_balls_without_one(self):
+        a, b, _, _ = self.batters
+        balls = [
+            self.bowl(a, b, self.bowler1, **self.full_delivery()),
+            self.bowl(self.batters[2], b, self.bowler1, completed_runs=1),
+        ]
+        expected = {
+            row.ball_id: row.entry for row in BallEntryProjection.objects.all()
+        }
+        BallEntryProjection.objects.filter(ball=balls[0]).delete()
+
+        call_command(
+            "backfill_ball_entry_projections",
+            "--match", str(self.match.id),
+            stdout=StringIO(),
+        )
+
+        self.assertEqual(
+            {row.ball_id: row.entry for row in BallEntryProjection.objects.all()},
+            expected,
+        )
+
+
+class PostBallOutcomeTest(BallByBallServicesTestBase):
+    def outcome(self, **kwargs):
+        aggregate = InningsAggregate.objects.select_related(
+            "last_ball__wicket", "innings__match__match_type"
+        ).get(innings=self.innings)
+        innings = aggregate.innings
+        with self.assertNumQueries(0):
+            return determine_post_ball_outcome(
+                state={"aggregate": {
+                    "current_striker": aggregate.current_striker_id,
+                    "current_non_striker": aggregate.current_non_striker_id,
+                    "current_bowler": aggregate.current_bowler_id,
+                }},
+                aggregate=aggregate,
+                match=innings.match,
+                innings=innings,
+                **kwargs,
+            )
+
+    def test_over_end_and_wicket_events(self):
+        a, b, c, _ = self.batters
+        for _ in range(5):
+            self.bowl(a, b, self.bowler1)
+        self.bowl(a, b, self.bowler1, wicket_type="BOWLED", dismissed_player_id=a.id)
+
+        outcome = self.outcome()
+
+        self.assertTrue(outcome["events"]["over_end"])
+        self.assertTrue(outcome["events"]["wicket"])
+        self.assertTrue(outcome["actions"]["bowler_select"])
+        self.assertEqual(outcome["next_state"]["striker"], b.id)
+
+    def test_persisted_ball_is_read_without_queries(self):
+        a, b, _, _ = self.batters
+        ball = self.bowl(a, b, self.bowler1, completed_runs=2)
+
+        outcome = self.outcome(last_ball=ball)
+
+        self.assertFalse(outcome["events"]["wicket"])
+        self.assertFalse(outcome["events"]["over_end"])
+        self.assertFalse(outcome["events"]["innings_end"])
+
+
+class SyntheticMatchGeneratorTest(TestCase):
+    def innings(self, seed, **kwargs):
+        ids = list(range(22))
+        return generate_synthetic_innings(
+            rng=random.Random(seed),
+            batter_ids=ids[:11],
+            bowler_ids=ids[-5:],
+            fielder_ids=ids[11:],
+            umpire_ids=["u1", "u2"],
+            review_team_id="t2",
+            balls_per_over=6,
+            **kwargs,
+        )
+
+    def test_same_seed_same_innings(self):
+        self.assertEqual(self.innings(7, max_overs=20), self.innings(7, max_overs=20))
+        self.assertNotEqual(self.innings(7, max_overs=20), self.innings(8, max_overs=20))
+
+    def test_chase_stops_once_target_is_passed(self):
+        deliveries = self.innings(3, max_overs=50, target_runs=40)
+
+        runs = sum(
+            d["completed_runs"] + d["is_wide"] + d["is_no_ball"]
+            for d in deliveries
+        )
+        last = deliveries[-1]
+        self.assertGreater(runs, 40)
+        self.assertLessEqual(
+            runs - last["completed_runs"] - last["is_wide"] - last["is_no_ball"],
+            40,
+        )
+
+    def test_command_generates_consistent_matches(self):
+        out = StringIO()
+        call_command(
+            "generate_synthetic_matches",
+            matches=2, seed=11, trajectory_points=2, stdout=out,
+        )
+
+        matches = Match.objects.filter(state="COMPLETED")
+        self.assertEqual(matches.count(), 2)
+        innings = Innings.objects.filter(match__in=matches).order_by("id")
+        self.assertEqual(innings.count(), 4)
+        self.assertTrue(
+            Ball.objects.filter(innings__in=innings, wicket__isnull=False).exists()
+        )
+
+        stored = [snapshot_derived_state(i) for i in innings]
+        for i in innings:
+            rebuild_entire_innings_from_ball_history(innings=i)
+        self.assertEqual(stored, [snapshot_derived_state(i) for i in innings])
+        self.assertIn("Generated 2 matches", out.getvalue())
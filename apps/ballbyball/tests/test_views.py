@@ -0,0 +1,707 @@
+import threading
+from unittest import mock
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+from backend.core.singleflight import SingleFlight
+from accounts.models import User
+from competitions.models import Tournament, Competition
+from coredata.models import Nationality, Team, Player
+from matches.models import Match, MatchType, Innings, PlayingXI
+from scoring.models import Ball, InningsAggregate
+from ballbyball.models import BallEntryProjection
+from ballbyball.api.initialise_ball_by_ball_session import (
+    InitialiseBallByBallSessionView,
+)
+
+
+class BallByBallViewsTestBase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="bbb_view", password="password")
+        self.client.force_authenticate(self.user)
+
+        self.nat = Nationality.objects.create(name="BBVLand", code="BBV")
+        self.team1 = Team.objects.create(name="BBV 1", team_type="LEAGUE", nationality=self.nat)
+        self.team2 = Team.objects.create(name="BBV 2", team_type="LEAGUE", nationality=self.nat)
+        self.tourney = Tournament.objects.create(
+            name="BBV T", tournament_type="LEAGUE", owner_type="USER", owner_id=self.user.id
+        )
+        self.comp = Competition.objects.create(
+            name="BBV C", tournament=self.tourney, owner_type="USER", owner_id=self.user.id
+        )
+        self.mtype = MatchType.objects.create(name="T20", code="T20", balls_per_over=6, max_overs=20)
+        self.match = Match.objects.create(
+            competition=self.comp, match_type=self.mtype,
+            team1=self.team1, team2=self.team2,
+            state="IN_PROGRESS", match_mode="ONLINE",
+            owner_type="USER", owner_id=self.user.id,
+        )
+        self.innings = Innings.objects.create(
+            match=self.match, innings_number=1,
+            batting_team=self.team1, bowling_team=self.team2,
+            state=Innings.State.ACTIVE,
+        )
+        InningsAggregate.objects.create(innings=self.innings)
+
+        self.striker = Player.objects.create(first_name="Bat1", last_name="V", nationality=self.nat, gender="MALE")
+        self.non_striker = Player.objects.create(first_name="Bat2", last_name="V", nationality=self.nat, gender="MALE")
+        self.bowler = Player.objects.create(first_name="Bowl", last_name="V", nationality=self.nat, gender="MALE")
+        PlayingXI.objects.create(match=self.match, team=self.team1, player=self.striker, batting_position=1)
+        PlayingXI.objects.create(match=self.match, team=self.team1, player=self.non_striker, batting_position=2)
+        PlayingXI.objects.create(match=self.match, team=self.team2, player=self.bowler, batting_position=1)
+
+    def delivery(self, **kwargs):
+        delivery = {
+            "striker": str(self.striker.id),
+            "non_striker": str(self.non_striker.id),
+            "bowler": str(self.bowler.id),
+        }
+        delivery.update(kwargs)
+        return delivery
+
+
+class RecordBallDeliveryBatchViewTest(BallByBallViewsTestBase):
+    url = "/api/ballbyball/record-ball-delivery-batch/"
+
+    def test_records_buffered_over_and_returns_final_state(self):
+        deliveries = [self.delivery(completed_runs=2, ball_number=i) for i in range(1, 7)]
+
+        res = self.client.post(
+            self.url,
+            {"match_id": str(self.match.id), "deliveries": deliveries},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, 200, res.data)
+        self.assertEqual(res.data["aggregate"]["runs"], 12)
+        self.assertEqual(res.data["aggregate"]["completed_overs"], 1)
+        self.assertTrue(res.data["events"]["over_end"])
+        self.assertEqual(Ball.objects.filter(innings=self.innings).count(), 6)
+
+    def test_invalid_delivery_rejects_whole_batch(self):
+        deliveries = [
+            self.delivery(completed_runs=1),
+            self.delivery(bowler=str(self.striker.id)),
+        ]
+
+        res = self.client.post(
+            self.url,
+            {"match_id": str(self.match.id), "deliveries": deliveries},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(res.data["index"], 1)
+        self.assertFalse(Ball.objects.filter(innings=self.innings).exists())
+
+
+class RecordSingleBallDeliveryViewTest(BallByBallViewsTestBase):
+    url = "/api/ballbyball/record-single-ball-delivery/"
+
+    def record(self, **kwargs):
+        return self.client.post(
+            self.url,
+            {"match_id": str(self.match.id), **self.delivery(**kwargs)},
+            format="json",
+        )
+
+    def test_query_count_per_ball_is_fixed(self):
+        self.record(completed_runs=1)
+
+        # match, innings+aggregate, playing XI; savepoint around locked
+        # aggregate, ball insert, entry projection insert, aggregate
+        # update, two stat rows and the change sequence bump, read and
+        # insert. The read model is served from cache and the outcome is
+        # computed in memory.
+        with self.assertNumQueries(16):
+            res = self.record(completed_runs=2)
+
+        self.assertEqual(res.status_code, 200, res.data)
+        self.assertEqual(res.data["aggregate"]["runs"], 3)
+        self.assertEqual(
+            [p["id"] for p in res.data["players"]["batters"]],
+            [self.striker.id, self.non_striker.id],
+        )
+
+    def test_player_outside_playing_xi_is_loaded(self):
+        substitute = Player.objects.create(
+            first_name="Sub", last_name="V", nationality=self.nat, gender="MALE"
+        )
+
+        res = self.record(striker=str(substitute.id), completed_runs=4)
+
+        self.assertEqual(res.status_code, 200, res.data)
+        self.assertEqual(
+            Ball.objects.get(innings=self.innings).striker_id, substitute.id
+        )
+
+
+class ActiveInningsReadModelCacheTest(BallByBallViewsTestBase):
+    record_url = "/api/ballbyball/record-single-ball-delivery/"
+    session_url = "/api/ballbyball/initialise-ball-by-ball-session/"
+
+    def session_state(self):
+        res = self.client.get(self.session_url, {"match_id": str(self.match.id)})
+        self.assertEqual(res.status_code, 200, res.data)
+        return res.data
+
+    def test_patched_stats_match_fresh_read_model(self):
+        for runs in (1, 4, 0, 2):
+            self.client.post(
+                self.record_url,
+                {"match_id": str(self.match.id), **self.delivery(completed_runs=runs)},
+                format="json",
+            )
+            self.striker, self.non_striker = self.non_striker, self.striker
+        cached = self.session_state()
+
+        cache.clear()
+        fresh = self.session_state()
+
+        self.assertEqual(cached["batting_stats"], fresh["batting_stats"])
+        self.assertEqual(cached["bowling_stats"], fresh["bowling_stats"])
+        self.assertEqual(cached["aggregate"], fresh["aggregate"])
+
+    def test_playing_xi_change_invalidates_player_lists(self):
+        self.session_state()
+        extra = Player.objects.create(first_name="Bat3", last_name="V", nationality=self.nat, gender="MALE")
+
+        PlayingXI.objects.create(match=self.match, team=self.team1, player=extra, batting_position=3)
+
+        batters = self.session_state()["players"]["batters"]
+        self.assertIn(extra.id, [p["id"] for p in batters])
+
+    def test_match_version_is_shared_by_workers(self):
+        params = {"match_id": str(self.match.id)}
+        etag = self.client.get(self.session_url, params)["ETag"]
+
+        # Another worker starts with its own, empty cache
+        cache.clear()
+        res = self.client.get(self.session_url, params, headers={"If-None-Match": etag})
+        self.assertEqual(res.status_code, 304)
+
+        extra = Player.objects.create(first_name="Bat3", last_name="V", nationality=self.nat, gender="MALE")
+        PlayingXI.objects.create(match=self.match, team=self.team1, player=extra, batting_position=3)
+        cache.clear()
+        res = self.client.get(self.session_url, params, headers={"If-None-Match": etag})
+        self.assertEqual(res.status_code, 200)
+
+    def test_umpire_change_invalidates_umpires(self):
+        from coredata.models import Umpire
+        self.session_state()
+        umpire = Umpire.objects.create(name="Ump", nationality=self.nat)
+
+        self.match.umpires.add(umpire)
+
+        self.assertEqual(
+            [u["id"] for u in self.session_state()["umpires"]], [umpire.id]
+        )
+
+
+    def test_player_and_umpire_edits_invalidate_names(self):
+        from coredata.models import Umpire
+        umpire = Umpire.objects.create(name="Ump", nationality=self.nat)
+        self.match.umpires.add(umpire)
+        self.session_state()
+
+        self.striker.first_name = "Renamed"
+        self.striker.save()
+        umpire.name = "Renamed Ump"
+        umpire.save()
+
+        state = self.session_state()
+        self.assertIn("Renamed", [p["first_name"] for p in state["players"]["batters"]])
+        self.assertEqual([u["name"] for u in state["umpires"]], ["Renamed Ump"])
+
+    def test_swapped_innings_teams_invalidate_player_lists(self):
+        self.session_state()
+
+        self.innings.batting_team, self.innings.bowling_team = self.team2, self.team1
+        self.innings.save(update_fields=["batting_team", "bowling_team"])
+
+        batters = self.session_state()["players"]["batters"]
+        self.assertEqual([p["id"] for p in batters], [self.bowler.id])
+
+    def test_team_and_competition_renames_change_the_etag(self):
+        etag = self.client.get(
+            self.session_url, {"match_id": str(self.match.id)}
+        )["ETag"]
+
+        for instance, name in ((self.team1, "BBV 1 Renamed"), (self.comp, "BBV C Renamed")):
+            instance.name = name
+            instance.save()
+
+            res = self.client.get(
+                self.session_url,
+                {"match_id": str(self.match.id)},
+                headers={"If-None-Match": etag},
+            )
+            self.assertEqual(res.status_code, 200)
+            self.assertIn(name, res.json()["match_title"])
+            etag = res["ETag"]
+
+        self.match.competition = Competition.objects.create(
+            name="BBV C2", tournament=self.tourney, owner_type="USER", owner_id=self.user.id
+        )
+        self.match.save()
+        res = self.client.get(
+            self.session_url,
+            {"match_id": str(self.match.id)},
+            headers={"If-None-Match": etag},
+        )
+        self.assertEqual(res.status_code, 200)
+        self.assertIn("BBV C2", res.json()["match_title"])
+
+    def test_bowling_side_penalty_invalidates_penalties(self):
+        self.session_state()
+
+        res = self.client.post(
+            "/api/ballbyball/apply-penalty/",
+            {
+                "match_id": str(self.match.id),
+                "innings_id": str(self.innings.id),
+                "runs": 5,
+                "awarded_to": "BOWLING",
+            },
+            format="json",
+        )
+        self.assertEqual(res.status_code, 200, res.data)
+
+        penalties = self.session_state()["penalties"]
+        self.assertEqual([p["id"] for p in penalties], [res.data["penalty_id"]])
+
+
+class PostBallOutcomeConsistencyTest(BallByBallViewsTestBase):
+    def test_record_undo_and_session_report_the_same_outcome(self):
+        self.client.post(
+            "/api/ballbyball/record-single-ball-delivery/",
+            {"match_id": str(self.match.id), **self.delivery(completed_runs=1)},
+            format="json",
+        )
+        recorded = self.client.post(
+            "/api/ballbyball/record-single-ball-delivery/",
+            {
+                "match_id": str(self.match.id),
+                **self.delivery(
+                    wicket_type="BOWLED",
+                    dismissed_player_id=str(self.striker.id),
+                ),
+            },
+            format="json",
+        ).data
+        session = self.client.get(
+            "/api/ballbyball/initialise-ball-by-ball-session/",
+            {"match_id": str(self.match.id)},
+        ).data
+
+        self.assertTrue(recorded["events"]["wicket"])
+        for key in ("actions", "events", "next_state"):
+            self.assertEqual(recorded[key], session[key])
+
+        undone = self.client.post(
+            "/api/ballbyball/undo-most-recent-ball-delivery/",
+            {"match_id": str(self.match.id)},
+            format="json",
+        ).data
+        self.assertFalse(undone["events"]["wicket"])
+        self.assertFalse(undone["actions"]["striker_select"])
+
+
+class UndoMostRecentBallDeliveryViewTest(BallByBallViewsTestBase):
+    url = "/api/ballbyball/undo-most-recent-ball-delivery/"
+
+    def test_full_rebuild_flag_is_parsed_from_form_bodies(self):
+        self.client.post(
+            "/api/ballbyball/record-single-ball-delivery/",
+            {"match_id": str(self.match.id), **self.delivery(completed_runs=1)},
+            format="json",
+        )
+        with mock.patch(
+            "ballbyball.api.undo_most_recent_ball_delivery.undo_last_recorded_ball"
+        ) as undo:
+            for value, expected in (("false", False), ("0", False), ("true", True)):
+                res = self.client.post(
+                    self.url,
+                    {"match_id": str(self.match.id), "full_rebuild": value},
+                    format="multipart",
+                )
+                self.assertEqual(res.status_code, 200, res.data)
+                self.assertIs(undo.call_args.kwargs["full_rebuild"], expected)
+
+        res = self.client.post(
+            self.url,
+            {"match_id": str(self.match.id), "full_rebuild": "maybe"},
+            format="multipart",
+        )
+        self.assertEqual(res.status_code, 400)
+
+
+class SessionStateCoalescingTest(BallByBallViewsTestBase):
+    session_url = "/api/ballbyball/initialise-ball-by-ball-session/"
+
+    def test_same_version_is_built_and_rendered_once(self):
+        with mock.patch.object(
+            InitialiseBallByBallSessionView,
+            "session_state",
+            autospec=True,
+            side_effect=InitialiseBallByBallSessionView.session_state,
+        ) as session_state:
+            first = self.client.get(self.session_url, {"match_id": str(self.match.id)})
+            second = self.client.get(self.session_url, {"match_id": str(self.match.id)})
+            self.assertEqual(session_state.call_count, 1)
+            self.assertEqual(first.content, second.content)
+            self.assertEqual(first.data, second.data)
+
+            self.client.post(
+                "/api/ballbyball/record-single-ball-delivery/",
+                {"match_id": str(self.match.id), **self.delivery(completed_runs=4)},
+                format="json",
+            )
+            third = self.client.get(self.session_url, {"match_id": str(self.match.id)})
+            self.assertEqual(session_state.call_count, 2)
+            self.assertEqual(third.data["aggregate"]["runs"], 4)
+
+
+class SingleFlightTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_concurrent_callers_share_one_computation(self):
+        flight = SingleFlight("test")
+        started, release = threading.Event(), threading.Event()
+        calls = []
+        results = []
+
+        def compute():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return b"state"
+
+        threads = [
+            threading.Thread(target=lambda: results.append(flight.do("k", compute)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        started.wait(5)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [b"state"] * 5)
+
+    def test_waits_for_the_lock_holder_in_another_process(self):
+        flight = SingleFlight("test", poll_interval=0.001)
+        cache.add(flight.lock_key("k"), "other-worker", 5)
+        timer = threading.Timer(
+            0.05, lambda: cache.set(flight.result_key("k"), b"theirs")
+        )
+        timer.start()
+
+        result = flight.do("k", lambda: self.fail("computed while locked"))
+        timer.join()
+
+        self.assertEqual(result, b"theirs")
+
+    def test_computes_itself_when_the_lock_holder_overruns(self):
+        flight = SingleFlight("test", lock_timeout=0.05, poll_interval=0.001)
+        cache.add(flight.lock_key("k"), "other-worker", 5)
+
+        self.assertEqual(flight.do("k", lambda: b"mine"), b"mine")
+
+
+class PublicMatchScoreViewTest(BallByBallViewsTestBase):
+    scoreboard_url = "/api/ballbyball/public-match-scoreboard/"
+    scorecard_url = "/api/ballbyball/public-match-scorecard/"
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(None)
+        self.match.is_public = True
+        self.match.save(update_fields=["is_public"])
+
+    def record_ball(self, **kwargs):
+        self.client.force_authenticate(self.user)
+        self.client.post(
+            "/api/ballbyball/record-single-ball-delivery/",
+            {"match_id": str(self.match.id), **self.delivery(**kwargs)},
+            format="json",
+        )
+        self.client.force_authenticate(None)
+
+    def test_private_match_is_not_found(self):
+        self.match.is_public = False
+        self.match.save(update_fields=["is_public"])
+
+        for url in (self.scoreboard_url, self.scorecard_url):
+            res = self.client.get(url, {"match_id": str(self.match.id)})
+            self.assertEqual(res.status_code, 404)
+        res = self.client.get(self.scoreboard_url, {"match_id": "not-a-uuid"})
+        self.assertEqual(res.status_code, 404)
+
+    def test_scoreboard_is_cacheable_without_authentication(self):
+        self.record_ball(completed_runs=4)
+
+        res = self.client.get(self.scoreboard_url, {"match_id": str(self.match.id)})
+
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res["ETag"].startswith('"'))
+        self.assertIn("public", res["Cache-Control"])
+        self.assertIn("stale-while-revalidate=", res["Cache-Control"])
+        innings = res.data["innings"][0]
+        self.assertEqual((innings["runs"], innings["overs"]), (4, "0.1"))
+        striker = res.data["current"]["batters"][0]
+        self.assertEqual(striker["player_id"], self.striker.id)
+        self.assertEqual((striker["runs"], striker["on_strike"]), (4, True))
+        self.assertEqual(res.data["current"]["bowler"]["runs_conceded"], 4)
+
+    def test_if_none_match_answers_304_until_the_score_changes(self):
+        etag = self.client.get(
+            self.scoreboard_url, {"match_id": str(self.match.id)}
+        )["ETag"]
+
+        res = self.client.get(
+            self.scoreboard_url,
+            {"match_id": str(self.match.id)},
+            headers={"If-None-Match": etag},
+        )
+        self.assertEqual(res.status_code, 304)
+        self.assertEqual(res["ETag"], etag)
+        self.assertEqual(res.content, b"")
+
+        self.record_ball(completed_runs=1)
+        res = self.client.get(
+            self.scoreboard_url,
+            {"match_id": str(self.match.id)},
+            headers={"If-None-Match": etag},
+        )
+        self.assertEqual(res.status_code, 200)
+        self.assertNotEqual(res["ETag"], etag)
+
+    def test_team_and_player_renames_change_the_etag(self):
+        self.record_ball(completed_runs=2)
+        params = {"match_id": str(self.match.id)}
+        etag = self.client.get(self.scorecard_url, params)["ETag"]
+
+        self.team1.name = "BBV 1 Renamed"
+        self.team1.save()
+        res = self.client.get(self.scorecard_url, params, headers={"If-None-Match": etag})
+        self.assertEqual(res.status_code, 200)
+        etag = res["ETag"]
+
+        self.striker.first_name = "Renamed"
+        self.striker.save()
+        res = self.client.get(self.scorecard_url, params, headers={"If-None-Match": etag})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["innings"][0]["batting"][0]["name"], "Renamed V")
+
+    def test_scorecard_lists_every_innings_batting_and_bowling(self):
+        self.record_ball(completed_runs=2)
+
+        res = self.client.get(self.scorecard_url, {"match_id": str(self.match.id)})
+
+        self.assertEqual(res.status_code, 200)
+        innings = res.data["innings"][0]
+        self.assertEqual(
+            [(row["name"], row["runs"]) for row in innings["batting"]],
+            [("Bat1 V", 2)],
+        )
+        self.assertEqual(
+            [(row["name"], row["overs"]) for row in innings["bowling"]],
+            [("Bowl V", "0.1")],
+        )
+
+
+class MatchBallEntriesViewTest(BallByBallViewsTestBase):
+    url = "/api/ballbyball/match-ball-entries/"
+
+    def setUp(self):
+        super().setUp()
+        for runs in range(8):
+            self.client.post(
+                "/api/ballbyball/record-single-ball-delivery/",
+                {"match_id": str(self.match.id), **self.delivery(completed_runs=0)},
+                format="json",
+            )
+        self.innings.state = Innings.State.COMPLETED
+        self.innings.save(update_fields=["state"])
+        self.innings2 = Innings.objects.create(
+            match=self.match, innings_number=2,
+            batting_team=self.team2, bowling_team=self.team1,
+            state=Innings.State.ACTIVE,
+        )
+        InningsAggregate.objects.create(innings=self.innings2)
+        self.striker, self.bowler = self.bowler, self.striker
+        self.non_striker = Player.objects.create(
+            first_name="Bat3", last_name="V", nationality=self.nat, gender="MALE"
+        )
+        for runs in range(3):
+            self.client.post(
+                "/api/ballbyball/record-single-ball-delivery/",
+                {"match_id": str(self.match.id), **self.delivery(completed_runs=0)},
+                format="json",
+            )
+
+    def page(self, **params):
+        res = self.client.get(self.url, {"match_id": str(self.match.id), **params})
+        self.assertEqual(res.status_code, 200, res.data)
+        return res.data
+
+    def keys(self, page):
+        return [
+            (e["innings"]["innings_number"], e["sequence"]["ball_number"])
+            for e in page["entries"]
+        ]
+
+    def test_pages_back_across_innings_without_gaps(self):
+        seen = []
+        page = self.page(limit=4)
+        while True:
+            seen.extend(self.keys(page))
+            if page["older_cursor"] is None:
+                break
+            page = self.page(limit=4, before=page["older_cursor"])
+
+        self.assertEqual(
+            seen,
+            [(2, n) for n in (3, 2, 1)] + [(1, n) for n in range(8, 0, -1)],
+        )
+
+    def test_after_cursor_returns_only_newer_balls(self):
+        older = self.page(limit=5, before=self.page(limit=3)["older_cursor"])
+
+        newer = self.page(after=older["newer_cursor"])
+
+        self.assertEqual(self.keys(newer), [(2, 3), (2, 2), (2, 1)])
+        self.assertEqual(self.page(after=newer["newer_cursor"])["entries"], [])
+
+    def test_fields_limit_sections_and_joins(self):
+        # Match, innings last balls, projections
+        with self.assertNumQueries(3):
+            page = self.page(fields="scoring")
+
+        self.assertEqual(
+            set(page["entries"][0]),
+            {"id", "created_at", "innings", "sequence", "scoring"},
+        )
+
+    def test_unchanged_feed_answers_304_until_a_ball_is_undone(self):
+        params = {"match_id": str(self.match.id), "limit": 4}
+        etag = self.client.get(self.url, params)["ETag"]
+
+        res = self.client.get(self.url, params, headers={"If-None-Match": etag})
+        self.assertEqual(res.status_code, 304)
+
+        self.client.post(
+            "/api/ballbyball/undo-most-recent-ball-delivery/",
+            {"match_id": str(self.match.id)},
+            format="json",
+        )
+        res = self.client.get(self.url, params, headers={"If-None-Match": etag})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["entry_count"], 4)
+
+    def test_balls_without_projection_are_rendered_live(self):
+        projected = self.page(limit=20, fields="participants,scoring,wicket")
+        BallEntryProjection.objects.filter(innings=self.innings).delete()
+
+        with self.assertNumQueries(4):
+            live = self.page(limit=20, fields="participants,scoring,wicket")
+
+        self.assertEqual(live["entries"], projected["entries"])
+
+    def test_pages_over_a_gap_in_projections(self):
+        BallEntryProjection.objects.filter(
+            innings=self.innings, ball_number__in=(3, 4)
+        ).delete()
+
+        seen = []
+        page = self.page(limit=3)
+        while True:
+            seen.extend(self.keys(page))
+            if page["older_cursor"] is None:
+                break
+            page = self.page(limit=3, before=page["older_cursor"])
+
+        self.assertEqual(
+            seen,
+            [(2, n) for n in (3, 2, 1)] + [(1, n) for n in range(8, 0, -1)],
+        )
+
+    def test_rejects_unknown_fields_and_bad_cursors(self):
+        for params in ({"fields": "scoring,colour"}, {"before": "!!"}, {"limit": 0}):
+            res = self.client.get(self.url, {"match_id": str(self.match.id), **params})
+            self.assertEqual(res.status_code, 400, params)
+
+
+class MatchChangesViewTest(BallByBallViewsTestBase):
+    url = "/api/ballbyball/match-changes/"
+
+    def setUp(self):
+        super().setUp()
+        for runs in (1, 4):
+            self.client.post(
+                "/api/ballbyball/record-single-ball-delivery/",
+                {"match_id": str(self.match.id), **self.delivery(completed_runs=runs)},
+                format="json",
+            )
+        self.client.post(
+            "/api/ballbyball/undo-most-recent-ball-delivery/",
+            {"match_id": str(self.match.id)},
+            format="json",
+        )
+        self.client.post(
+            "/api/ballbyball/apply-penalty/",
+            {
+                "match_id": str(self.match.id),
+                "innings_id": str(self.innings.id),
+                "runs": 5,
+                "awarded_to": "BATTING",
+            },
+            format="json",
+        )
+
+    def changes(self, **params):
+        res = self.client.get(self.url, {"match_id": str(self.match.id), **params})
+        self.assertEqual(res.status_code, 200, res.data)
+        return res.data
+
+    def test_changes_are_numbered_in_order(self):
+        page = self.changes(fields="scoring")
+
+        self.assertEqual(
+            [(c["seq"], c["kind"]) for c in page["changes"]],
+            [(1, "BALL"), (2, "BALL"), (3, "UNDO"), (4, "PENALTY")],
+        )
+        self.assertEqual(page["last_seq"], 4)
+        self.assertFalse(page["has_more"])
+        first, undone, undo, penalty = page["changes"]
+        self.assertEqual(
+            set(first["entries"][0]),
+            {"id", "created_at", "innings", "sequence", "scoring"},
+        )
+        # The undone ball's entry is gone; the undo names it
+        self.assertEqual(undone["entries"], [])
+        self.assertEqual(undo["ball_id"], undone["ball_ids"][0])
+        self.assertEqual(undo["score"]["runs"], 1)
+        self.assertEqual(penalty["score"]["runs"], 6)
+
+    def test_since_returns_only_later_changes(self):
+        # match, changes, entries of the balls among them
+        with self.assertNumQueries(3):
+            page = self.changes(since=1, limit=2)
+
+        self.assertEqual([c["kind"] for c in page["changes"]], ["BALL", "UNDO"])
+        self.assertTrue(page["has_more"])
+        page = self.changes(since=page["last_seq"])
+        self.assertEqual([c["kind"] for c in page["changes"]], ["PENALTY"])
+        self.assertEqual(self.changes(since=4)["changes"], [])
+        self.assertEqual(self.changes(since=4)["last_seq"], 4)
+
+    def test_rejects_bad_parameters(self):
+        for params in ({"since": "x"}, {"since": -1}, {"limit": 0}, {"fields": "colour"}):
+            res = self.client.get(self.url, {"match_id": str(self.match.id), **params})
+            self.assertEqual(res.status_code, 400, params)
@@ -6,6 +6,9 @@ from ballbyball.api.initialise_ball_by_ball_session import (
     InitialiseBallByBallSessionView,
 )
 from ballbyball.api.record_single_ball_delivery import (RecordSingleBallDeliveryView)
+from ballbyball.api.record_ball_delivery_batch import (
+    RecordBallDeliveryBatchView,
+)
 from ballbyball.api.undo_most_recent_ball_delivery import (
     UndoMostRecentBallDeliveryView,
 )
@@ -16,6 +19,11 @@ from ballbyball.api.apply_dls import ApplyDLSView
 from ballbyball.api.apply_penalty import ApplyPenaltyView
 from ballbyball.api.declare_innings import DeclareInningsView
 from ballbyball.api.list_match_ball_entries import MatchBallEntriesView
+from ballbyball.api.list_match_changes import MatchChangesView
+from ballbyball.api.public_match_score import (
+    PublicMatchScoreboardView,
+    PublicMatchScorecardView,
+)
 
 urlpatterns = [
     path(
@@ -33,6 +41,11 @@ urlpatterns = [
         RecordSingleBallDeliveryView.as_view(),
         name="record-single-ball-delivery",
     ),
+    path(
+        "record-ball-delivery-batch/",
+        RecordBallDeliveryBatchView.as_view(),
+        name="record-ball-delivery-batch",
+    ),
     path(
         "undo-most-recent-ball-delivery/",
         UndoMostRecentBallDeliveryView.as_view(),
@@ -73,4 +86,19 @@ urlpatterns = [
         MatchBallEntriesView.as_view(),
         name="match-ball-entries",
     ),
+    path(
+        "match-changes/",
+        MatchChangesView.as_view(),
+        name="match-changes",
+    ),
+    path(
+        "public-match-scoreboard/",
+        PublicMatchScoreboardView.as_view(),
+        name="public-match-scoreboard",
+    ),
+    path(
+        "public-match-scorecard/",
+        PublicMatchScorecardView.as_view(),
+        name="public-match-scorecard",
+    ),
 ]
@@ -104,6 +104,8 @@ class Match(OwnedModel):
         choices=STATE_CHOICES,
         default="DRAFT"
     )
+    # Live score readable without an account
+    is_public = models.BooleanField(default=False)
     # Offline safety
     offline_snapshot_hash = models.CharField(
         max_length=64,
@@ -27,6 +27,7 @@ class MatchCreateSerializer(serializers.ModelSerializer):
             "drs_count",
             "floodlights_count",
             "match_mode",
+            "is_public",
         )
     def validate(self, data):
         competition = data.get("competition")
@@ -112,6 +113,7 @@ class MatchDetailSerializer(serializers.ModelSerializer):
             "drs_count",
             "floodlights_count",
             "state",
+            "is_public",
         )
 
     def get_match_label(self, obj):
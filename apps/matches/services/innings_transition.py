@@ -139,4 +139,4 @@ def end_match(match_id: UUID) -> None:
 
     if match.state != "COMPLETED":
         match.state = "COMPLETED"
-        match.save()
+        match.save(update_fields=["state"])
@@ -85,3 +85,75 @@ class MatchViewsTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         # Check first player
         self.assertTrue(PlayingXI.objects.filter(match=match, batting_position=1).exists())
+
+    def assert_conditional_get(self, url, change):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+        self.assertIn("no-cache", response["Cache-Control"])
+
+        response = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+
+        change()
+        response = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_playing_xi_get_is_conditional(self):
+        match = Match.objects.create(
+            competition=self.competition, match_type=self.mtype, team1=self.team1, team2=self.team2,
+            match_mode="ONLINE", state="READY", owner_type="USER", owner_id=self.user.id,
+        )
+        PlayingXI.objects.create(match=match, team=self.team1, player=self.p1, batting_position=1)
+
+        self.assert_conditional_get(
+            reverse('playing-xi', args=[match.id]),
+            lambda: PlayingXI.objects.create(match=match, team=self.team1, player=self.p2, batting_position=2),
+        )
+
+    def test_match_list_and_detail_are_conditional(self):
+        match = Match.objects.create(
+            competition=self.competition, match_type=self.mtype, team1=self.team1, team2=self.team2,
+            match_mode="ONLINE", state="READY", owner_type="USER", owner_id=self.user.id,
+        )
+
+        self.assert_conditional_get(
+            reverse('match-list-list'),
+            lambda: Match.objects.filter(id=match.id).update(state="IN_PROGRESS"),
+        )
+        self.assert_conditional_get(
+            reverse('match-list-detail', args=[match.id]),
+            lambda: Team.objects.filter(id=self.team1.id).update(name="Team A2"),
+        )
+
+    def test_match_list_version_covers_only_the_requested_page(self):
+        matches = [
+            Match.objects.create(
+                competition=self.competition, match_type=self.mtype, team1=self.team1, team2=self.team2,
+                match_mode="ONLINE", state="READY", owner_type="USER", owner_id=self.user.id,
+            )
+            for _ in range(21)
+        ]
+        url = reverse('match-list-list')
+        response = self.client.get(url)
+        self.assertEqual(len(response.data["results"]), 20)
+        etag = response["ETag"]
+
+        # The oldest match is on page 2
+        Match.objects.filter(id=matches[0].id).update(state="IN_PROGRESS")
+        response = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.get(url, {"page": 2}, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["state"], "IN_PROGRESS")
+
+        # A new match shifts every page
+        Match.objects.create(
+            competition=self.competition, match_type=self.mtype, team1=self.team1, team2=self.team2,
+            match_mode="ONLINE", state="READY", owner_type="USER", owner_id=self.user.id,
+        )
+        response = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -8,11 +8,15 @@ from rest_framework.response import Response
 from rest_framework import status
 from django.db import transaction
 from rest_framework.exceptions import ValidationError
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.shortcuts import get_object_or_404
+from django.db.models import Count, Max
 
 
+from backend.core.conditional import ConditionalGetMixin
 from backend.core.viewsets import OwnedModelViewSet, OwnedModelListView
 from competitions.models import Competition, Series
+from sync.services import store_offline_match_package
 from .models import Match, PlayingXI, Toss, Innings, MatchType
 from .serializers import (
     MatchCreateSerializer, PlayingXIInputSerializer, TossCreateSerializer, 
@@ -74,12 +78,53 @@ class MatchViewSet(OwnedModelViewSet):
         )
         """
 
-class MatchDetailedViewSet(OwnedModelViewSet):
+class MatchDetailedViewSet(ConditionalGetMixin, OwnedModelViewSet):
     serializer_class = MatchDetailSerializer
     queryset = Match.objects.all()
+    # Everything MatchDetailSerializer renders
+    version_fields = (
+        "id",
+        "state",
+        "match_mode",
+        "match_date",
+        "ci_id",
+        "drs_count",
+        "floodlights_count",
+        "is_public",
+        "competition_id",
+        "competition__name",
+        "series__name",
+        "match_type__name",
+        "team1_id",
+        "team1__name",
+        "team2_id",
+        "team2__name",
+    )
 
     def get_queryset(self):
-        return super().get_queryset().order_by("-created_at")
+        return super().get_queryset().select_related(
+            "competition", "series", "match_type", "team1", "team2"
+        ).order_by("-created_at")
+
+    def get_version(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in kwargs:
+            try:
+                queryset = queryset.filter(
+                    **{self.lookup_field: kwargs[lookup_url_kwarg]}
+                )
+            except DjangoValidationError:
+                return None  # the handler answers 404
+            return list(queryset.values_list(*self.version_fields))
+        # Only the requested page, as narrow rows; the count drives the
+        # page links
+        page = self.paginate_queryset(
+            queryset.values_list(*self.version_fields)
+        )
+        if page is None:
+            return list(queryset.values_list(*self.version_fields))
+        return [self.paginator.page.paginator.count, *page]
 
 class PrepareOfflineMatchView(APIView):
     permission_classes = [IsAuthenticated]
@@ -120,9 +165,12 @@ class PrepareOfflineMatchView(APIView):
         else:
             match.series.is_locked = True
             match.series.save(update_fields=["is_locked"])
+        # Squads are locked from here on: build the offline package once
+        package = store_offline_match_package(match)
         return Response({
             "status": "offline prepared",
             "snapshot_hash": snapshot_hash,
+            "package_hash": package.content_hash,
             "state": match.state,
         })
 
@@ -202,10 +250,19 @@ class OfflineSyncView(APIView):
         })
 
 
-class PlayingXIView(APIView):
+class PlayingXIView(ConditionalGetMixin, APIView):
     permission_classes = [IsAuthenticated]
+
+    def get_version(self, request, match_id):
+        self.match = Match.objects.get(id=match_id)
+        # put replaces a team's rows, so new ids mark every change
+        xi = PlayingXI.objects.filter(match=self.match).aggregate(
+            count=Count("id"), last_id=Max("id")
+        )
+        return [self.match.state, xi["count"], xi["last_id"]]
+
     def get(self, request, match_id):
-        match = Match.objects.get(id=match_id)
+        match = self.match
         data = {}
         for team_id in [match.team1_id, match.team2_id]:
             xis = PlayingXI.objects.filter(
@@ -3,7 +3,7 @@ from scoring.models.batter_stats import BatterStats
 from scoring.models.bowler_stats import BowlerStats
 from scoring.models.ball import Ball
 
-from scoring.engine.scoring_engine import apply_scoring_engine
+from scoring.engine.scoring_engine import apply_ball_impact
 
 def rebuild_innings_state(innings):
     # Preserve derived context BEFORE delete
@@ -21,14 +21,13 @@ def rebuild_innings_state(innings):
         context["max_overs"] = old_agg.max_overs
         context["is_chasing"] = old_agg.is_chasing
         old_agg.delete()
-    else:
-        # Fallback cleanup just in case (though filter().first() handles safety)
-        InningsAggregate.objects.filter(innings=innings).delete()
-        BatterStats.objects.filter(innings=innings).delete()
-        BowlerStats.objects.filter(innings=innings).delete()
-
-    # Fresh aggregate
-    aggregate = InningsAggregate.objects.create(
+
+    # Stats are rebuilt from scratch alongside the aggregate
+    BatterStats.objects.filter(innings=innings).delete()
+    BowlerStats.objects.filter(innings=innings).delete()
+
+    # Fresh aggregate, folded in memory and saved once
+    aggregate = InningsAggregate(
         innings=innings,
         runs=0,
         wickets=0,
@@ -36,10 +35,48 @@ def rebuild_innings_state(innings):
         completed_overs=0,
         **context
     )
+    batter_stats = {}
+    bowler_stats = {}
 
-    balls = Ball.objects.filter(
-        innings=innings
-    ).order_by("ball_number")
+    balls_per_over = innings.match.match_type.balls_per_over
+    balls = (
+        Ball.objects.filter(innings=innings)
+        .select_related("wicket")
+        .order_by("ball_number")
+    )
 
     for ball in balls:
-        apply_scoring_engine(ball.id)
+        # Balls are validated against the live participants when
+        # submitted, so they are the authoritative pre-ball state.
+        aggregate.current_striker_id = ball.striker_id
+        aggregate.current_non_striker_id = ball.non_striker_id
+        aggregate.current_bowler_id = ball.bowler_id
+
+        if ball.striker_id not in batter_stats:
+            batter_stats[ball.striker_id] = BatterStats(
+                innings=innings,
+                player_id=ball.striker_id,
+            )
+        if ball.bowler_id not in bowler_stats:
+            bowler_stats[ball.bowler_id] = BowlerStats(
+                innings=innings,
+                player_id=ball.bowler_id,
+            )
+
+        apply_ball_impact(
+            aggregate=aggregate,
+            batter_stats=batter_stats[ball.striker_id],
+            bowler_stats=bowler_stats[ball.bowler_id],
+            ball=ball,
+            wicket=getattr(ball, "wicket", None),
+            balls_per_over=balls_per_over,
+        )
+        aggregate.last_ball_id = ball.id
+
+    aggregate.save()
+    BatterStats.objects.bulk_create(batter_stats.values())
+    BowlerStats.objects.bulk_create(bowler_stats.values())
+    # These rules differ from the ball-by-ball delta; undo must rebuild
+    Ball.objects.filter(innings=innings, stats_from_ball_delta=True).update(
+        stats_from_ball_delta=False
+    )
@@ -25,6 +25,63 @@ def apply_scoring_engine(ball_id: UUID) -> None:
 
     match_type = ball.match.match_type
 
+    batter_stats, _ = BatterStats.objects.get_or_create(
+        innings=ball.innings,
+        player_id=ball.striker_id,
+        defaults={
+            "runs": 0,
+            "balls": 0,
+            "fours": 0,
+            "sixes": 0,
+            "is_out": False,
+        },
+    )
+
+    bowler_stats, _ = BowlerStats.objects.get_or_create(
+        innings=ball.innings,
+        player_id=ball.bowler_id,
+        defaults={
+            "runs_conceded": 0,
+            "balls": 0,
+            "wickets": 0,
+        },
+    )
+
+    apply_ball_impact(
+        aggregate=aggregate,
+        batter_stats=batter_stats,
+        bowler_stats=bowler_stats,
+        ball=ball,
+        wicket=getattr(ball, "wicket", None),
+        balls_per_over=match_type.balls_per_over,
+    )
+
+    batter_stats.save()
+    bowler_stats.save()
+
+    # -------------------------
+    # FINALIZE
+    # -------------------------
+
+    aggregate.last_ball = ball
+    aggregate.save()
+
+
+def apply_ball_impact(
+    *,
+    aggregate,
+    batter_stats,
+    bowler_stats,
+    ball,
+    wicket,
+    balls_per_over,
+) -> None:
+    """
+    Apply one ball to in-memory aggregate and stats rows.
+    Never touches the database, so replays can fold many balls
+    and save once.
+    """
+
     # -------------------------
     # TEAM SCORE
     # -------------------------
@@ -36,7 +93,7 @@ def apply_scoring_engine(ball_id: UUID) -> None:
     # WICKETS
     # -------------------------
 
-    if hasattr(ball, "wicket"):
+    if wicket:
         aggregate.wickets += 1
 
     # -------------------------
@@ -46,27 +103,13 @@ def apply_scoring_engine(ball_id: UUID) -> None:
     if ball.is_legal_delivery:
         aggregate.legal_balls += 1
 
-        if ball.ball_in_over == match_type.balls_per_over:
+        if ball.ball_in_over == balls_per_over:
             aggregate.completed_overs += 1
 
     # -------------------------
     # BATTER STATS
     # -------------------------
 
-    batter = ball.striker
-
-    batter_stats, _ = BatterStats.objects.get_or_create(
-        innings=ball.innings,
-        player=batter,
-        defaults={
-            "runs": 0,
-            "balls": 0,
-            "fours": 0,
-            "sixes": 0,
-            "is_out": False,
-        },
-    )
-
     batter_stats.runs += ball.runs_off_bat
 
     if ball.is_legal_delivery:
@@ -77,34 +120,18 @@ def apply_scoring_engine(ball_id: UUID) -> None:
     elif ball.runs_off_bat == 6:
         batter_stats.sixes += 1
 
-    batter_stats.save()
-
     # -------------------------
     # BOWLER STATS
     # -------------------------
 
-    bowler = ball.bowler
-
-    bowler_stats, _ = BowlerStats.objects.get_or_create(
-        innings=ball.innings,
-        player=bowler,
-        defaults={
-            "runs_conceded": 0,
-            "balls": 0,
-            "wickets": 0,
-        },
-    )
-
     bowler_stats.runs_conceded += ball.runs_off_bat + ball.extra_runs
 
     if ball.is_legal_delivery:
         bowler_stats.balls += 1
 
-    if hasattr(ball, "wicket"):
+    if wicket:
         bowler_stats.wickets += 1
 
-    bowler_stats.save()
-
     # -------------------------
     # STRIKE ROTATION (AUTHORITATIVE)
     # -------------------------
@@ -131,38 +158,31 @@ def apply_scoring_engine(ball_id: UUID) -> None:
         physical_runs += (ball.no_ball_runs - 1)
 
     if physical_runs % 2 == 1:
-        aggregate.current_striker, aggregate.current_non_striker = (
-            aggregate.current_non_striker,
-            aggregate.current_striker,
+        aggregate.current_striker_id, aggregate.current_non_striker_id = (
+            aggregate.current_non_striker_id,
+            aggregate.current_striker_id,
         )
 
     # Over-end rotation
     if (
         ball.is_legal_delivery and
-        ball.ball_in_over == match_type.balls_per_over
+        ball.ball_in_over == balls_per_over
     ):
-        aggregate.current_striker, aggregate.current_non_striker = (
-            aggregate.current_non_striker,
-            aggregate.current_striker,
+        aggregate.current_striker_id, aggregate.current_non_striker_id = (
+            aggregate.current_non_striker_id,
+            aggregate.current_striker_id,
         )
-        aggregate.current_bowler = None
+        aggregate.current_bowler_id = None
 
     # Wicket handling
-    if hasattr(ball, "wicket"):
-        dismissed_id = ball.wicket.dismissed_player_id
+    if wicket:
+        dismissed_id = wicket.dismissed_player_id
         
         if aggregate.current_striker_id == dismissed_id:
-            aggregate.current_striker = None
+            aggregate.current_striker_id = None
         elif aggregate.current_non_striker_id == dismissed_id:
-            aggregate.current_non_striker = None
+            aggregate.current_non_striker_id = None
         else:
             # Fallback (Edge case: retired hurt / timed out replacement logic might vary)
             # Default to clearing striker if ambiguity
             pass
-
-    # -------------------------
-    # FINALIZE
-    # -------------------------
-
-    aggregate.last_ball = ball
-    aggregate.save()
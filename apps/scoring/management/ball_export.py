@@ -0,0 +1,401 @@
+import csv
+import multiprocessing
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from django.core.management import load_command_class
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from scoring.management.export_worker import setup_worker
+from scoring.services import export_service
+from scoring.services.export_service import (
+    COLUMNAR_FORMATS,
+    iter_column_batches,
+    iter_csv_rows,
+    merge_columnar_shards,
+    merge_csv_shards,
+    open_columnar_writer,
+    plan_shards,
+)
+
+FORMAT_EXTENSIONS = {
+    "csv": "csv",
+    "parquet": "parquet",
+    "arrow": "arrow",
+    "feather": "feather",
+}
+
+PARTITION_FIELDS = {
+    "match": "match_id",
+    "innings": "innings_id",
+}
+
+# More shards than workers, so one large match does not leave the
+# other workers idle at the end
+SHARDS_PER_WORKER = 4
+
+
+def export_shard(command_module, options, partition_field, partition_ids, shard_path):
+    """
+    Process-pool entry point: export the balls of `partition_ids` to one
+    shard file. Returns (ball count, last watermark).
+    """
+    app_name, _, command_name = command_module.partition(".management.commands.")
+    command = load_command_class(app_name, command_name)
+    try:
+        return command.export_shard(
+            options, partition_field, partition_ids, shard_path
+        )
+    finally:
+        connections.close_all()
+
+
+class BallExportCommand(BaseCommand):
+    """
+    Shared options and writers for ball exports. Subclasses add their
+    scope arguments and return the scoped Ball queryset from
+    scope_balls().
+    """
+
+    default_output_stem = "ball_data_export"
+
+    def add_scope_arguments(self, parser):
+        raise NotImplementedError
+
+    def scope_balls(self, options):
+        """
+        (Ball queryset, label for messages).
+        """
+        raise NotImplementedError
+
+    def add_arguments(self, parser):
+        self.add_scope_arguments(parser)
+        parser.add_argument(
+            "--output",
+            help=(
+                f"Output path. Default: {self.default_output_stem}.<format>"
+            ),
+        )
+        parser.add_argument(
+            "--format",
+            choices=sorted(FORMAT_EXTENSIONS),
+            default="csv",
+            help=(
+                "csv (flat, JSON children), or parquet / arrow / feather "
+                "(typed columns, nested children; needs pyarrow). Default: csv"
+            ),
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Balls fetched (and prefetched) per database round. Default: 2000",
+        )
+        parser.add_argument(
+            "--since-created-at",
+            help="Only export balls after this watermark (ISO 8601 datetime)",
+        )
+        parser.add_argument(
+            "--since-ball-id",
+            help="Ball id at --since-created-at; breaks ties at that instant",
+        )
+        parser.add_argument(
+            "--append",
+            action="store_true",
+            help="Append to a CSV --output instead of replacing it (no second header)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Export shards on this many processes. Default: 1",
+        )
+        parser.add_argument(
+            "--partition",
+            choices=sorted(PARTITION_FIELDS),
+            help=(
+                "Shard the export by match or innings (the default shard "
+                "key when --workers > 1)"
+            ),
+        )
+        parser.add_argument(
+            "--no-merge",
+            action="store_true",
+            help=(
+                "Keep the shards as a partitioned dataset in the --output "
+                "directory instead of merging them into one file"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        fmt = options["format"]
+        if fmt in COLUMNAR_FORMATS:
+            if export_service.pyarrow is None:
+                raise CommandError(
+                    f"--format {fmt} needs pyarrow (see requirements.txt)"
+                )
+            if options["append"]:
+                raise CommandError(
+                    "--append is CSV only; write each increment to its own file"
+                )
+        if options["workers"] < 1:
+            raise CommandError("--workers must be at least 1")
+        partition = options["partition"]
+        if partition is None and options["workers"] > 1:
+            partition = "match"
+        if options["no_merge"] and partition is None:
+            raise CommandError("--no-merge needs --partition or --workers")
+        if options["no_merge"] and options["append"]:
+            raise CommandError("--append needs the shards merged")
+
+        output = Path(
+            options["output"]
+            or f"{self.default_output_stem}.{FORMAT_EXTENSIONS[fmt]}"
+        ).expanduser()
+        label = self.scope_label(options)
+
+        if partition is None:
+            exported, watermark = self.export_balls(
+                self.export_queryset(options),
+                output=output,
+                fmt=fmt,
+                append=options["append"],
+                chunk_size=options["chunk_size"],
+            )
+        else:
+            exported, watermark = self.export_partitioned(
+                options,
+                output=output,
+                fmt=fmt,
+                partition_field=PARTITION_FIELDS[partition],
+            )
+
+        if not exported:
+            if not options["since_created_at"]:
+                raise CommandError(f"No balls found for {label}")
+            self.stdout.write(
+                self.style.SUCCESS(f"No balls after the watermark for {label}")
+            )
+            return
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Exported {exported} balls for {label} to {output}")
+        )
+        last_created_at, last_ball_id = watermark
+        self.stdout.write(
+            "Resume with: "
+            f"--since-created-at {last_created_at.isoformat()} "
+            f"--since-ball-id {last_ball_id}"
+            + (" --append" if fmt == "csv" and not options["no_merge"] else "")
+        )
+
+    def scope_label(self, options):
+        return self.scope_balls(options)[1]
+
+    def export_queryset(self, options):
+        """
+        Scoped balls after the watermark, oldest first.
+        """
+        balls = self.scope_balls(options)[0].order_by("created_at", "id")
+        since = self.parse_watermark(options)
+        if since is not None:
+            since_created_at, since_ball_id = since
+            after = Q(created_at__gt=since_created_at)
+            if since_ball_id:
+                after |= Q(created_at=since_created_at, id__gt=since_ball_id)
+            balls = balls.filter(after)
+        return balls
+
+    def export_balls(self, balls, *, output, fmt, append, chunk_size):
+        if fmt == "csv":
+            return self.write_csv(
+                rows=iter_csv_rows(balls, chunk_size=chunk_size),
+                output=output,
+                append=append,
+                progress_every=chunk_size,
+            )
+        return self.write_columnar(
+            batches=iter_column_batches(balls, chunk_size=chunk_size),
+            output=output,
+            fmt=fmt,
+        )
+
+    def export_shard(self, options, partition_field, partition_ids, shard_path):
+        return self.export_balls(
+            self.export_queryset(options).filter(
+                **{f"{partition_field}__in": partition_ids}
+            ),
+            output=Path(shard_path),
+            fmt=options["format"],
+            append=False,
+            chunk_size=options["chunk_size"],
+        )
+
+    def export_partitioned(self, options, *, output, fmt, partition_field):
+        """
+        Export one shard per group of matches (or innings), on a process
+        pool when --workers > 1, then merge the shards into `output`
+        unless --no-merge keeps them as a partitioned dataset there.
+        """
+        workers = options["workers"]
+        shards = plan_shards(
+            self.export_queryset(options),
+            field=partition_field,
+            shard_count=workers * SHARDS_PER_WORKER,
+        )
+        if not shards:
+            return 0, None
+
+        if options["no_merge"]:
+            shard_dir = output
+            shard_dir.mkdir(parents=True, exist_ok=True)
+        else:
+            output.parent.mkdir(parents=True, exist_ok=True)
+            shard_dir = Path(tempfile.mkdtemp(
+                prefix=f".{output.name}.", dir=output.parent
+            ))
+        shard_paths = [
+            shard_dir / f"part-{index:05d}.{FORMAT_EXTENSIONS[fmt]}"
+            for index in range(len(shards))
+        ]
+        # Drop stdout/stderr streams; everything else pickles
+        worker_options = {
+            key: value for key, value in options.items()
+            if key not in ("stdout", "stderr")
+        }
+        tasks = [
+            (
+                type(self).__module__,
+                worker_options,
+                partition_field,
+                partition_ids,
+                str(shard_path),
+            )
+            for partition_ids, shard_path in zip(shards, shard_paths)
+        ]
+
+        try:
+            if workers == 1:
+                results = [self.export_shard(*task[1:]) for task in tasks]
+            else:
+                # Children open their own connections; none are inherited
+                connections.close_all()
+                database_names = {
+                    alias: connections[alias].settings_dict["NAME"]
+                    for alias in connections
+                }
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=setup_worker,
+                    initargs=(database_names,),
+                ) as pool:
+                    results = list(pool.map(export_shard, *zip(*tasks)))
+
+            written = [
+                path for path, (exported, _) in zip(shard_paths, results)
+                if exported
+            ]
+            if not options["no_merge"]:
+                self.stderr.write(f"Merging {len(written)} shards into {output}")
+                if fmt == "csv":
+                    merge_csv_shards(
+                        shard_paths=written,
+                        output=output,
+                        append=options["append"],
+                    )
+                else:
+                    merge_columnar_shards(
+                        shard_paths=written, output=output, fmt=fmt
+                    )
+        finally:
+            if not options["no_merge"]:
+                shutil.rmtree(shard_dir, ignore_errors=True)
+
+        exported = sum(count for count, _ in results)
+        watermarks = [watermark for _, watermark in results if watermark]
+        return exported, max(watermarks) if watermarks else None
+
+    def parse_watermark(self, options):
+        if not options["since_created_at"]:
+            if options["since_ball_id"]:
+                raise CommandError("--since-ball-id needs --since-created-at")
+            return None
+
+        since_created_at = parse_datetime(options["since_created_at"])
+        if since_created_at is None:
+            raise CommandError("--since-created-at must be an ISO 8601 datetime")
+        if timezone.is_naive(since_created_at):
+            since_created_at = timezone.make_aware(since_created_at)
+        return since_created_at, options["since_ball_id"]
+
+    def report_progress(self, *, exported, started):
+        elapsed = time.perf_counter() - started
+        self.stderr.write(
+            f"{exported} balls exported ({exported / elapsed:.0f} balls/s)"
+        )
+
+    def write_csv(self, *, rows, output, append, progress_every):
+        """
+        Write (watermark, row) pairs as they arrive; the file is only
+        opened once the first row exists, so an empty incremental run
+        leaves it untouched. Returns the row count and last watermark.
+        """
+        exported = 0
+        watermark = None
+        csvfile = None
+        started = time.perf_counter()
+        try:
+            for watermark, row in rows:
+                if csvfile is None:
+                    write_header = not (
+                        append and output.exists() and output.stat().st_size
+                    )
+                    output.parent.mkdir(parents=True, exist_ok=True)
+                    csvfile = output.open(
+                        "a" if append else "w", newline="", encoding="utf-8"
+                    )
+                    writer = csv.DictWriter(csvfile, fieldnames=list(row))
+                    if write_header:
+                        writer.writeheader()
+
+                writer.writerow(row)
+                exported += 1
+                if exported % progress_every == 0:
+                    self.report_progress(exported=exported, started=started)
+        finally:
+            if csvfile is not None:
+                csvfile.close()
+        return exported, watermark
+
+    def write_columnar(self, *, batches, output, fmt):
+        """
+        Write (watermark, RecordBatch) pairs as they arrive, opening the
+        file with the first batch. Returns the row count and last
+        watermark.
+        """
+        exported = 0
+        watermark = None
+        writer = None
+        started = time.perf_counter()
+        try:
+            for watermark, batch in batches:
+                if writer is None:
+                    output.parent.mkdir(parents=True, exist_ok=True)
+                    writer = open_columnar_writer(
+                        output=output, fmt=fmt, schema=batch.schema
+                    )
+                writer.write_batch(batch)
+                exported += batch.num_rows
+                self.report_progress(exported=exported, started=started)
+        finally:
+            if writer is not None:
+                writer.close()
+        return exported, watermark
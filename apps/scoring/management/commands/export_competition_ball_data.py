@@ -0,0 +1,23 @@
+from scoring.management.ball_export import BallExportCommand
+from scoring.models import Ball
+
+
+class Command(BallExportCommand):
+    help = (
+        "Export one row per ball for every match of a competition, in the "
+        "same formats and columns as export_ball_data_by_user."
+    )
+
+    default_output_stem = "competition_ball_data_export"
+
+    def add_scope_arguments(self, parser):
+        parser.add_argument(
+            "--competition-id", required=True, help="Competition id to export"
+        )
+
+    def scope_balls(self, options):
+        competition_id = options["competition_id"]
+        return (
+            Ball.objects.filter(match__competition_id=competition_id),
+            f"competition_id={competition_id}",
+        )
@@ -0,0 +1,79 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from scoring.models import Ball, BallTrajectory, BallTrajectoryPacked
+
+
+class Command(BaseCommand):
+    help = (
+        "Pack per-point BallTrajectory rows into one BallTrajectoryPacked "
+        "row per ball. Balls whose sequence indexes have gaps are left "
+        "as rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--match", dest="match_id",
+            help="Only pack this match",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=500,
+            help="Balls packed per transaction. Default: 500",
+        )
+        parser.add_argument(
+            "--delete-rows", action="store_true",
+            help="Delete the point rows of every ball that was packed",
+        )
+
+    def handle(self, *args, **options):
+        balls = (
+            Ball.objects.filter(
+                trajectory_points__isnull=False,
+                packed_trajectory__isnull=True,
+            )
+            .distinct()
+            .order_by("id")
+            .prefetch_related("trajectory_points")
+            .only("id")
+        )
+        if options["match_id"]:
+            balls = balls.filter(match_id=options["match_id"])
+
+        packed_balls = 0
+        packed_points = 0
+        skipped = 0
+        last_id = None
+        while True:
+            # Keyset by id: balls left as rows still match the filter
+            page = balls if last_id is None else balls.filter(id__gt=last_id)
+            batch = list(page[:options["batch_size"]])
+            if not batch:
+                break
+            last_id = batch[-1].id
+
+            rows = []
+            for ball in batch:
+                packed = BallTrajectoryPacked.from_points(
+                    ball=ball,
+                    points=ball.trajectory_points.all(),
+                )
+                if packed is None:
+                    skipped += 1
+                else:
+                    rows.append(packed)
+
+            with transaction.atomic():
+                BallTrajectoryPacked.objects.bulk_create(rows)
+                if options["delete_rows"]:
+                    BallTrajectory.objects.filter(
+                        ball_id__in=[row.ball_id for row in rows]
+                    ).delete()
+
+            packed_balls += len(rows)
+            packed_points += sum(row.point_count for row in rows)
+            self.stdout.write(f"{packed_balls} balls packed")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Packed {packed_points} points from {packed_balls} balls "
+            f"into {packed_points * 16} bytes; {skipped} balls left as rows"
+        ))
@@ -0,0 +1,17 @@
+"""
+Process-pool initializer for ball exports, kept apart from ball_export:
+that module imports models, so it can only be unpickled in a worker
+once Django is set up.
+"""
+import django
+from django.db import connections
+
+
+def setup_worker(database_names):
+    """
+    Set Django up against the databases the parent is connected to,
+    which the test runner renames.
+    """
+    django.setup()
+    for alias, name in database_names.items():
+        connections[alias].settings_dict["NAME"] = name
@@ -0,0 +1,30 @@
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("matches", "0003_match_match_referee_match_third_umpire_and_more"),
+        ("scoring", "0021_ballreleasedata_break_fields"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="InningsOverCheckpoint",
+            fields=[
+                ("id", models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ("over_number", models.PositiveIntegerField(help_text="1-based over number completed by this checkpoint")),
+                ("ball_number", models.PositiveIntegerField(help_text="ball_number of the over-ending delivery")),
+                ("state", models.JSONField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("ball", models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name="over_checkpoint", to="scoring.ball")),
+                ("innings", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="over_checkpoints", to="matches.innings")),
+            ],
+            options={
+                "unique_together": {("innings", "over_number")},
+                "indexes": [models.Index(fields=["innings", "ball_number"], name="scoring_inn_innings_8abd3c_idx")],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scoring", "0022_inningsovercheckpoint"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BallTrajectoryPacked",
+            fields=[
+                ("id", models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ("first_sequence_index", models.PositiveIntegerField(default=0)),
+                ("point_count", models.PositiveIntegerField()),
+                ("points", models.BinaryField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("ball", models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name="packed_trajectory", to="scoring.ball")),
+            ],
+        ),
+    ]
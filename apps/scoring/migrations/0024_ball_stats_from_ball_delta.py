@@ -0,0 +1,22 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scoring", "0023_balltrajectorypacked"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ball",
+            name="stats_from_ball_delta",
+            field=models.BooleanField(
+                default=False,
+                help_text=(
+                    "Its share of the stored aggregate and stats was built by the "
+                    "ball-by-ball statistics delta, so undo can subtract it"
+                ),
+            ),
+        ),
+    ]
@@ -3,7 +3,7 @@ from .ball import Ball
 from .wicket import BallWicket
 from .analytics import BallAnalytics
 from .spatial import BallSpatialOutcome
-from .trajectory import BallTrajectory
+from .trajectory import BallTrajectory, BallTrajectoryPacked
 from .release import BallReleaseData
 from .video import BallVideo
 from .aggregates import InningsAggregate
@@ -12,3 +12,4 @@ from .bowler_stats import BowlerStats
 from .fielding import BallFielding
 from .drs import BallDRS
 from .penalty import InningsPenalty
+from .checkpoint import InningsOverCheckpoint
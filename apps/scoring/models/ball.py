@@ -150,6 +150,15 @@ class Ball(models.Model):
 
     edit_later = models.BooleanField(default=False)
 
+    # Derived statistics bookkeeping
+    stats_from_ball_delta = models.BooleanField(
+        default=False,
+        help_text=(
+            "Its share of the stored aggregate and stats was built by the "
+            "ball-by-ball statistics delta, so undo can subtract it"
+        )
+    )
+
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
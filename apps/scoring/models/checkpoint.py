@@ -0,0 +1,49 @@
+import uuid
+from django.db import models
+from .ball import Ball
+from matches.models import Innings
+
+class InningsOverCheckpoint(models.Model):
+    """
+    Derived snapshot of innings state at the end of a completed over.
+    Rebuildable from ball history; lets replays start mid-innings.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    innings = models.ForeignKey(
+        Innings,
+        on_delete=models.CASCADE,
+        related_name="over_checkpoints"
+    )
+
+    over_number = models.PositiveIntegerField(
+        help_text="1-based over number completed by this checkpoint"
+    )
+
+    # Ball that completed the over; undoing it drops the checkpoint
+    ball = models.OneToOneField(
+        Ball,
+        on_delete=models.CASCADE,
+        related_name="over_checkpoint"
+    )
+
+    ball_number = models.PositiveIntegerField(
+        help_text="ball_number of the over-ending delivery"
+    )
+
+    # Packed totals, participants and cumulative stat vectors
+    state = models.JSONField()
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = (
+            ("innings", "over_number"),
+        )
+        indexes = [
+            models.Index(fields=["innings", "ball_number"]),
+        ]
+
+    def __str__(self):
+        return f"Innings {self.innings_id} checkpoint after over {self.over_number}"
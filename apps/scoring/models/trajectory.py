@@ -1,7 +1,17 @@
+import math
+import sys
 import uuid
+from array import array
+from django.core.exceptions import ImproperlyConfigured
 from django.db import models
 from scoring.models import Ball
 
+try:
+    import numpy
+except ImportError:  # optional: as_points() decodes without it
+    numpy = None
+
+
 class BallTrajectory(models.Model):
     """
     Time-sequenced tracking points for a ball's flight.
@@ -54,3 +64,121 @@ class BallTrajectory(models.Model):
 
     def __str__(self):
         return f"Trajectory point {self.sequence_index} for Ball {self.ball_id}"
+
+
+POINT_FIELDS = ("sequence_index", "x", "y", "z", "time_ms")
+
+
+def stored_point_values(point):
+    return {
+        name: BallTrajectory._meta.get_field(name).to_python(
+            getattr(point, name)
+        )
+        for name in POINT_FIELDS
+    }
+
+
+def from_float32(value):
+    """
+    Shortest decimal that is stored as the same float32, so 0.1 reads
+    back as 0.1 rather than 0.10000000149011612.
+    """
+    for digits in range(1, 9):
+        candidate = float(f"{value:.{digits}g}")
+        if array("f", (candidate,))[0] == value:
+            return candidate
+    return value
+
+
+class BallTrajectoryPacked(models.Model):
+    """
+    A ball's whole trajectory in one row: little-endian float32
+    (x, y, z, time_ms) per point, in sequence_index order starting at
+    first_sequence_index. Missing z or time_ms are stored as NaN.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    ball = models.OneToOneField(
+        Ball,
+        on_delete=models.CASCADE,
+        related_name="packed_trajectory"
+    )
+
+    first_sequence_index = models.PositiveIntegerField(default=0)
+    point_count = models.PositiveIntegerField()
+
+    points = models.BinaryField()
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Packed trajectory ({self.point_count} points) for Ball {self.ball_id}"
+
+    @classmethod
+    def from_points(cls, *, ball, points):
+        """
+        Unsaved packed row for `points` (objects with the BallTrajectory
+        fields), or None when their sequence indexes are not contiguous.
+        Values are coerced as the row fields would ("0.5" -> 0.5).
+        """
+        points = sorted(
+            (stored_point_values(point) for point in points),
+            key=lambda point: point["sequence_index"],
+        )
+        first = points[0]["sequence_index"] if points else 0
+        if any(
+            point["sequence_index"] != first + offset
+            for offset, point in enumerate(points)
+        ):
+            return None
+
+        values = array("f")
+        for point in points:
+            values.extend((
+                point["x"],
+                point["y"],
+                math.nan if point["z"] is None else point["z"],
+                math.nan if point["time_ms"] is None else point["time_ms"],
+            ))
+        if sys.byteorder == "big":
+            values.byteswap()
+        return cls(
+            ball=ball,
+            first_sequence_index=first,
+            point_count=len(points),
+            points=values.tobytes(),
+        )
+
+    def as_array(self):
+        """
+        (point_count, 4) float32 view over the stored bytes; needs numpy.
+        """
+        if numpy is None:
+            raise ImproperlyConfigured("numpy is required for as_array()")
+        return numpy.frombuffer(self.points, dtype="<f4").reshape(-1, 4)
+
+    def as_points(self):
+        """
+        Point dicts with the BallTrajectory field names.
+        """
+        values = memoryview(self.points).cast("f")
+        if sys.byteorder == "big":
+            swapped = array("f", values)
+            swapped.byteswap()
+            values = swapped
+        return [
+            {
+                "sequence_index": self.first_sequence_index + offset,
+                "x": from_float32(values[start]),
+                "y": from_float32(values[start + 1]),
+                "z": (
+                    None if math.isnan(values[start + 2])
+                    else from_float32(values[start + 2])
+                ),
+                "time_ms": (
+                    None if math.isnan(values[start + 3]) else int(values[start + 3])
+                ),
+            }
+            for offset, start in enumerate(range(0, len(values), 4))
+        ]
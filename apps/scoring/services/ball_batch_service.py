@@ -0,0 +1,305 @@
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from matches.models import Innings, PlayingXI
+from scoring.models.ball import Ball
+from scoring.models.wicket import BallWicket
+from scoring.models.aggregates import InningsAggregate
+from scoring.models.batter_stats import BatterStats
+from scoring.models.bowler_stats import BowlerStats
+from scoring.engine.scoring_engine import apply_ball_impact
+from scoring.services.ball_service import build_ball_and_sub_records
+from ballbyball.services.record_match_changes import (
+    ball_change,
+    projected_entries,
+    record_match_changes,
+    summarize_score,
+)
+from ballbyball.services.write_ball_entry_projections import (
+    write_ball_entry_projections,
+)
+
+PARTICIPANT_SLOTS = (
+    ("striker", "current_striker_id"),
+    ("non_striker", "current_non_striker_id"),
+    ("bowler", "current_bowler_id"),
+)
+
+BATTER_STAT_FIELDS = ["runs", "balls", "fours", "sixes"]
+BOWLER_STAT_FIELDS = ["runs_conceded", "balls", "wickets"]
+
+
+class InningsBatchState:
+    """
+    Everything submit_ball reads from the database for one innings,
+    loaded once and advanced in memory ball by ball.
+    """
+
+    def __init__(self, innings):
+        self.innings = innings
+        self.balls_per_over = innings.match.match_type.balls_per_over
+        self.aggregate = InningsAggregate.objects.select_for_update().get(
+            innings=innings
+        )
+        self.last_ball_number = (
+            Ball.objects.filter(innings=innings)
+            .order_by("-ball_number")
+            .values_list("ball_number", flat=True)
+            .first()
+        ) or 0
+
+        xi = {}
+        for team_id, player_id in PlayingXI.objects.filter(
+            match_id=innings.match_id,
+            team_id__in=(innings.batting_team_id, innings.bowling_team_id),
+        ).values_list("team_id", "player_id"):
+            xi.setdefault(team_id, set()).add(player_id)
+        self.batting_xi = xi.get(innings.batting_team_id, set())
+        self.bowling_xi = xi.get(innings.bowling_team_id, set())
+        self.dismissed_ids = set(
+            BallWicket.objects.filter(ball__innings=innings)
+            .values_list("dismissed_player_id", flat=True)
+        )
+
+        self.batter_stats = {
+            stats.player_id: stats
+            for stats in BatterStats.objects.filter(innings=innings)
+        }
+        self.bowler_stats = {
+            stats.player_id: stats
+            for stats in BowlerStats.objects.filter(innings=innings)
+        }
+        self.existing_batter_ids = set(self.batter_stats)
+        self.existing_bowler_ids = set(self.bowler_stats)
+        self.touched_batter_ids = set()
+        self.touched_bowler_ids = set()
+        self.balls = []
+        self.child_records = []
+
+    def validate_participants(self, ball_data):
+        """
+        Same rule as submit_ball, except that a slot the engine vacated
+        (new over, dismissed batter) is filled by the player the
+        offline scorer picked, who must be in the Playing XI.
+        """
+        if ball_data["striker"] == ball_data["non_striker"]:
+            raise ValueError("Striker and non-striker cannot be the same")
+
+        for key, slot in PARTICIPANT_SLOTS:
+            current = getattr(self.aggregate, slot)
+            if current is None:
+                xi = self.bowling_xi if key == "bowler" else self.batting_xi
+                if ball_data[key] not in xi:
+                    raise ValueError(f"New {key} is not in the Playing XI")
+                if key != "bowler" and ball_data[key] in self.dismissed_ids:
+                    raise ValueError(f"New {key} has already been dismissed")
+            elif ball_data[key] != current:
+                raise ValueError("Participants do not match current innings state")
+
+    def apply(self, ball_data, *, user):
+        """
+        Validate one ball and fold it into the in-memory state. Nothing
+        is changed when it raises. Returns the unsaved ball and
+        sub-records.
+        """
+        if ball_data["ball_number"] != self.last_ball_number + 1:
+            raise ValueError("Invalid ball number sequence")
+        self.validate_participants(ball_data)
+
+        ball, sub_records = build_ball_and_sub_records(
+            ball_data, user=user, innings=self.innings
+        )
+        for key, slot in PARTICIPANT_SLOTS:
+            setattr(self.aggregate, slot, ball_data[key])
+
+        striker_id, bowler_id = ball.striker_id, ball.bowler_id
+        if striker_id not in self.batter_stats:
+            self.batter_stats[striker_id] = BatterStats(
+                innings=self.innings, player_id=striker_id
+            )
+        if bowler_id not in self.bowler_stats:
+            self.bowler_stats[bowler_id] = BowlerStats(
+                innings=self.innings, player_id=bowler_id
+            )
+
+        wicket = next(
+            (record for record in sub_records if isinstance(record, BallWicket)),
+            None,
+        )
+        apply_ball_impact(
+            aggregate=self.aggregate,
+            batter_stats=self.batter_stats[striker_id],
+            bowler_stats=self.bowler_stats[bowler_id],
+            ball=ball,
+            wicket=wicket,
+            balls_per_over=self.balls_per_over,
+        )
+        self.touched_batter_ids.add(striker_id)
+        self.touched_bowler_ids.add(bowler_id)
+        if wicket:
+            self.dismissed_ids.add(wicket.dismissed_player_id)
+        self.aggregate.last_ball = ball
+        self.last_ball_number = ball.ball_number
+        self.balls.append(ball)
+        self.child_records.extend(sub_records)
+        return ball, sub_records
+
+    def save(self):
+        """
+        Insert new stats rows, update only the existing rows this batch
+        touched, and save the aggregate once.
+        """
+        for model, stats, existing_ids, touched_ids, fields in (
+            (
+                BatterStats, self.batter_stats,
+                self.existing_batter_ids, self.touched_batter_ids,
+                BATTER_STAT_FIELDS,
+            ),
+            (
+                BowlerStats, self.bowler_stats,
+                self.existing_bowler_ids, self.touched_bowler_ids,
+                BOWLER_STAT_FIELDS,
+            ),
+        ):
+            model.objects.bulk_create(
+                stats[player_id] for player_id in touched_ids - existing_ids
+            )
+            model.objects.bulk_update(
+                [stats[player_id] for player_id in touched_ids & existing_ids],
+                fields,
+            )
+        self.aggregate.save()
+
+
+def to_primary_key(key, value):
+    target_field = Ball._meta.get_field(key).target_field
+    try:
+        return target_field.to_python(value)
+    except ValidationError as e:
+        raise ValueError(f"{key}: {' '.join(e.messages)}")
+
+
+def coerce_ball_payload(ball_data):
+    """
+    Offline payloads arrive as plain JSON: ids as strings, numbers as
+    whatever the client sent.
+    """
+    ball_data = dict(ball_data)
+    for key in ("innings", "striker", "non_striker", "bowler"):
+        ball_data[key] = to_primary_key(key, ball_data[key])
+    for key in ("ball_number", "over_number", "ball_in_over"):
+        ball_data[key] = int(ball_data[key])
+    ball_data["runs"] = {
+        key: int(value) for key, value in (ball_data.get("runs") or {}).items()
+    }
+    # The engine compares the dismissed player against the live batters
+    wicket = ball_data.get("wicket")
+    if wicket and wicket.get("dismissed_player_id") is not None:
+        ball_data["wicket"] = {
+            **wicket,
+            "dismissed_player_id": BallWicket._meta.get_field(
+                "dismissed_player"
+            ).target_field.to_python(wicket["dismissed_player_id"]),
+        }
+    return ball_data
+
+
+def load_innings(ball_payloads, *, match):
+    """
+    The match's innings referenced by the payloads, by id.
+    """
+    innings_ids = set()
+    for ball_data in ball_payloads:
+        try:
+            innings_ids.add(to_primary_key("innings", ball_data["innings"]))
+        except (KeyError, TypeError, ValueError):
+            continue  # reported at its offset
+    return Innings.objects.select_related(
+        "match__match_type", "batting_team", "bowling_team"
+    ).filter(match=match).in_bulk(innings_ids)
+
+
+@transaction.atomic
+def submit_ball_batch(ball_payloads, user, *, match) -> dict:
+    """
+    Bulk counterpart of submit_ball for offline sync.
+
+    Validates the balls in order against in-memory innings state, stops
+    at the first invalid one, and persists the valid prefix: one bulk
+    insert per table, stats and aggregates written once per innings,
+    feed projections per innings, and one BALL change per applied ball.
+    Returns the applied ball ids plus the failing offset and error (None
+    when every ball applied).
+    """
+
+    innings_by_id = load_innings(ball_payloads, match=match)
+    states = {}
+    applied = []
+    failed_offset = error = None
+
+    for offset, ball_data in enumerate(ball_payloads):
+        try:
+            ball_data = coerce_ball_payload(ball_data)
+            innings = innings_by_id.get(ball_data["innings"])
+            if innings is None:
+                raise ValueError("Innings not found in this match")
+            if innings.match.state != "IN_PROGRESS":
+                raise ValueError("Match is not in progress")
+            if innings.state != "ACTIVE":
+                raise ValueError("Innings is not active")
+
+            if innings.id not in states:
+                try:
+                    states[innings.id] = InningsBatchState(innings)
+                except InningsAggregate.DoesNotExist:
+                    raise ValueError("Innings has not been set up")
+            state = states[innings.id]
+            ball, _ = state.apply(ball_data, user=user)
+            # Score after this ball, for its change
+            applied.append(
+                (state, ball, summarize_score(state.aggregate))
+            )
+        except KeyError as e:
+            failed_offset, error = offset, f"Missing field {e}"
+            break
+        except (TypeError, ValueError) as e:
+            failed_offset, error = offset, str(e)
+            break
+
+    balls = [ball for _, ball, _ in applied]
+    Ball.objects.bulk_create(balls)
+
+    sub_records = {}
+    for state in states.values():
+        for record in state.child_records:
+            sub_records.setdefault(type(record), []).append(record)
+    for model, records in sub_records.items():
+        model.objects.bulk_create(records)
+
+    entries = {}
+    for state in states.values():
+        state.save()
+        if not state.balls:
+            continue
+        entries.update(projected_entries(
+            write_ball_entry_projections(
+                innings=state.innings,
+                balls=state.balls,
+                child_records=state.child_records,
+            )
+        ))
+
+    record_match_changes(
+        match_id=match.id,
+        changes=[
+            ball_change(innings=state.innings, balls=[ball], score=score)
+            for state, ball, score in applied
+        ],
+        entries=entries,
+    )
+
+    return {
+        "applied_ball_ids": [ball.id for ball in balls],
+        "failed_offset": failed_offset,
+        "error": error,
+    }
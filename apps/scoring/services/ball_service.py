@@ -15,6 +15,16 @@ from scoring.models.aggregates import InningsAggregate
 from scoring.engine.scoring_engine import apply_scoring_engine
 from scoring.engine.ball_outcome import build_ball_outcome
 
+# Payload key -> sub-record model, in insert order (DRS is mapped separately)
+SUB_RECORD_MODELS = (
+    ("wicket", BallWicket),
+    ("analytics", BallAnalytics),
+    ("spatial", BallSpatialOutcome),
+    ("trajectory", BallTrajectory),
+    ("release", BallReleaseData),
+    ("video", BallVideo),
+)
+
 @transaction.atomic
 def submit_ball(ball_data: dict, user) -> UUID:
     """
@@ -59,10 +69,27 @@ def submit_ball(ball_data: dict, user) -> UUID:
     if ball_data["ball_number"] != expected_ball_number:
         raise ValueError("Invalid ball number sequence")
 
-    # Create Ball
-    ball = Ball.objects.create(
+    ball, sub_records = build_ball_and_sub_records(
+        ball_data, user=user, innings=innings
+    )
+    ball.save(force_insert=True)
+    for record in sub_records:
+        record.save(force_insert=True)
+
+    apply_scoring_engine(ball.id)
+
+    return ball.id
+
+
+def build_ball_and_sub_records(ball_data: dict, *, user, innings):
+    """
+    Unsaved Ball and optional sub-records for one submitted payload.
+    Shared by submit_ball and the bulk sync path.
+    """
+
+    ball = Ball(
         user=user,
-        match=match,
+        match=innings.match,
         innings=innings,
         batting_team=innings.batting_team,
         bowling_team=innings.bowling_team,
@@ -85,41 +112,10 @@ def submit_ball(ball_data: dict, user) -> UUID:
     )
 
     # Optional sub-records
-    if ball_data.get("wicket"):
-        BallWicket.objects.create(
-            ball=ball,
-            **ball_data["wicket"]
-        )
-
-    if ball_data.get("analytics"):
-        BallAnalytics.objects.create(
-            ball=ball,
-            **ball_data["analytics"]
-        )
-
-    if ball_data.get("spatial"):
-        BallSpatialOutcome.objects.create(
-            ball=ball,
-            **ball_data["spatial"]
-        )
-
-    if ball_data.get("trajectory"):
-        BallTrajectory.objects.create(
-            ball=ball,
-            **ball_data["trajectory"]
-        )
-
-    if ball_data.get("release"):
-        BallReleaseData.objects.create(
-            ball=ball,
-            **ball_data["release"]
-        )
-
-    if ball_data.get("video"):
-        BallVideo.objects.create(
-            ball=ball,
-            **ball_data["video"]
-        )
+    sub_records = []
+    for key, model in SUB_RECORD_MODELS:
+        if ball_data.get(key):
+            sub_records.append(model(ball=ball, **ball_data[key]))
 
     if ball_data.get("drs"):
         drs_payload = ball_data["drs"].copy()
@@ -131,11 +127,6 @@ def submit_ball(ball_data: dict, user) -> UUID:
             )
         if "third_umpire" in drs_payload:
             drs_payload["third_umpire_id"] = drs_payload.pop("third_umpire")
-        BallDRS.objects.create(
-            ball=ball,
-            **drs_payload
-        )
+        sub_records.append(BallDRS(ball=ball, **drs_payload))
 
-    apply_scoring_engine(ball.id)
-
-    return ball.id
+    return ball, sub_records
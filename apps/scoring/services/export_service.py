@@ -0,0 +1,486 @@
+"""
+Ball exports: one row per ball, oldest first by (created_at, id).
+
+CSV rows flatten every one-to-one child into prefixed columns and embed
+trajectory and fieldings as JSON. Columnar batches (Parquet / Arrow IPC)
+are built straight from values() with typed columns, and carry
+trajectory and fieldings as nested list columns.
+
+Large exports are split into shards by match or innings, written
+independently (possibly on worker processes) and merged afterwards.
+"""
+import heapq
+import json
+import shutil
+import uuid
+from itertools import islice
+
+from django.db import models
+from django.db.models import Count
+
+from scoring.models import (
+    Ball,
+    BallWicket,
+    BallAnalytics,
+    BallSpatialOutcome,
+    BallReleaseData,
+    BallVideo,
+    BallDRS,
+    BallTrajectory,
+    BallTrajectoryPacked,
+    BallFielding,
+)
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # optional: only the columnar formats need it
+    pyarrow = None
+
+BALL_FIELDS = (
+    "id",
+    "user_id",
+    "match_id",
+    "innings_id",
+    "ball_number",
+    "over_number",
+    "ball_in_over",
+    "is_legal_delivery",
+    "batting_team_id",
+    "bowling_team_id",
+    "striker_id",
+    "non_striker_id",
+    "bowler_id",
+    "umpire_bowler_end_id",
+    "umpire_square_leg_id",
+    "striker_hand",
+    "bowler_hand",
+    "runs_off_bat",
+    "completed_runs",
+    "extra_runs",
+    "bye_runs",
+    "leg_bye_runs",
+    "wide_runs",
+    "no_ball_runs",
+    "penalty_runs",
+    "overthrow_runs",
+    "is_boundary",
+    "is_short_run",
+    "is_quick_running",
+    "is_free_hit",
+    "no_ball_type",
+    "edit_later",
+    "created_at",
+)
+
+# (column prefix, Ball accessor, model, fields)
+ONE_TO_ONE_EXPORTS = (
+    ("wicket", "wicket", BallWicket, (
+        "id",
+        "wicket_type",
+        "dismissed_player_id",
+        "dismissed_by_id",
+        "caught_by_id",
+        "stumped_by_id",
+        "run_out_fielder_1_id",
+        "run_out_fielder_2_id",
+        "decision_given_by_umpire_id",
+        "created_at",
+    )),
+    ("analytics", "analytics", BallAnalytics, (
+        "id",
+        "delivery_type",
+        "foot_movement",
+        "air_movement",
+        "control",
+        "shot_connection",
+        "bat_subject",
+        "stroke",
+        "keeper_activity",
+        "fielding_activity",
+        "batsman_activity",
+        "umpire_activity",
+        "created_at",
+    )),
+    ("spatial", "spatial_outcome", BallSpatialOutcome, (
+        "id",
+        "shot_zone_x",
+        "shot_zone_y",
+        "wagon_wheel_x",
+        "wagon_wheel_y",
+        "pitch_zone",
+        "stump_zone",
+        "height_zone",
+        "batter_stump_zone",
+        "structured_region_id",
+        "structured_slice_index",
+        "structured_band_index",
+        "structured_position",
+        "created_at",
+    )),
+    ("release", "release_data", BallReleaseData, (
+        "id",
+        "bowler_release_x",
+        "bowler_release_y",
+        "bowler_release_position",
+        "wicket_keeper_position",
+        "ball_type",
+        "is_break",
+        "break_type",
+        "created_at",
+    )),
+    ("video", "video", BallVideo, (
+        "id",
+        "video_source_id",
+        "video_start_ms",
+        "video_end_ms",
+        "camera_angle",
+        "created_at",
+    )),
+    ("drs", "drs", BallDRS, (
+        "id",
+        "is_appealed",
+        "review_team_id",
+        "review_team_side",
+        "on_field_decision",
+        "overruled",
+        "final_decision",
+        "decision_given_by_umpire_id",
+        "third_umpire_id",
+        "created_at",
+    )),
+)
+
+TRAJECTORY_FIELDS = ("sequence_index", "x", "y", "z", "time_ms")
+
+FIELDING_FIELDS = (
+    "player_id",
+    "fielder2_id",
+    "action",
+    "fielding_position",
+    "runs_saved",
+    "runs_misfielded",
+    "overthrow_runs",
+    "difficulty",
+)
+
+COLUMNAR_FORMATS = ("parquet", "arrow", "feather")
+
+
+def value_or_empty(value):
+    return "" if value is None else value
+
+
+def ball_watermark(ball):
+    return ball.created_at, ball.id
+
+
+# Sharding
+
+
+def plan_shards(balls, *, field, shard_count):
+    """
+    Split the distinct `field` values of `balls` (match_id, innings_id)
+    into at most `shard_count` lists of similar ball counts: largest
+    partitions first, each onto the lightest shard so far.
+    """
+    sizes = (
+        balls.order_by()
+        .values(field)
+        .annotate(ball_count=Count("id"))
+        .order_by("-ball_count", field)
+    )
+    shards = []
+    heap = []
+    for size in sizes:
+        if len(shards) < shard_count:
+            shards.append([size[field]])
+            heapq.heappush(heap, (size["ball_count"], len(shards) - 1))
+            continue
+        ball_count, index = heapq.heappop(heap)
+        shards[index].append(size[field])
+        heapq.heappush(heap, (ball_count + size["ball_count"], index))
+    return shards
+
+
+def merge_csv_shards(*, shard_paths, output, append):
+    """
+    Concatenate CSV shards into `output` under a single header (none
+    when appending to a non-empty file).
+    """
+    write_header = not (append and output.exists() and output.stat().st_size)
+    with output.open("a" if append else "w", newline="", encoding="utf-8") as merged:
+        for shard_path in shard_paths:
+            with shard_path.open(newline="", encoding="utf-8") as shard:
+                header = shard.readline()
+                if write_header:
+                    merged.write(header)
+                    write_header = False
+                shutil.copyfileobj(shard, merged)
+
+
+def read_columnar_batches(shard_path, *, fmt):
+    if fmt == "parquet":
+        yield from pyarrow.parquet.ParquetFile(str(shard_path)).iter_batches()
+        return
+    with pyarrow.ipc.open_file(str(shard_path)) as reader:
+        for index in range(reader.num_record_batches):
+            yield reader.get_batch(index)
+
+
+def merge_columnar_shards(*, shard_paths, output, fmt):
+    """
+    Stream every record batch of the shards into one file.
+    """
+    writer = open_columnar_writer(output=output, fmt=fmt, schema=arrow_schema())
+    try:
+        for shard_path in shard_paths:
+            for batch in read_columnar_batches(shard_path, fmt=fmt):
+                writer.write_batch(batch)
+    finally:
+        writer.close()
+
+
+# CSV
+
+
+def csv_export_queryset(balls):
+    """
+    `balls` with every child the CSV row reads; only ids of players,
+    teams and umpires are exported, so those are not joined.
+    """
+    return balls.select_related(
+        *(accessor for _, accessor, _, _ in ONE_TO_ONE_EXPORTS),
+        "packed_trajectory",
+    ).prefetch_related("trajectory_points", "fieldings")
+
+
+def build_csv_row(ball):
+    row = {
+        f"ball_{field}": value_or_empty(getattr(ball, field))
+        for field in BALL_FIELDS
+    }
+
+    for prefix, accessor, _, fields in ONE_TO_ONE_EXPORTS:
+        instance = getattr(ball, accessor, None)
+        for field in fields:
+            row[f"{prefix}_{field}"] = (
+                "" if instance is None
+                else value_or_empty(getattr(instance, field, ""))
+            )
+
+    packed = getattr(ball, "packed_trajectory", None)
+    if packed:
+        # Packed points have no row id of their own
+        trajectory_points = [
+            {
+                "id": None,
+                **point,
+                "created_at": packed.created_at.isoformat(),
+            }
+            for point in packed.as_points()
+        ]
+    else:
+        trajectory_points = [
+            {
+                "id": str(point.id),
+                "sequence_index": point.sequence_index,
+                "x": point.x,
+                "y": point.y,
+                "z": point.z,
+                "time_ms": point.time_ms,
+                "created_at": point.created_at.isoformat()
+                if point.created_at
+                else None,
+            }
+            for point in ball.trajectory_points.all()
+        ]
+    row["trajectory_count"] = len(trajectory_points)
+    row["trajectory_points_json"] = json.dumps(
+        trajectory_points,
+        ensure_ascii=True,
+    )
+
+    fieldings = list(ball.fieldings.all())
+    row["fielding_count"] = len(fieldings)
+    row["fieldings_json"] = json.dumps(
+        [
+            {
+                "id": str(fielding.id),
+                "player_id": str(fielding.player_id) if fielding.player_id else None,
+                "fielder2_id": str(fielding.fielder2_id)
+                if fielding.fielder2_id
+                else None,
+                "action": fielding.action,
+                "fielding_position": fielding.fielding_position,
+                "runs_saved": fielding.runs_saved,
+                "runs_misfielded": fielding.runs_misfielded,
+                "overthrow_runs": fielding.overthrow_runs,
+                "difficulty": fielding.difficulty,
+                "created_at": fielding.created_at.isoformat()
+                if fielding.created_at
+                else None,
+            }
+            for fielding in fieldings
+        ],
+        ensure_ascii=True,
+    )
+
+    return row
+
+
+def iter_csv_rows(balls, *, chunk_size):
+    """
+    (watermark, row) per ball; children are prefetched per chunk.
+    """
+    for ball in csv_export_queryset(balls).iterator(chunk_size=chunk_size):
+        yield ball_watermark(ball), build_csv_row(ball)
+
+
+# Columnar
+
+
+def arrow_type(field):
+    if field.is_relation:
+        field = field.target_field
+    if isinstance(field, models.UUIDField):
+        return pyarrow.string()
+    if isinstance(field, models.BooleanField):
+        return pyarrow.bool_()
+    if isinstance(field, (models.BigIntegerField, models.BigAutoField)):
+        return pyarrow.int64()
+    if isinstance(field, (models.IntegerField, models.AutoField)):
+        return pyarrow.int32()
+    if isinstance(field, models.FloatField):
+        return pyarrow.float64()
+    if isinstance(field, models.DateTimeField):
+        return pyarrow.timestamp("us", tz="UTC")
+    if isinstance(field, models.DateField):
+        return pyarrow.date32()
+    return pyarrow.string()
+
+
+def model_field(model, name):
+    """
+    Field by name or attname ("player_id").
+    """
+    for field in model._meta.concrete_fields:
+        if name in (field.name, field.attname):
+            return field
+    raise LookupError(f"{model.__name__} has no field {name}")
+
+
+def columnar_columns():
+    """
+    (column name, values() path, model field) per scalar column.
+    """
+    columns = [
+        (f"ball_{name}", name, model_field(Ball, name))
+        for name in BALL_FIELDS
+    ]
+    for prefix, accessor, model, fields in ONE_TO_ONE_EXPORTS:
+        columns.extend(
+            (f"{prefix}_{name}", f"{accessor}__{name}", model_field(model, name))
+            for name in fields
+        )
+    return columns
+
+
+def struct_type(model, fields):
+    return pyarrow.struct([
+        (name, arrow_type(model_field(model, name))) for name in fields
+    ])
+
+
+def arrow_schema():
+    return pyarrow.schema(
+        [
+            (column, arrow_type(field))
+            for column, _, field in columnar_columns()
+        ] + [
+            ("trajectory", pyarrow.list_(
+                struct_type(BallTrajectory, TRAJECTORY_FIELDS)
+            )),
+            ("fieldings", pyarrow.list_(
+                struct_type(BallFielding, FIELDING_FIELDS)
+            )),
+        ]
+    )
+
+
+def to_arrow_value(value):
+    # UUIDs go out as strings; everything else converts as-is
+    return str(value) if isinstance(value, uuid.UUID) else value
+
+
+def load_nested_children(ball_ids):
+    trajectories = {ball_id: [] for ball_id in ball_ids}
+    for packed in BallTrajectoryPacked.objects.filter(ball_id__in=ball_ids):
+        trajectories[packed.ball_id] = packed.as_points()
+    # Packed balls whose point rows were kept ignore those rows
+    unpacked_ids = [
+        ball_id for ball_id in ball_ids if not trajectories[ball_id]
+    ]
+    for point in (
+        BallTrajectory.objects.filter(ball_id__in=unpacked_ids)
+        .order_by("ball_id", "sequence_index")
+        .values("ball_id", *TRAJECTORY_FIELDS)
+    ):
+        trajectories[point.pop("ball_id")].append(point)
+
+    fieldings = {ball_id: [] for ball_id in ball_ids}
+    for fielding in (
+        BallFielding.objects.filter(ball_id__in=ball_ids)
+        .order_by("created_at")
+        .values("ball_id", *FIELDING_FIELDS)
+    ):
+        ball_id = fielding.pop("ball_id")
+        fieldings[ball_id].append({
+            name: to_arrow_value(value) for name, value in fielding.items()
+        })
+    return trajectories, fieldings
+
+
+def iter_column_batches(balls, *, chunk_size):
+    """
+    (watermark, pyarrow.RecordBatch) per chunk of `balls`: one values()
+    fetch for the scalar columns and one query per nested child table.
+    """
+    columns = columnar_columns()
+    schema = arrow_schema()
+    rows = balls.values(*(path for _, path, _ in columns)).iterator(
+        chunk_size=chunk_size
+    )
+    while True:
+        batch = list(islice(rows, chunk_size))
+        if not batch:
+            return
+        ball_ids = [row["id"] for row in batch]
+        trajectories, fieldings = load_nested_children(ball_ids)
+
+        data = {
+            column: [to_arrow_value(row[path]) for row in batch]
+            for column, path, _ in columns
+        }
+        data["trajectory"] = [trajectories[ball_id] for ball_id in ball_ids]
+        data["fieldings"] = [fieldings[ball_id] for ball_id in ball_ids]
+        yield (
+            (batch[-1]["created_at"], batch[-1]["id"]),
+            pyarrow.RecordBatch.from_pydict(data, schema=schema),
+        )
+
+
+def open_columnar_writer(*, output, fmt, schema):
+    """
+    Parquet, or the Arrow IPC file format (Feather v2 is the same file).
+    """
+    if fmt == "parquet":
+        return pyarrow.parquet.ParquetWriter(
+            str(output), schema, compression="zstd"
+        )
+    return pyarrow.ipc.new_file(
+        str(output),
+        schema,
+        options=pyarrow.ipc.IpcWriteOptions(compression="zstd"),
+    )
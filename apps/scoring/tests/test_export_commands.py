@@ -0,0 +1,264 @@
+import csv
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import skipUnless
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from competitions.models import Tournament, Competition
+from matches.models import Match, Innings, MatchType
+from scoring.models import Ball, BallTrajectory, BallFielding
+from coredata.models import Nationality, Team, Player
+from accounts.models import User
+from scoring.services.export_service import pyarrow
+
+
+class BallExportTestMixin:
+    def setUp(self):
+        self.user = User.objects.create_user(username="exporter", password="password")
+        self.nat = Nationality.objects.create(name="ExportLand", code="EXL")
+        self.team1 = Team.objects.create(name="E Team 1", team_type="LEAGUE", nationality=self.nat)
+        self.team2 = Team.objects.create(name="E Team 2", team_type="LEAGUE", nationality=self.nat)
+        tourney = Tournament.objects.create(name="E T", tournament_type="LEAGUE")
+        comp = Competition.objects.create(name="E C", tournament=tourney)
+        mtype = MatchType.objects.create(name="T20", code="T20", max_overs=20)
+        self.match = Match.objects.create(
+            competition=comp, match_type=mtype,
+            team1=self.team1, team2=self.team2,
+            state="IN_PROGRESS", match_mode="ONLINE",
+        )
+        self.innings = Innings.objects.create(
+            match=self.match, batting_team=self.team1, bowling_team=self.team2, innings_number=1
+        )
+        self.batter, self.non_striker, self.bowler = (
+            Player.objects.create(first_name=name, last_name="E", nationality=self.nat)
+            for name in ("Bat", "Non", "Bowl")
+        )
+        self.balls = [self.create_ball(number) for number in range(1, 6)]
+        self.comp = comp
+        self.mtype = mtype
+
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+
+    def create_ball(self, number, innings=None):
+        innings = innings or self.innings
+        ball = Ball.objects.create(
+            user=self.user, match=innings.match, innings=innings,
+            over_number=1, ball_number=number, ball_in_over=number,
+            striker=self.batter, non_striker=self.non_striker, bowler=self.bowler,
+            batting_team=self.team1, bowling_team=self.team2,
+            runs_off_bat=number,
+        )
+        BallTrajectory.objects.create(ball=ball, sequence_index=0, x=0.5, y=0.5)
+        BallFielding.objects.create(ball=ball, player=self.bowler)
+        return ball
+
+    def export(self, output, *args, command="export_ball_data_by_user"):
+        scope = (
+            ("--user-id", str(self.user.id))
+            if command == "export_ball_data_by_user"
+            else ("--competition-id", str(self.match.competition_id))
+        )
+        stdout = StringIO()
+        call_command(
+            command,
+            *scope,
+            "--output", str(output),
+            *args,
+            stdout=stdout,
+            stderr=StringIO(),
+        )
+        return stdout.getvalue()
+
+    def read(self, output):
+        with output.open(newline="", encoding="utf-8") as csvfile:
+            return list(csv.DictReader(csvfile))
+
+    def add_second_match(self):
+        match = Match.objects.create(
+            competition=self.comp, match_type=self.mtype,
+            team1=self.team1, team2=self.team2,
+            state="IN_PROGRESS", match_mode="ONLINE",
+        )
+        innings = Innings.objects.create(
+            match=match, batting_team=self.team1, bowling_team=self.team2, innings_number=1
+        )
+        self.balls += [self.create_ball(number, innings) for number in range(1, 4)]
+
+
+class BallExportCommandsTest(BallExportTestMixin, TestCase):
+    def test_streams_every_ball_across_chunks(self):
+        output = self.tmpdir / "all.csv"
+
+        self.export(output, "--chunk-size", "2")
+
+        rows = self.read(output)
+        self.assertEqual(
+            [row["ball_id"] for row in rows],
+            [str(ball.id) for ball in sorted(self.balls, key=lambda b: (b.created_at, b.id))],
+        )
+        self.assertEqual({row["trajectory_count"] for row in rows}, {"1"})
+        self.assertEqual({row["fielding_count"] for row in rows}, {"1"})
+
+    def test_resuming_from_watermark_matches_full_export(self):
+        full = self.tmpdir / "full.csv"
+        self.export(full)
+        rows = self.read(full)
+
+        incremental = self.tmpdir / "incremental.csv"
+        Ball.objects.filter(id__in=[b.id for b in self.balls[3:]]).delete()
+        out = self.export(incremental)
+        self.balls = self.balls[:3] + [self.create_ball(n) for n in (4, 5)]
+        resume = out.split("Resume with: ")[1].split()
+        self.export(incremental, *resume)
+
+        resumed = self.read(incremental)
+        self.assertEqual(len(resumed), 5)
+        self.assertEqual(
+            [row["ball_runs_off_bat"] for row in resumed],
+            [row["ball_runs_off_bat"] for row in rows],
+        )
+
+    def test_empty_export_fails_but_empty_increment_does_not(self):
+        output = self.tmpdir / "empty.csv"
+        Ball.objects.all().delete()
+
+        with self.assertRaises(CommandError):
+            self.export(output)
+        self.export(output, "--since-created-at", "2020-01-01T00:00:00Z")
+
+        self.assertFalse(output.exists())
+
+    def test_competition_export_matches_user_export(self):
+        by_user = self.tmpdir / "user.csv"
+        by_competition = self.tmpdir / "competition.csv"
+
+        self.export(by_user)
+        self.export(by_competition, command="export_competition_ball_data")
+
+        self.assertEqual(self.read(by_user), self.read(by_competition))
+
+    def test_append_is_csv_only(self):
+        with self.assertRaises(CommandError):
+            self.export(self.tmpdir / "out.parquet", "--format", "parquet", "--append")
+
+    @skipUnless(pyarrow, "pyarrow is not installed")
+    def test_columnar_formats_have_typed_and_nested_columns(self):
+        import pyarrow.ipc
+        import pyarrow.parquet
+
+        for fmt in ("parquet", "arrow", "feather"):
+            output = self.tmpdir / f"balls.{fmt}"
+            self.export(output, "--format", fmt, "--chunk-size", "2")
+
+            if fmt == "parquet":
+                table = pyarrow.parquet.read_table(output)
+            else:
+                table = pyarrow.ipc.open_file(output).read_all()
+            self.assertEqual(table.num_rows, 5, fmt)
+            self.assertEqual(table.schema.field("ball_runs_off_bat").type, pyarrow.int32())
+            self.assertEqual(
+                table.column("ball_runs_off_bat").to_pylist(), [1, 2, 3, 4, 5]
+            )
+            row = table.slice(0, 1).to_pylist()[0]
+            self.assertEqual(row["ball_id"], str(self.balls[0].id))
+            self.assertEqual(
+                row["trajectory"],
+                [{"sequence_index": 0, "x": 0.5, "y": 0.5, "z": None, "time_ms": None}],
+            )
+            self.assertEqual(row["fieldings"][0]["player_id"], str(self.bowler.id))
+            self.assertIsNone(row["wicket_wicket_type"])
+
+    def test_partitioned_export_merges_to_the_same_rows(self):
+        self.add_second_match()
+        whole = self.tmpdir / "whole.csv"
+        sharded = self.tmpdir / "sharded.csv"
+
+        self.export(whole)
+        out = self.export(sharded, "--partition", "match", "--chunk-size", "2")
+
+        key = lambda row: row["ball_id"]
+        self.assertEqual(sorted(self.read(sharded), key=key), sorted(self.read(whole), key=key))
+        self.assertIn("Exported 8 balls", out)
+        last = max(self.balls, key=lambda b: (b.created_at, b.id))
+        self.assertIn(f"--since-ball-id {last.id}", out)
+        self.assertEqual(sorted(p.name for p in self.tmpdir.iterdir()), ["sharded.csv", "whole.csv"])
+
+    def test_no_merge_keeps_one_shard_per_partition(self):
+        self.add_second_match()
+        dataset = self.tmpdir / "dataset"
+
+        self.export(dataset, "--partition", "innings", "--no-merge")
+
+        shards = sorted(dataset.iterdir())
+        self.assertEqual([p.name for p in shards], ["part-00000.csv", "part-00001.csv"])
+        # Largest partition first
+        self.assertEqual([len(self.read(p)) for p in shards], [5, 3])
+
+    def test_no_merge_needs_a_partition(self):
+        with self.assertRaises(CommandError):
+            self.export(self.tmpdir / "dataset", "--no-merge")
+
+    @skipUnless(pyarrow, "pyarrow is not installed")
+    def test_partitioned_columnar_export_merges_batches(self):
+        import pyarrow.parquet
+
+        self.add_second_match()
+        output = self.tmpdir / "balls.parquet"
+
+        self.export(output, "--format", "parquet", "--partition", "match", "--chunk-size", "2")
+
+        table = pyarrow.parquet.read_table(output)
+        self.assertEqual(
+            sorted(table.column("ball_id").to_pylist()),
+            sorted(str(ball.id) for ball in self.balls),
+        )
+
+
+class ParallelBallExportTest(BallExportTestMixin, TransactionTestCase):
+    # Rows must be committed for the worker processes to see them
+
+    def setUp(self):
+        if connection.vendor == "sqlite" and connection.is_in_memory_db():
+            self.skipTest(
+                "export workers cannot open an in-memory test database; "
+                "run with --settings=backend.settings_multiprocess_tests"
+            )
+        super().setUp()
+
+    def test_workers_export_the_same_rows_as_a_serial_run(self):
+        self.add_second_match()
+        serial = self.tmpdir / "serial.csv"
+        parallel = self.tmpdir / "parallel.csv"
+
+        self.export(serial)
+        out = self.export(parallel, "--workers", "2", "--chunk-size", "2")
+
+        with serial.open(newline="", encoding="utf-8") as a, parallel.open(newline="", encoding="utf-8") as b:
+            self.assertEqual(next(csv.reader(b)), next(csv.reader(a)))
+        key = lambda row: row["ball_id"]
+        self.assertEqual(sorted(self.read(parallel), key=key), sorted(self.read(serial), key=key))
+        self.assertIn("Exported 8 balls", out)
+
+    @skipUnless(pyarrow, "pyarrow is not installed")
+    def test_workers_write_the_serial_parquet_schema(self):
+        import pyarrow.parquet
+
+        self.add_second_match()
+        serial = self.tmpdir / "serial.parquet"
+        parallel = self.tmpdir / "parallel.parquet"
+
+        self.export(serial, "--format", "parquet")
+        self.export(parallel, "--format", "parquet", "--workers", "2")
+
+        serial_table = pyarrow.parquet.read_table(serial)
+        parallel_table = pyarrow.parquet.read_table(parallel)
+        self.assertEqual(parallel_table.schema, serial_table.schema)
+        self.assertEqual(
+            sorted(parallel_table.to_pylist(), key=lambda row: row["ball_id"]),
+            sorted(serial_table.to_pylist(), key=lambda row: row["ball_id"]),
+        )
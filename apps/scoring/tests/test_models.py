@@ -1,7 +1,16 @@
+from io import StringIO
+from django.core.management import call_command
 from django.test import TestCase
 from competitions.models import Tournament, Competition
 from matches.models import Match, Innings, Toss, MatchType
-from scoring.models import Ball, InningsAggregate, BatterStats, BowlerStats
+from scoring.models import (
+    Ball,
+    InningsAggregate,
+    BatterStats,
+    BowlerStats,
+    BallTrajectory,
+    BallTrajectoryPacked,
+)
 from coredata.models import Nationality, Team, Player
 from accounts.models import User
 from django.utils import timezone
@@ -62,3 +71,51 @@ class ScoringModelsTest(TestCase):
         )
         eco = (bw_stats.runs_conceded / bw_stats.balls) * 6
         self.assertEqual(eco, 12.0)
+
+    def create_ball(self):
+        non_striker = Player.objects.create(first_name="NS", last_name="NS", nationality=self.nat)
+        return Ball.objects.create(
+            user=self.user, match=self.match, innings=self.innings,
+            over_number=1, ball_number=1, ball_in_over=1,
+            striker=self.batter, non_striker=non_striker, bowler=self.bowler,
+            batting_team=self.team1, bowling_team=self.team2,
+        )
+
+    def test_packed_trajectory_round_trip(self):
+        ball = self.create_ball()
+        points = [
+            BallTrajectory(ball=ball, sequence_index=i, x=0.5 * i, y=1.25, z=None if i == 1 else 0.75, time_ms=None if i == 2 else 40 * i)
+            for i in (3, 1, 2)
+        ]
+
+        BallTrajectoryPacked.from_points(ball=ball, points=points).save()
+
+        packed = BallTrajectoryPacked.objects.get(ball=ball)
+        self.assertEqual(packed.point_count, 3)
+        self.assertEqual(len(bytes(packed.points)), 3 * 16)
+        self.assertEqual(packed.as_points(), [
+            {"sequence_index": 1, "x": 0.5, "y": 1.25, "z": None, "time_ms": 40},
+            {"sequence_index": 2, "x": 1.0, "y": 1.25, "z": 0.75, "time_ms": None},
+            {"sequence_index": 3, "x": 1.5, "y": 1.25, "z": 0.75, "time_ms": 120},
+        ])
+
+    def test_packed_trajectory_needs_contiguous_indexes(self):
+        ball = self.create_ball()
+        points = [
+            BallTrajectory(ball=ball, sequence_index=i, x=0, y=0)
+            for i in (0, 2)
+        ]
+        self.assertIsNone(BallTrajectoryPacked.from_points(ball=ball, points=points))
+
+    def test_pack_command_replaces_rows(self):
+        ball = self.create_ball()
+        BallTrajectory.objects.bulk_create(
+            BallTrajectory(ball=ball, sequence_index=i, x=i, y=0, z=0, time_ms=i)
+            for i in range(50)
+        )
+
+        call_command("pack_ball_trajectories", "--delete-rows", stdout=StringIO())
+
+        self.assertFalse(BallTrajectory.objects.filter(ball=ball).exists())
+        points = BallTrajectoryPacked.objects.get(ball=ball).as_points()
+        self.assertEqual([point["x"] for point in points], list(range(50)))
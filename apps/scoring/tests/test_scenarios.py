@@ -175,3 +175,20 @@ class ScoringScenariosTest(APITestCase):
         # Testing what model actually has
         self.assertEqual(self.aggregate.revised_target_runs, 150)
         self.assertEqual(self.aggregate.max_overs, 15)
+
+    def test_undo_rebuilds_aggregate_and_stats(self):
+        from scoring.services.undo_service import undo_last_ball
+
+        self.submit_ball(ball_number=1, ball_in_over=1, runs={"runs_off_bat": 4})
+        self.aggregate.refresh_from_db()
+        self.submit_ball(ball_number=2, ball_in_over=2, runs={"runs_off_bat": 2})
+
+        undo_last_ball(self.innings.id)
+
+        aggregate = InningsAggregate.objects.get(innings=self.innings)
+        self.assertEqual(aggregate.runs, 4)
+        self.assertEqual(aggregate.legal_balls, 1)
+        self.assertEqual(aggregate.current_striker_id, self.p1.id)
+        self.assertEqual(aggregate.current_bowler_id, self.b1.id)
+        batter = BatterStats.objects.get(innings=self.innings, player=self.p1)
+        self.assertEqual((batter.runs, batter.balls), (4, 1))
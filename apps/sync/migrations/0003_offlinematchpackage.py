@@ -0,0 +1,25 @@
+import uuid
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0003_match_match_referee_match_third_umpire_and_more'),
+        ('sync', '0002_syncoperation_payload_json'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OfflineMatchPackage',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, primary_key=True, serialize=False)),
+                ('content_hash', models.CharField(db_index=True, max_length=64)),
+                ('payload', models.BinaryField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('match', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='offline_package', to='matches.match')),
+            ],
+        ),
+    ]
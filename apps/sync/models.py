@@ -1,5 +1,9 @@
 from django.db import models
+import hashlib
 import uuid
+import zlib
+
+import msgpack
 
 class SyncOperation(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4)
@@ -14,9 +18,45 @@ class SyncOperation(models.Model):
     )
 
     sync_id = models.UUIDField()
-    payload = models.UUIDField()
+    payload = models.JSONField(default=dict)
 
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         unique_together = ("device_id","sync_id","operation")
+
+
+class OfflineMatchPackage(models.Model):
+    """
+    Offline scoring package for one match (rules, teams, squads,
+    umpires, Playing XI), built when the match is prepared. Stored as
+    zlib-compressed msgpack and addressed by the SHA-256 of the
+    uncompressed bytes, which doubles as its ETag.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4)
+    match = models.OneToOneField(
+        "matches.Match",
+        on_delete=models.CASCADE,
+        related_name="offline_package"
+    )
+
+    content_hash = models.CharField(max_length=64, db_index=True)
+    payload = models.BinaryField()
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @staticmethod
+    def encode(package):
+        """
+        (msgpack bytes, content hash). UUIDs are packed as strings.
+        """
+        raw = msgpack.packb(package, default=str)
+        return raw, hashlib.sha256(raw).hexdigest()
+
+    @staticmethod
+    def compress(raw):
+        return zlib.compress(raw, 9)
+
+    def decode(self):
+        return msgpack.unpackb(zlib.decompress(self.payload))
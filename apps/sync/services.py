@@ -1,133 +1,266 @@
 # from stadium.models import Stadium
-from .models import SyncOperation
-
-def apply_operation(*, scope, device_id, op):
-    sync_id = op["sync_id"]
-
-    #Idempotency check
-    if SyncOperation.objects.filter(
-        device_id = device_id,
-        sync_id = sync_id,\
-        operation = op["operation"]
-    ).exists():
-        return {"sync_id":sync_id, "status":"SKIPPED"}
-    
+import uuid
+
+from django.db import transaction
+
+from .models import SyncOperation, OfflineMatchPackage
+
+
+# def apply_stadium_change(*, scope, op):
+#     if op["operation"] == "CREATE":
+#         Stadium.objects.create(
+#             sync_id = op["sync_id"],
+#             owner_type = scope.owner_type,
+#             owner_id = scope.owner_id,
+#             **op["payload"]
+#         )
+#
+#     elif op["operation"] == "UPDATE":
+#         Stadium.objects.filter(
+#             sync_id = op["sync_id"],
+#             owner_type = scope.owner_type,
+#             owner_id = scope.owner_id
+#         ).update(**op["payload"])
+#
+#     elif op["operation"] == "DELETE":
+#         Stadium.objects.filter(
+#             sync_id = op["sync_id"],
+#             owner_type = scope.owner_type,
+#             owner_id = scope.owner_id
+#         ).delete()
+
+
+# Entity name -> handler(*, scope, op); none are wired up yet
+ENTITY_HANDLERS = {
+    # "stadium": apply_stadium_change,
+}
+
+
+def apply_entity_change(*, scope, op):
     """
-    
-    if op["entity"] == "stadium":
-        if op["operation"] == "CREATE":
-            Stadium.objects.create(
-                sync_id = sync_id,
-                owner_type = scope.owner_type,
-                owner_id = scope.owner_id,
-                **op["payload"]
-            )
-
-        elif op["operation"] == "UPDATE":
-            Stadium.objects.filter(
-                sync_id = sync_id,
-                owner_type = scope.owner_type,
-                owner_id = scope.owner_id
-            ).update(**op["payload"])
-
-        elif op["operation"] == "DELETE":
-            Stadium.objects.filter(
-                sync_id = sync_id,
-                owner_type = scope.owner_type,
-                owner_id = scope.owner_id
-            ).delete()
-
-    SyncOperation.objects.create(
-        owner_type = scope.owner_type,
-        owner_id = scope.owner_id,
-        device_id = device_id,
-        entity = op["entity"],
-        operation = op["operation"],
-        sync_id=sync_id,
-        payload=op["payload"]
-    )
+    Apply one operation to its entity. Returns False, without touching
+    anything, when no handler exists for the entity.
+    """
+    handler = ENTITY_HANDLERS.get(op["entity"])
+    if handler is None:
+        return False
+    handler(scope=scope, op=op)
+    return True
 
-    return {"sync_id":sync_id, "status":"APPLIED"}
 
+@transaction.atomic
+def apply_operations(*, scope, device_id, operations):
+    """
+    Apply a device's operation backlog in order.
+
+    Idempotency is resolved for the whole batch with one lookup of the
+    (device_id, sync_id, operation) keys already recorded; operations
+    seen before, in the database or earlier in the batch, are SKIPPED.
+    Operations on entities without a handler are UNSUPPORTED and not
+    recorded, so the device keeps them for a later replay. The applied
+    ones are recorded with one bulk insert. Returns one status per
+    operation, in order.
     """
+    device_id = uuid.UUID(str(device_id))
+    keys = [
+        (uuid.UUID(str(op["sync_id"])), op["operation"])
+        for op in operations
+    ]
+
+    # One query for the batch; the operation is matched in memory
+    seen = set(
+        SyncOperation.objects.filter(
+            device_id=device_id,
+            sync_id__in={sync_id for sync_id, _ in keys},
+        ).values_list("sync_id", "operation")
+    )
+
+    results = []
+    applied = []
+    for op, key in zip(operations, keys):
+        sync_id = str(key[0])
+        if key in seen:
+            results.append({"sync_id": sync_id, "status": "SKIPPED"})
+            continue
+        if not apply_entity_change(scope=scope, op=op):
+            results.append({"sync_id": sync_id, "status": "UNSUPPORTED"})
+            continue
+        seen.add(key)
+
+        applied.append(SyncOperation(
+            owner_type=scope.owner_type,
+            owner_id=scope.owner_id,
+            device_id=device_id,
+            entity=op["entity"],
+            operation=op["operation"],
+            sync_id=key[0],
+            payload=op.get("payload") or {},
+        ))
+        results.append({"sync_id": sync_id, "status": "APPLIED"})
+
+    # A concurrent replay of the same backlog may have recorded some first
+    SyncOperation.objects.bulk_create(applied, ignore_conflicts=True)
+
+    return results
 
 from django.db import transaction
 from django.shortcuts import get_object_or_404
 from matches.models import Match, PlayingXI
 from competitions.models import CompetitionSquad, SeriesSquad
-from scoring.services.ball_service import submit_ball
+from scoring.services.ball_batch_service import submit_ball_batch
 # from scoring.services.session_service import start_scoring_session # Reuse logic?
 
-def get_player_squad(context_obj, team):
+def get_player_squads(match):
     """
-    Helper to fetch squad players based on context (Competition/Series).
+    Squad players of both teams from the match's Competition/Series, in
+    one query: {team_id: [Player]}.
     """
-    players = []
-    
-    if hasattr(context_obj, 'competition_teams'):
-        # It is a Competition
-        comp_team = context_obj.competition_teams.filter(team=team).first()
-        if comp_team:
-            squad_entries = CompetitionSquad.objects.filter(competition_team=comp_team).select_related('player')
-            players = [entry.player for entry in squad_entries]
-            
-    elif hasattr(context_obj, 'teams'):
-        # It is a Series
-        series_team = context_obj.teams.filter(team=team).first()
-        if series_team:
-            squad_entries = SeriesSquad.objects.filter(series_team=series_team).select_related('player')
-            players = [entry.player for entry in squad_entries]
-            
-    return players
+    team_ids = (match.team1_id, match.team2_id)
+    squads = {team_id: [] for team_id in team_ids}
 
-def get_offline_match_context(match_id):
-    match = get_object_or_404(Match, id=match_id)
-    
-    # 1. Determine Context
-    context_obj = match.competition if match.competition else match.series
-    # If neither (shouldn't happen per constraints), no squad?
-    
-    # 2. Fetch Squads
-    t1_squad = get_player_squad(context_obj, match.team1)
-    t2_squad = get_player_squad(context_obj, match.team2)
-    
-    # 3. Serialize output
-    def serialize_player(p):
+    if match.competition_id:
+        entries = CompetitionSquad.objects.filter(
+            competition_team__competition_id=match.competition_id,
+            competition_team__team_id__in=team_ids,
+        ).select_related('player', 'competition_team')
+        for entry in entries:
+            squads[entry.competition_team.team_id].append(entry.player)
+
+    elif match.series_id:
+        entries = SeriesSquad.objects.filter(
+            series_team__series_id=match.series_id,
+            series_team__team_id__in=team_ids,
+        ).select_related('player', 'series_team')
+        for entry in entries:
+            squads[entry.series_team.team_id].append(entry.player)
+
+    return squads
+
+def serialize_player(p):
+    return {
+        "id": p.id,
+        "first_name": p.first_name,
+        "last_name": p.last_name,
+        "role": p.role,
+        "batting_hand": p.batting_hand,
+        "bowling_hand": p.bowling_hand,
+        "full_name": f"{p.first_name} {p.last_name}"
+    }
+
+def build_offline_match_package(match):
+    """
+    Everything a device needs to score `match` offline: match type
+    rules, teams with squads, umpires and any Playing XI. Holds nothing
+    that changes while the match is played (state is added per request).
+    """
+    squads = get_player_squads(match)
+    match_type = match.match_type
+
+    def serialize_team(team):
         return {
-            "id": p.id,
-            "first_name": p.first_name,
-            "last_name": p.last_name,
-            "role": p.role,
-            "batting_hand": p.batting_hand,
-            "bowling_hand": p.bowling_hand,
-            "full_name": f"{p.first_name} {p.last_name}"
+            "id": team.id,
+            "name": team.name,
+            "short_name": team.short_name,
+            "squad": [serialize_player(p) for p in squads[team.id]]
         }
-        
+
+    playing_xi = {str(match.team1_id): [], str(match.team2_id): []}
+    for xi in PlayingXI.objects.filter(match=match).order_by('batting_position'):
+        playing_xi.setdefault(str(xi.team_id), []).append({
+            "player_id": xi.player_id,
+            "batting_position": xi.batting_position,
+            "is_captain": xi.is_captain,
+            "is_wicket_keeper": xi.is_wicket_keeper,
+        })
+
     return {
         "match_id": match.id,
         "match_type": {
-            "balls_per_over": match.match_type.balls_per_over,
-            "max_overs": match.match_type.max_overs,
-            "name": match.match_type.name,
-            # Add other rules
+            "balls_per_over": match_type.balls_per_over,
+            "max_overs": match_type.max_overs,
+            "name": match_type.name,
+            "code": match_type.code,
+            "max_innings": match_type.max_innings,
+            "allow_super_over": match_type.allow_super_over,
+            "allow_draw": match_type.allow_draw,
         },
         "teams": {
-            "team1": {
-                "id": match.team1.id,
-                "name": match.team1.name,
-                "short_name": match.team1.short_name,
-                "squad": [serialize_player(p) for p in t1_squad]
-            },
-            "team2": {
-                "id": match.team2.id,
-                "name": match.team2.name,
-                "short_name": match.team2.short_name,
-                "squad": [serialize_player(p) for p in t2_squad]
-            }
+            "team1": serialize_team(match.team1),
+            "team2": serialize_team(match.team2),
         },
-        "state": match.state
+        "umpires": [
+            {
+                "id": umpire.id,
+                "name": umpire.name,
+                "last_name": umpire.last_name,
+                "short_name": umpire.short_name,
+            }
+            for umpire in match.umpires.all()
+        ],
+        "playing_xi": playing_xi,
     }
 
+def store_offline_match_package(match):
+    """
+    Build and store the package for `match`; the row is only rewritten
+    when its content hash changed.
+    """
+    package = build_offline_match_package(match)
+    raw, content_hash = OfflineMatchPackage.encode(package)
+
+    stored = OfflineMatchPackage.objects.filter(match=match).defer('payload').first()
+    if stored and stored.content_hash == content_hash:
+        return stored
+
+    stored, _ = OfflineMatchPackage.objects.update_or_create(
+        match=match,
+        defaults={
+            "content_hash": content_hash,
+            "payload": OfflineMatchPackage.compress(raw),
+        },
+    )
+    return stored
+
+def get_offline_match_package(match_id):
+    """
+    The stored package of a prepared match (payload deferred), or for a
+    match not prepared yet an unsaved one built from its live data.
+    """
+    stored = (
+        OfflineMatchPackage.objects.defer('payload')
+        .filter(match_id=match_id, match__offline_snapshot_hash__isnull=False)
+        .first()
+    )
+    if stored:
+        return stored
+
+    match = get_object_or_404(
+        Match.objects.select_related('match_type', 'team1', 'team2'),
+        id=match_id,
+    )
+    raw, content_hash = OfflineMatchPackage.encode(
+        build_offline_match_package(match)
+    )
+    return OfflineMatchPackage(
+        match=match,
+        content_hash=content_hash,
+        payload=OfflineMatchPackage.compress(raw),
+    )
+
+def get_offline_match_context(match_id):
+    match = get_object_or_404(
+        Match.objects.select_related('match_type', 'team1', 'team2'),
+        id=match_id,
+    )
+
+    # Prepared matches serve their stored package, others stay live
+    package = None
+    if match.offline_snapshot_hash:
+        package = OfflineMatchPackage.objects.filter(match=match).first()
+    context = package.decode() if package else build_offline_match_package(match)
+
+    return {**context, "state": match.state}
+
 @transaction.atomic
 def process_bulk_sync(data, user):
     """
@@ -143,33 +276,28 @@ def process_bulk_sync(data, user):
             handle_toss_sync(match, event['payload'])
         elif event['type'] == 'PLAYING_XI':
             handle_playing_xi_sync(match, event['payload'])
+
+    # The package carries the XI; refresh it so its ETag moves on
+    if (
+        any(event['type'] == 'PLAYING_XI' for event in events) and
+        OfflineMatchPackage.objects.filter(match=match).exists()
+    ):
+        store_offline_match_package(match)
             
     # 2. Process Balls
-    balls = data.get('balls', [])
-    results = []
-    for ball_payload in balls:
-        # ball_payload should match arguments for submit_ball
-        # Ideally, offline app sends exactly what submit_ball expects
-        # We might need to inject 'innings' ID if offline app works with local IDs?
-        # Assuming offline app knows the server Innings ID or we resolve it.
-        # For a new match, 'Innings' might need to be created via an Event first!
-        
-        # If offline app created innings locally, it needs to sync that 'INNINGS_START' event first.
-        # Let's assume ball_payload has valid server IDs for now, or we handle ID mapping.
-        
-        try:
-             # Check if ball already exists?
-             ball_id = submit_ball(ball_payload, user)
-             results.append({"status": "SUCCESS", "ball_id": ball_id})
-        except Exception as e:
-             results.append({"status": "ERROR", "error": str(e)}) # Stop or Continue?
-             # For rigorous sync, likely stop and report error?
-             raise e 
-             
-    return {"status": "SYNC_COMPLETED", "processed_balls": len(results)}
+    # One bulk pass instead of submit_ball per ball: the valid prefix
+    # is committed and the first invalid ball is reported by offset.
+    result = submit_ball_batch(data.get('balls', []), user, match=match)
+
+    return {
+        "status": "SYNC_COMPLETED" if result["error"] is None else "SYNC_PARTIAL",
+        "processed_balls": len(result["applied_ball_ids"]),
+        **result,
+    }
 
 from matches.models import Toss
 from matches.models import Team, Player
+from ballbyball.selectors.innings import bump_match_version
 
 def handle_toss_sync(match, payload):
     won_by_id = payload.get('won_by')
@@ -221,4 +349,6 @@ def handle_playing_xi_sync(match, payload):
         ))
         
     if new_entries:
-        PlayingXI.objects.bulk_create(new_entries)
\ No newline at end of file
+        PlayingXI.objects.bulk_create(new_entries)
+        # bulk_create sends no post_save, so bump the version here
+        bump_match_version(match_id=match.id)
\ No newline at end of file
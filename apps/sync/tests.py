@@ -1,3 +1,452 @@
-from django.test import TestCase
+import json
+import uuid
+import zlib
+from unittest import mock
 
-# Create your tests here.
+import msgpack
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from ballbyball.models import BallEntryProjection, MatchChange, MatchChangeCursor
+from ballbyball.selectors.ball_entries import ball_entry_queryset
+from ballbyball.selectors.innings import get_static_read_model
+from ballbyball.services.build_ball_entry import SECTION_BUILDERS, build_ball_entry
+from competitions.models import Tournament, Competition, CompetitionTeam, CompetitionSquad
+from coredata.models import Nationality, Team, Player, Umpire
+from matches.models import Match, MatchType, Innings, PlayingXI
+from scoring.engine.rebuild_engine import rebuild_innings_state
+from scoring.models import Ball, BallWicket, InningsAggregate, BatterStats, BowlerStats
+from scoring.services.innings_service import setup_innings
+from sync.models import SyncOperation, OfflineMatchPackage
+from sync.services import ENTITY_HANDLERS, process_bulk_sync
+
+
+class BulkSyncCommitTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="syncer", password="password")
+        self.client.force_authenticate(self.user)
+
+        nat = Nationality.objects.create(name="SyncLand", code="SYN")
+        self.team1 = Team.objects.create(name="S Team 1", team_type="LEAGUE", nationality=nat)
+        self.team2 = Team.objects.create(name="S Team 2", team_type="LEAGUE", nationality=nat)
+        tourney = Tournament.objects.create(name="S T", tournament_type="LEAGUE")
+        comp = Competition.objects.create(name="S C", tournament=tourney)
+        mtype = MatchType.objects.create(name="T20", code="T20", balls_per_over=6, max_overs=20)
+        self.match = Match.objects.create(
+            competition=comp, match_type=mtype,
+            team1=self.team1, team2=self.team2,
+            state="IN_PROGRESS", match_mode="OFFLINE",
+        )
+        self.batters = [
+            Player.objects.create(first_name=f"Bat{i}", last_name="S", nationality=nat)
+            for i in range(4)
+        ]
+        self.bowlers = [
+            Player.objects.create(first_name=f"Bowl{i}", last_name="S", nationality=nat)
+            for i in range(2)
+        ]
+        for team, players in ((self.team1, self.batters), (self.team2, self.bowlers)):
+            for position, player in enumerate(players, start=1):
+                PlayingXI.objects.create(
+                    match=self.match, team=team, player=player, batting_position=position
+                )
+
+        self.innings = Innings.objects.create(
+            match=self.match, innings_number=1,
+            batting_team=self.team1, bowling_team=self.team2,
+        )
+        setup_innings(
+            innings_id=self.innings.id,
+            striker_id=self.batters[0].id,
+            non_striker_id=self.batters[1].id,
+            bowler_id=self.bowlers[0].id,
+        )
+
+    def ball(self, number, striker, non_striker, bowler, runs=0, **extra):
+        payload = {
+            "innings": str(self.innings.id),
+            "ball_number": number,
+            "over_number": (number - 1) // 6 + 1,
+            "ball_in_over": (number - 1) % 6 + 1,
+            "striker": str(striker.id),
+            "non_striker": str(non_striker.id),
+            "bowler": str(bowler.id),
+            "runs": {"runs_off_bat": runs},
+        }
+        payload.update(extra)
+        return payload
+
+    def two_overs(self):
+        """
+        Over 1: 1, 4, W (new batter), 0, 2, 1; over 2 from the other bowler.
+        """
+        b0, b1, b2, _ = self.batters
+        bowl1, bowl2 = self.bowlers
+        return [
+            self.ball(1, b0, b1, bowl1, runs=1),
+            self.ball(2, b1, b0, bowl1, runs=4),
+            self.ball(3, b1, b0, bowl1, wicket={
+                "dismissed_player_id": str(b1.id), "wicket_type": "BOWLED",
+            }),
+            self.ball(4, b2, b0, bowl1),
+            self.ball(5, b2, b0, bowl1, runs=2),
+            self.ball(6, b2, b0, bowl1, runs=1, analytics={"stroke": "DRIVE"}),
+            # odd run then over end: b2 keeps strike
+            self.ball(7, b2, b0, bowl2, runs=6),
+            self.ball(8, b2, b0, bowl2),
+        ]
+
+    def commit(self, balls):
+        return self.client.post(
+            reverse("bulk_sync_commit"),
+            {"match_id": str(self.match.id), "balls": balls},
+            format="json",
+        )
+
+    def snapshot(self):
+        aggregate = InningsAggregate.objects.get(innings=self.innings)
+        return (
+            (
+                aggregate.runs, aggregate.wickets, aggregate.legal_balls,
+                aggregate.completed_overs, aggregate.last_ball_id,
+            ),
+            sorted(BatterStats.objects.filter(innings=self.innings).values_list(
+                "player_id", "runs", "balls", "fours", "sixes",
+            )),
+            sorted(BowlerStats.objects.filter(innings=self.innings).values_list(
+                "player_id", "runs_conceded", "balls", "wickets",
+            )),
+        )
+
+    def test_commits_every_ball_and_matches_a_rebuild(self):
+        res = self.commit(self.two_overs())
+
+        self.assertEqual(res.status_code, 200, res.data)
+        self.assertEqual(res.data["status"], "SYNC_COMPLETED")
+        self.assertEqual(res.data["processed_balls"], 8)
+        self.assertIsNone(res.data["failed_offset"])
+        self.assertEqual(Ball.objects.filter(innings=self.innings).count(), 8)
+        self.assertEqual(BallWicket.objects.filter(ball__innings=self.innings).count(), 1)
+
+        synced = self.snapshot()
+        self.assertEqual(synced[0][:4], (14, 1, 8, 1))
+        rebuild_innings_state(self.innings)
+        self.assertEqual(self.snapshot(), synced)
+
+    def test_stops_at_the_first_invalid_ball_and_keeps_the_prefix(self):
+        balls = self.two_overs()
+        # Wrong striker: batters[1] was dismissed on ball 3
+        balls[3]["striker"] = str(self.batters[1].id)
+
+        res = self.commit(balls)
+
+        self.assertEqual(res.status_code, 409, res.data)
+        self.assertEqual(res.data["status"], "SYNC_PARTIAL")
+        self.assertEqual(res.data["failed_offset"], 3)
+        self.assertEqual(res.data["processed_balls"], 3)
+        self.assertEqual(
+            list(Ball.objects.filter(innings=self.innings).values_list("id", flat=True)),
+            res.data["applied_ball_ids"],
+        )
+        aggregate = InningsAggregate.objects.get(innings=self.innings)
+        self.assertEqual((aggregate.runs, aggregate.wickets), (5, 1))
+        self.assertIsNone(aggregate.current_striker_id)
+
+        # The tablet resumes from the failed offset
+        res = self.commit(self.two_overs()[3:])
+        self.assertEqual(res.status_code, 200, res.data)
+        self.assertEqual(InningsAggregate.objects.get(innings=self.innings).runs, 14)
+
+    def test_records_a_change_and_a_projection_per_applied_ball(self):
+        balls = self.two_overs()
+        balls[3]["striker"] = str(self.batters[1].id)
+
+        res = self.commit(balls)
+
+        applied = [str(ball_id) for ball_id in res.data["applied_ball_ids"]]
+        self.assertEqual(
+            MatchChangeCursor.objects.get(match=self.match).last_seq, 3
+        )
+        self.assertEqual(
+            [
+                (change.seq, change.kind, change.data["ball_ids"], change.data["score"]["runs"])
+                for change in MatchChange.objects.filter(match=self.match).order_by("seq")
+            ],
+            [
+                (1, MatchChange.Kind.BALL, applied[:1], 1),
+                (2, MatchChange.Kind.BALL, applied[1:2], 5),
+                (3, MatchChange.Kind.BALL, applied[2:], 5),
+            ],
+        )
+        projections = BallEntryProjection.objects.filter(innings=self.innings)
+        self.assertEqual(
+            sorted(str(projection.ball_id) for projection in projections),
+            sorted(applied),
+        )
+        for projection in projections:
+            ball = ball_entry_queryset(fields=SECTION_BUILDERS).get(id=projection.ball_id)
+            live = build_ball_entry(ball=ball, innings_number=ball.innings_number)
+            self.assertEqual(projection.entry, json.loads(json.dumps(live)))
+
+        # Resuming carries the sequence on
+        self.commit(self.two_overs()[3:])
+        self.assertEqual(
+            MatchChangeCursor.objects.get(match=self.match).last_seq, 8
+        )
+
+    def test_synced_playing_xi_invalidates_player_lists(self):
+        # As two requests would: each loads the match and its version
+        get_static_read_model(innings=Innings.objects.get(id=self.innings.id))
+        extra = Player.objects.create(
+            first_name="Bat4", last_name="S", nationality=self.batters[0].nationality
+        )
+
+        process_bulk_sync(
+            {
+                "match_id": self.match.id,
+                "events": [{"type": "PLAYING_XI", "payload": {"players": [
+                    {"team_id": self.team1.id, "player_id": extra.id, "batting_position": 5},
+                ]}}],
+            },
+            self.user,
+        )
+
+        batters = get_static_read_model(
+            innings=Innings.objects.get(id=self.innings.id)
+        )["players"]["batters"]
+        self.assertIn(extra.id, [player["id"] for player in batters])
+
+    def test_new_players_must_be_in_the_playing_xi(self):
+        balls = self.two_overs()
+        outsider = Player.objects.create(
+            first_name="Out", last_name="Sider", nationality=self.batters[0].nationality
+        )
+        balls[3]["striker"] = str(outsider.id)
+
+        res = self.commit(balls)
+
+        self.assertEqual(res.data["failed_offset"], 3)
+        self.assertIn("Playing XI", res.data["error"])
+
+
+class SyncOperationsTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="ops", password="password")
+        # The scope middleware needs the session user
+        self.client.force_login(self.user)
+        self.device_id = str(uuid.uuid4())
+
+        self.applied_ops = []
+        handlers = mock.patch.dict(ENTITY_HANDLERS, {
+            "stadium": lambda *, scope, op: self.applied_ops.append(op),
+        })
+        handlers.start()
+        self.addCleanup(handlers.stop)
+
+    def operations(self, count):
+        return [
+            {
+                "sync_id": str(uuid.uuid4()),
+                "entity": "stadium",
+                "operation": "CREATE",
+                "payload": {"name": f"Ground {i}"},
+            }
+            for i in range(count)
+        ]
+
+    def post(self, operations):
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.post(
+                reverse("sync_ops"),
+                {"device_id": self.device_id, "operations": operations},
+                format="json",
+            )
+        self.assertEqual(res.status_code, 200, getattr(res, "data", None))
+        return res.data["results"], len(ctx.captured_queries)
+
+    def test_statuses_come_back_in_order_and_replays_are_skipped(self):
+        ops = self.operations(3)
+        update = dict(ops[0], operation="UPDATE")
+
+        results, _ = self.post(ops[:2] + [update, ops[0], ops[2]])
+
+        self.assertEqual(
+            [(r["sync_id"], r["status"]) for r in results],
+            [
+                (ops[0]["sync_id"], "APPLIED"),
+                (ops[1]["sync_id"], "APPLIED"),
+                (ops[0]["sync_id"], "APPLIED"),
+                (ops[0]["sync_id"], "SKIPPED"),
+                (ops[2]["sync_id"], "APPLIED"),
+            ],
+        )
+        self.assertEqual(SyncOperation.objects.count(), 4)
+        self.assertEqual(
+            SyncOperation.objects.get(sync_id=ops[1]["sync_id"]).payload,
+            {"name": "Ground 1"},
+        )
+
+        results, _ = self.post(ops)
+        self.assertEqual({r["status"] for r in results}, {"SKIPPED"})
+        self.assertEqual(SyncOperation.objects.count(), 4)
+
+    def test_operations_without_a_handler_are_not_recorded(self):
+        ops = self.operations(1)
+        umpire = dict(self.operations(1)[0], entity="umpire")
+
+        results, _ = self.post([umpire] + ops)
+
+        self.assertEqual(
+            [r["status"] for r in results], ["UNSUPPORTED", "APPLIED"]
+        )
+        self.assertEqual(
+            list(SyncOperation.objects.values_list("entity", flat=True)),
+            ["stadium"],
+        )
+        self.assertEqual(self.applied_ops, ops)
+
+        results, _ = self.post([umpire])
+        self.assertEqual(results[0]["status"], "UNSUPPORTED")
+
+    def test_query_count_does_not_grow_with_the_backlog(self):
+        _, small = self.post(self.operations(2))
+        # Under SQLite's per-statement variable limit: still one insert
+        _, large = self.post(self.operations(100))
+
+        self.assertEqual(small, large)
+
+
+class OfflineMatchPackageTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="packager", password="password")
+        self.client.force_login(self.user)
+
+        nat = Nationality.objects.create(name="PackLand", code="PKL")
+        self.team1 = Team.objects.create(name="P Team 1", team_type="LEAGUE", nationality=nat)
+        self.team2 = Team.objects.create(name="P Team 2", team_type="LEAGUE", nationality=nat)
+        tourney = Tournament.objects.create(
+            name="P T", tournament_type="LEAGUE", owner_type="USER", owner_id=self.user.id
+        )
+        comp = Competition.objects.create(
+            name="P C", tournament=tourney, owner_type="USER", owner_id=self.user.id
+        )
+        mtype = MatchType.objects.create(name="T20", code="T20", balls_per_over=6, max_overs=20)
+        self.match = Match.objects.create(
+            competition=comp, match_type=mtype,
+            team1=self.team1, team2=self.team2,
+            state="DRAFT", match_mode="OFFLINE",
+            owner_type="USER", owner_id=self.user.id,
+        )
+        self.umpire = Umpire.objects.create(name="P Ump", nationality=nat)
+        self.match.umpires.add(self.umpire)
+
+        self.squads = {}
+        for team in (self.team1, self.team2):
+            comp_team = CompetitionTeam.objects.create(competition=comp, team=team)
+            self.squads[team.id] = [
+                Player.objects.create(first_name=f"{team.name} P{i}", last_name="K", nationality=nat)
+                for i in range(3)
+            ]
+            for player in self.squads[team.id]:
+                CompetitionSquad.objects.create(competition_team=comp_team, player=player)
+
+    def prepare(self):
+        res = self.client.post(
+            reverse("prepare-offline", args=[self.match.id]), format="json"
+        )
+        self.assertEqual(res.status_code, 200, getattr(res, "data", None))
+        return res.data["package_hash"]
+
+    def fetch(self, etag=None):
+        headers = {"HTTP_IF_NONE_MATCH": etag} if etag else {}
+        return self.client.get(
+            reverse("offline_match_package", args=[self.match.id]), **headers
+        )
+
+    def test_prepare_stores_the_package_that_is_served(self):
+        package_hash = self.prepare()
+
+        res = self.fetch()
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res["ETag"], f'"{package_hash}"')
+        self.assertEqual(res["Content-Encoding"], "deflate")
+        package = msgpack.unpackb(zlib.decompress(res.content))
+        self.assertEqual(package["match_id"], str(self.match.id))
+        self.assertEqual(package["match_type"]["balls_per_over"], 6)
+        self.assertEqual(
+            {player["id"] for player in package["teams"]["team2"]["squad"]},
+            {str(player.id) for player in self.squads[self.team2.id]},
+        )
+        self.assertEqual(package["umpires"][0]["id"], str(self.umpire.id))
+
+    def test_matching_etag_gets_not_modified(self):
+        self.prepare()
+        etag = self.fetch()["ETag"]
+
+        # session, user, scope subscription, package hash: no payload read
+        with self.assertNumQueries(4):
+            res = self.fetch(etag)
+
+        self.assertEqual(res.status_code, 304)
+        self.assertEqual(res["ETag"], etag)
+        self.assertEqual(res.content, b"")
+
+    def test_syncing_the_playing_xi_changes_the_package(self):
+        self.prepare()
+        etag = self.fetch()["ETag"]
+        batters = self.squads[self.team1.id]
+
+        res = self.client.post(
+            reverse("bulk_sync_commit"),
+            {
+                "match_id": str(self.match.id),
+                "balls": [],
+                "events": [{"type": "PLAYING_XI", "payload": {"players": [
+                    {"team_id": str(self.team1.id), "player_id": player.id, "batting_position": i}
+                    for i, player in enumerate(batters, start=1)
+                ]}}],
+            },
+            format="json",
+        )
+        self.assertEqual(res.status_code, 200, res.data)
+
+        res = self.fetch(etag)
+        self.assertEqual(res.status_code, 200)
+        self.assertNotEqual(res["ETag"], etag)
+        package = msgpack.unpackb(zlib.decompress(res.content))
+        self.assertEqual(
+            [xi["player_id"] for xi in package["playing_xi"][str(self.team1.id)]],
+            [str(player.id) for player in batters],
+        )
+
+    def test_context_is_served_from_the_package(self):
+        self.prepare()
+
+        res = self.client.get(reverse("offline_match_context", args=[self.match.id]))
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["match_id"], str(self.match.id))
+        self.assertEqual(
+            [player["id"] for player in res.data["teams"]["team1"]["squad"]],
+            [str(player.id) for player in self.squads[self.team1.id]],
+        )
+
+    def test_unprepared_match_package_is_built_live_and_not_stored(self):
+        etag = self.fetch()["ETag"]
+        self.assertFalse(OfflineMatchPackage.objects.filter(match=self.match).exists())
+        self.assertEqual(self.fetch(etag).status_code, 304)
+
+        self.team1.name = "P Team 1 Renamed"
+        self.team1.save()
+
+        res = self.fetch(etag)
+        self.assertEqual(res.status_code, 200)
+        package = msgpack.unpackb(zlib.decompress(res.content))
+        self.assertEqual(package["teams"]["team1"]["name"], "P Team 1 Renamed")
+        context = self.client.get(reverse("offline_match_context", args=[self.match.id]))
+        self.assertEqual(context.data["teams"]["team1"]["name"], "P Team 1 Renamed")
@@ -1,8 +1,9 @@
 from django.urls import path
-from .views import SyncView, OfflineMatchContextAPIView, BulkSyncAPIView
+from .views import SyncView, OfflineMatchContextAPIView, OfflineMatchPackageAPIView, BulkSyncAPIView
 
 urlpatterns = [
     path('ops/', SyncView.as_view(), name='sync_ops'),
     path('matches/<uuid:match_id>/context/', OfflineMatchContextAPIView.as_view(), name='offline_match_context'),
+    path('matches/<uuid:match_id>/package/', OfflineMatchPackageAPIView.as_view(), name='offline_match_package'),
     path('commit/', BulkSyncAPIView.as_view(), name='bulk_sync_commit'),
 ]
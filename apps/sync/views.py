@@ -1,26 +1,40 @@
 from rest_framework.views import APIView
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
+from django.http import HttpResponse, HttpResponseNotModified
 from django.shortcuts import get_object_or_404
+from django.utils.http import parse_etags, quote_etag
 from .models import SyncOperation
-from .services import apply_operation, get_offline_match_context, process_bulk_sync
+from backend.core.permissions import ScopeRBACPermission
+from .services import (
+    apply_operations,
+    get_offline_match_context,
+    get_offline_match_package,
+    process_bulk_sync,
+)
 from .serializers import OfflineMatchContextSerializer, BulkSyncRequestSerializer
 
 class SyncView(APIView):
+    # Recorded operations belong to the caller's scope
+    permission_classes = [IsAuthenticated, ScopeRBACPermission]
+
     def post(self, request):
         scope = request.scope
         device_id = request.data.get("device_id")
         operations = request.data.get("operations",[])
 
-        results = []
-
-        for op in operations:
-            result = apply_operation(
+        try:
+            results = apply_operations(
                 scope = scope,
                 device_id = device_id,
-                op = op
+                operations = operations
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            return Response(
+                {"error": f"Malformed operation: {e}"},
+                status=status.HTTP_400_BAD_REQUEST
             )
-            results.append(result)
 
         return Response({
             "results": results
@@ -37,6 +51,29 @@ class OfflineMatchContextAPIView(APIView):
         serializer = OfflineMatchContextSerializer(data)
         return Response(serializer.data)
 
+class OfflineMatchPackageAPIView(APIView):
+    """
+    The offline package as zlib-compressed msgpack (HTTP "deflate"
+    content coding), with its content hash as ETag. Matches not prepared
+    yet get one built from live data, which is not stored.
+    """
+
+    def get(self, request, match_id):
+        package = get_offline_match_package(match_id)
+
+        etag = quote_etag(package.content_hash)
+        if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+        if etag in if_none_match or "*" in if_none_match:
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(
+                bytes(package.payload), content_type="application/msgpack"
+            )
+            response["Content-Encoding"] = "deflate"
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, no-cache"
+        return response
+
 class BulkSyncAPIView(APIView):
     def post(self, request):
         serializer = BulkSyncRequestSerializer(data=request.data)
@@ -47,7 +84,13 @@ class BulkSyncAPIView(APIView):
         
         try:
             result = process_bulk_sync(data, user)
-            return Response(result, status=status.HTTP_200_OK)
+            # A partial sync still commits the balls before the failure
+            return Response(
+                result,
+                status=status.HTTP_200_OK
+                if result["status"] == "SYNC_COMPLETED"
+                else status.HTTP_409_CONFLICT,
+            )
         except Exception as e:
             return Response(
                 {"error": str(e)}, 